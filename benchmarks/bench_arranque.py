@@ -0,0 +1,100 @@
+"""Arranque en frío: importación del núcleo y tiempo hasta la primera ventana.
+
+Cada medición se hace en un intérprete nuevo. La importación se mide con
+``python -X importtime`` (tiempo acumulado del módulo) y la primera ventana
+como tiempo de pared desde el lanzamiento del proceso hasta el primer ciclo
+de eventos con ``MomentApp`` visible (plataforma Qt ``offscreen``).
+
+    python benchmarks/bench_arranque.py --repeticiones 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Objetivos (ms)
+TARGET_CORE_IMPORT_MS = 150
+TARGET_FIRST_WINDOW_MS = 1500
+
+FIRST_WINDOW = """
+import viga_gui
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QApplication
+app = QApplication([])
+win = viga_gui.MomentApp()
+QTimer.singleShot(0, app.quit)
+app.exec_()
+"""
+
+
+def _env():
+    env = dict(os.environ, PYTHONPATH=ROOT, PYTHONDONTWRITEBYTECODE="1")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def import_time_ms(module):
+    """Tiempo acumulado (ms) de ``import module`` según ``-X importtime``."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_env(), check=True,
+    )
+    for line in reversed(proc.stderr.splitlines()):
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1]) / 1000
+    raise RuntimeError(f"No se encontró {module} en la salida de importtime")
+
+
+def loaded_modules(module):
+    """Paquetes pesados cargados como efecto de ``import module``."""
+    code = (f"import sys, {module}; print(' '.join(m for m in "
+            "('PyQt5', 'matplotlib', 'scipy', 'mplcursors') "
+            "if m in sys.modules))")
+    proc = subprocess.run([sys.executable, "-c", code], capture_output=True,
+                          text=True, env=_env(), check=True)
+    return proc.stdout.split()
+
+
+def first_window_ms():
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, "-c", FIRST_WINDOW], env=_env(),
+                   check=True, capture_output=True)
+    return (time.perf_counter() - t0) * 1000
+
+
+def _report(label, samples, target):
+    value = statistics.median(samples)
+    status = "OK" if value <= target else "NO OK"
+    print(f"{label:28s} {value:8.1f} ms  (objetivo {target} ms) {status}")
+    return value <= target
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args(argv)
+    n = args.repeticiones
+
+    for module in ("viga_core", "viga_batch"):
+        heavy = loaded_modules(module)
+        print(f"import {module}: carga {', '.join(heavy) or 'solo NumPy'}")
+    ok = _report("importar viga_core",
+                 [import_time_ms("viga_core") for _ in range(n)],
+                 TARGET_CORE_IMPORT_MS)
+    ok &= _report("importar viga_gui",
+                  [import_time_ms("viga_gui") for _ in range(n)],
+                  TARGET_FIRST_WINDOW_MS)
+    ok &= _report("primera ventana",
+                  [first_window_ms() for _ in range(n)],
+                  TARGET_FIRST_WINDOW_MS)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
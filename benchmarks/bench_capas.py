@@ -0,0 +1,69 @@
+"""Tiempo del armado en varias capas para muchas posiciones a la vez.
+
+Diseña ``--vigas`` vigas sintéticas (seis posiciones cada una) y mide
+``viga_barras.layered_lookup``: búsqueda en una capa, verificación con el
+peralte de las barras elegidas y reparto en capas de las posiciones que no
+caben. Informa cuántas posiciones quedaron en una, dos o tres capas y el
+tiempo por cada 100 000 posiciones frente al objetivo; termina con código
+1 si lo supera.
+
+Uso::
+
+    python benchmarks/bench_capas.py --vigas 50000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import sintetico
+
+TARGET_MS = 100.0
+REPEAT = 5
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    import viga_barras
+    import viga_core
+
+    p = sintetico.synthetic_project(args.vigas)
+    res = viga_core.design_beams(
+        p["mn"], p["mp"], p["sys_t"], p["b"], p["h"], p["r"], p["fc"],
+        p["fy"], p["phi"], p["de"], p["db"],
+    )
+    as_req = np.hstack([res["as_n"], res["as_p"]])
+    mu = np.hstack([res["mn_corr"], res["mp_corr"]])
+    sec = [p[k][:, None] for k in ("b", "h", "r", "fc", "fy", "phi", "de")]
+    index = viga_barras.default_index()
+
+    times = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        ids = viga_barras.layered_lookup(as_req, mu, *sec, index)
+        times.append(time.perf_counter() - t0)
+    t0 = time.perf_counter()
+    layers, _ = index.depth(ids, sec[0], sec[1], sec[2], sec[6])
+    depth_s = time.perf_counter() - t0
+
+    n = ids.size
+    per_100k = min(times) / n * 100000 * 1000
+    ok = per_100k <= TARGET_MS
+    counts = np.bincount(layers.ravel(), minlength=viga_core.MAX_LAYERS + 1)
+    print(f"{n} posiciones: " + ", ".join(
+        f"{c} en {k} capa{'s' if k > 1 else ''}"
+        for k, c in enumerate(counts) if k) + f", {counts[0]} sin armado")
+    print(f"layered_lookup: {min(times) * 1000:.1f} ms "
+          f"({per_100k:.1f} ms por 100 000 posiciones, objetivo "
+          f"{TARGET_MS:.0f} ms) -> {'OK' if ok else 'LENTO'}")
+    print(f"capas y peralte del armado: {depth_s * 1000:.1f} ms")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""Curvas de momento: ``CubicSpline`` frente a la matriz base precalculada.
+
+Verifica que ambas coinciden a tolerancia de punto flotante y mide el
+tiempo para 1 viga y para un lote de vigas (100 000 por defecto).
+
+    python benchmarks/bench_curvas.py --vigas 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
+import sintetico  # noqa: F401  (agrega la raíz al sys.path)
+from viga_core import STATIONS, X_CTRL, moment_curves
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=100000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    m = rng.uniform(-30, 30, (args.vigas, 3))
+
+    ref = CubicSpline(X_CTRL, m, axis=1)(STATIONS)
+    err = np.abs(moment_curves(m) - ref).max()
+    print(f"error máximo frente a CubicSpline: {err:.2e}")
+    assert np.allclose(moment_curves(m), ref, rtol=1e-12, atol=1e-10)
+
+    one = m[0]
+    t_spline = _best(lambda: CubicSpline(X_CTRL, one)(STATIONS), 200)
+    t_basis = _best(lambda: moment_curves(one), 200)
+    print(f"1 viga:       CubicSpline {t_spline * 1e6:9.1f} us | "
+          f"base {t_basis * 1e6:9.1f} us | x{t_spline / t_basis:.0f}")
+
+    t_loop = _best(lambda: [CubicSpline(X_CTRL, row)(STATIONS)
+                            for row in m[:1000]], 1) * args.vigas / 1000
+    t_vec = _best(lambda: CubicSpline(X_CTRL, m, axis=1)(STATIONS),
+                  args.repeticiones)
+    t_basis = _best(lambda: moment_curves(m), args.repeticiones)
+    print(f"{args.vigas} vigas: CubicSpline por viga {t_loop:8.3f} s (estimado) | "
+          f"CubicSpline vectorizado {t_vec:8.3f} s | base {t_basis:8.3f} s | "
+          f"x{t_vec / t_basis:.1f}")
+
+
+if __name__ == "__main__":
+    main()
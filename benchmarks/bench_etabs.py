@@ -0,0 +1,72 @@
+"""Lectura de una exportación sintética de fuerzas de ETABS.
+
+Genera una tabla ``Element Forces - Beams`` con una fila por viga, estación
+y combinación, la reduce con ``viga_etabs.read_envelope`` e informa filas
+por segundo y memoria máxima del proceso.
+
+Uso::
+
+    python benchmarks/bench_etabs.py --vigas 20000 --estaciones 7 --casos 15
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+import numpy as np
+
+import sintetico  # noqa: F401  (agrega la raíz del repositorio a sys.path)
+import viga_etabs
+
+
+def write_export(path, n_beams, n_stations, n_cases, seed=0):
+    """Escribe la tabla sintética en ``path`` y devuelve el número de filas."""
+    rng = np.random.default_rng(seed)
+    lengths = rng.uniform(3.0, 8.0, n_beams)
+    rel = np.linspace(0.0, 1.0, n_stations)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("TABLE:  Element Forces - Beams\n")
+        f.write("Story,Beam,Unique Name,Output Case,Case Type,Station,M3\n")
+        f.write(",,,,,m,tonf-m\n")
+        for start in range(0, n_beams, 1000):
+            ids = np.arange(start, min(start + 1000, n_beams))
+            lines = []
+            for case in range(n_cases):
+                m3 = rng.normal(0.0, 10.0, (len(ids), n_stations))
+                st = lengths[ids, None] * rel
+                for i, s_row, m_row in zip(ids, st, m3):
+                    lines.extend(
+                        f"Piso{i % 10 + 1},B{i},{i},COMB{case},Combination,"
+                        f"{s:.3f},{m:.4f}\n"
+                        for s, m in zip(s_row, m_row)
+                    )
+            f.writelines(lines)
+    return n_beams * n_stations * n_cases
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=20000)
+    parser.add_argument("--estaciones", type=int, default=7)
+    parser.add_argument("--casos", type=int, default=15)
+    parser.add_argument("--bloque", type=int, default=viga_etabs.CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "fuerzas.csv")
+        n_rows = write_export(path, args.vigas, args.estaciones, args.casos)
+        size_mb = os.path.getsize(path) / 2**20
+        t0 = time.perf_counter()
+        ids, mn, mp = viga_etabs.read_envelope(path, chunk_size=args.bloque)
+        secs = time.perf_counter() - t0
+
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{n_rows} filas ({size_mb:.1f} MB) -> {len(ids)} vigas")
+    print(f"{secs:.2f} s ({n_rows / secs:,.0f} filas/s), "
+          f"memoria máxima {peak_mb:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Exportación masiva de figuras con Agg sobre un proyecto sintético.
+
+Exporta sección, momentos y distribución de acero de cada viga con
+``viga_export.export_project`` y compara las figuras por segundo de cada
+proceso con ``viga_export.THROUGHPUT_TARGET``. Termina con código 1 si no
+se alcanza el objetivo.
+
+Uso::
+
+    python benchmarks/bench_figuras.py --vigas 5000 --procesos 4
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from sintetico import synthetic_project
+
+import viga_export
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=5000)
+    parser.add_argument("--procesos", type=int, default=1)
+    parser.add_argument("--formato", choices=viga_export.FORMATS,
+                        default="png")
+    parser.add_argument("--dpi", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    project = synthetic_project(args.vigas)
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        paths = viga_export.export_project(
+            project, tmp, args.formato, args.procesos, args.dpi)
+        secs = time.perf_counter() - t0
+        size_kb = sum(os.path.getsize(p) for p in paths) / len(paths) / 1024
+
+    rate = len(paths) / secs
+    # Con más procesos que núcleos cada uno no puede rendir más que un núcleo
+    per_worker = rate / min(args.procesos, os.cpu_count() or 1)
+    target = viga_export.THROUGHPUT_TARGET
+    ok = per_worker >= target
+    print(f"{len(paths)} figuras {args.formato} en {secs:.1f} s "
+          f"({rate:.1f} figuras/s, {size_kb:.0f} KiB por figura)")
+    print(f"por proceso: {per_worker:.1f} figuras/s "
+          f"(objetivo {target:.0f}) -> {'OK' if ok else 'LENTO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Tiempo de cuadro de la interfaz durante un diseño por lotes en segundo plano.
+
+Ejecuta ``viga_workers.batch_job`` en un ``QThreadPool`` mientras un
+temporizador de 1 ms en el hilo principal mide el intervalo entre ciclos
+del bucle de eventos, y una barra de progreso recibe las señales del
+trabajo. Informa el p50, p99 y máximo de ese intervalo frente al objetivo
+de 16 ms por cuadro; termina con código 1 si el p99 lo supera.
+
+Uso::
+
+    python benchmarks/bench_hilos.py --vigas 100000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+import sintetico
+
+FRAME_MS = 16.0
+
+
+def write_project(path, n):
+    """CSV de entrada de ``lote`` con ``n`` vigas sintéticas."""
+    import viga_batch
+
+    p = sintetico.synthetic_project(n)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(",".join(["id"] + viga_batch.MOMENT_COLS + ["b", "h"]) + "\n")
+        rows = np.hstack([p["mn"], p["mp"], p["b"][:, None], p["h"][:, None]])
+        f.writelines(
+            p["id"][i] + "," + ",".join(f"{v:.3f}" for v in row) + "\n"
+            for i, row in enumerate(rows.tolist())
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=100000)
+    parser.add_argument("--bloque", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import QElapsedTimer, QThreadPool, QTimer
+    from PyQt5.QtWidgets import QApplication, QProgressBar
+
+    import viga_workers
+
+    app = QApplication.instance() or QApplication([])
+    bar = QProgressBar()
+    bar.show()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        in_path = os.path.join(tmp, "vigas.csv")
+        write_project(in_path, args.vigas)
+
+        gaps = []
+        clock = QElapsedTimer()
+        clock.start()
+        last = [clock.nsecsElapsed()]
+
+        def tick():
+            now = clock.nsecsElapsed()
+            gaps.append((now - last[0]) / 1e6)
+            last[0] = now
+
+        timer = QTimer()
+        timer.setInterval(1)
+        timer.timeout.connect(tick)
+
+        kwargs = {"chunk_size": args.bloque} if args.bloque else {}
+        worker = viga_workers.Worker(
+            viga_workers.batch_job, in_path, os.path.join(tmp, "salida.csv"),
+            **kwargs)
+        received = [0]
+        worker.signals.progress.connect(
+            lambda done, total: bar.setValue(int(100 * done / max(total, 1))))
+        worker.signals.result.connect(
+            lambda part: received.__setitem__(0, received[0] + len(part["id"])))
+        worker.signals.finished.connect(app.quit)
+        worker.signals.error.connect(lambda msg: (print(msg), app.quit()))
+
+        pool = QThreadPool()
+        t0 = time.perf_counter()
+        timer.start()
+        pool.start(worker)
+        app.exec_()
+        secs = time.perf_counter() - t0
+        timer.stop()
+        pool.waitForDone()
+
+    gaps = np.array(gaps[1:])
+    p50, p99 = np.percentile(gaps, [50, 99])
+    ok = p99 <= FRAME_MS
+    print(f"{received[0]} vigas en {secs:.2f} s en segundo plano")
+    print(f"intervalo del bucle de eventos: p50 {p50:.2f} ms, "
+          f"p99 {p99:.2f} ms, máx {gaps.max():.2f} ms "
+          f"(objetivo {FRAME_MS:.0f} ms) -> {'OK' if ok else 'LENTO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""Costo de la instrumentación de ``viga_instr`` en las rutas críticas.
+
+Ejecuta en dos procesos, con ``VIGA_INSTR`` desactivada y activada, el
+cálculo de una viga como lo hace la ventana de diseño (corrección de
+momentos, acero requerido y φMn) ``--llamadas`` veces, y el diseño de un
+bloque de ``--vigas`` vigas. Desactivada, las funciones deben quedar sin
+envolver (costo nulo); activada, informa el costo por llamada medida frente
+al objetivo. Termina con código 1 si alguna condición no se cumple.
+
+Uso::
+
+    python benchmarks/bench_instr.py --llamadas 20000
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import sintetico
+
+TARGET_US = 5.0
+REPEAT = 5
+
+CHILD = r"""
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+import numpy as np
+import sintetico, viga_batch, viga_core, viga_instr
+
+calls, n = int(sys.argv[2]), int(sys.argv[3])
+mn, mp = np.array([12.0, 5.0, 10.0]), np.array([3.0, 8.0, 2.0])
+a = np.array([4.0, 2.0, 4.0, 2.0, 3.0, 2.0])
+db = np.full(6, 1.59)
+timed = (viga_core.correct_moments, viga_core.required_areas,
+         viga_core.capacity_ratios)
+plain = tuple(getattr(f, "__wrapped__", f) for f in timed)
+
+def beam(correct, required, capacity):
+    mc, pc = correct(mn, mp, "dual2")
+    d = viga_core.effective_depth(50.0, 4.0, 0.95, 1.59)
+    required(mc, pc, 30.0, d, 210.0, 4200.0, 0.9)
+    capacity(np.concatenate([mc, pc]), a, db, 0 * a, db,
+             30.0, 50.0, 4.0, 210.0, 4200.0, 0.9, 0.95)
+
+def best(fns):
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        beam(*fns)
+    return (time.perf_counter() - t0) / calls * 1e6
+
+p = sintetico.synthetic_project(n)
+chunk = {k: p[k] for k in viga_batch.INPUT_KEYS}
+timed_us, plain_us, chunk_s = [], [], []
+for _ in range(%d):
+    timed_us.append(best(timed))
+    plain_us.append(best(plain))
+    t0 = time.perf_counter()
+    viga_batch.design_chunk(chunk)
+    chunk_s.append(time.perf_counter() - t0)
+print(json.dumps({
+    "wrapped": hasattr(viga_core.correct_moments, "__wrapped__"),
+    "timed_us": min(timed_us),
+    "plain_us": min(plain_us),
+    "chunk_ms": min(chunk_s) * 1000,
+    "measured": sum(v["llamadas"] for v in viga_instr.snapshot().values()),
+}))
+""" % REPEAT
+
+
+def measure(enabled, calls, n):
+    env = dict(os.environ, VIGA_INSTR="1" if enabled else "")
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, sintetico.ROOT, str(calls), str(n)],
+        env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--llamadas", type=int, default=20000)
+    parser.add_argument("--vigas", type=int, default=50000)
+    args = parser.parse_args(argv)
+
+    off = measure(False, args.llamadas, args.vigas)
+    on = measure(True, args.llamadas, args.vigas)
+    # Activada se comparan, en el mismo proceso, las funciones envueltas y
+    # las originales; hay tres llamadas medidas por viga
+    per_call = (on["timed_us"] - on["plain_us"]) / 3
+    ok = not off["wrapped"] and on["wrapped"] and per_call <= TARGET_US
+    state = "envueltas" if off["wrapped"] else "sin envolver"
+    print(f"desactivada: funciones {state}, {off['timed_us']:.1f} µs por "
+          f"viga, bloque de {args.vigas} vigas {off['chunk_ms']:.0f} ms")
+    print(f"activada: {on['timed_us']:.1f} µs por viga (sin envolver "
+          f"{on['plain_us']:.1f} µs), bloque {on['chunk_ms']:.0f} ms, "
+          f"{on['measured']} llamadas medidas")
+    print(f"costo por llamada medida: {per_call:.2f} µs (objetivo "
+          f"{TARGET_US:.0f} µs) -> {'OK' if ok else 'LENTO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
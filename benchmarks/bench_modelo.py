@@ -0,0 +1,123 @@
+"""Memoria por viga del modelo compacto frente a las representaciones anteriores.
+
+Mide con ``tracemalloc`` la memoria de ``--vigas`` vigas (por defecto un
+millón) con sección, momentos y armado de las seis posiciones guardados:
+
+- ``viga_modelo.BEAM_DTYPE``: un arreglo estructurado con diámetros como
+  códigos ``uint8``;
+- columnas ``float64`` como los bloques de ``viga_batch`` más el armado en
+  arreglos de cantidades ``int64`` y textos de diámetro;
+- objetos de Python por viga (listas de textos de los combos, como la
+  ventana de diseño), medidos sobre una muestra y escalados.
+
+Además informa el tiempo de diseñar todas las vigas desde el modelo y de
+escribir su armado.
+
+Uso::
+
+    python benchmarks/bench_modelo.py --vigas 1000000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import sintetico
+
+SAMPLE = 100000
+
+
+def measure(build):
+    """Bytes retenidos por el resultado de ``build()`` y el propio resultado."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used, obj
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=1000000)
+    args = parser.parse_args(argv)
+    n = args.vigas
+
+    import viga_barras
+    import viga_batch
+    import viga_modelo
+
+    p = sintetico.synthetic_project(n)
+    res = viga_batch.design_chunk(p)
+    sel = viga_barras.select_bars(
+        np.hstack([res["as_n"], res["as_p"]]), p["b"][:, None],
+        p["r"][:, None], p["de"][:, None])
+
+    def compact():
+        beams = viga_modelo.new_beams(n)
+        beams["mn"], beams["mp"] = p["mn"], p["mp"]
+        beams["sys"] = viga_modelo.system_codes(p["sys_t"])
+        for key in viga_modelo.SECTION_FIELDS:
+            beams[key] = p[key]
+        beams["de"] = viga_modelo.bar_codes(p["de"].tolist())
+        beams["db"] = viga_modelo.bar_codes(p["db"].tolist())
+        c1, c2 = (viga_modelo.bar_codes(sel[key].ravel()).reshape(n, 6)
+                  for key in ("bar1", "bar2"))
+        viga_modelo.set_layout(beams, sel["n1"], c1, sel["n2"], c2)
+        return beams
+
+    def columns():
+        out = {key: np.array(p[key], dtype=float)
+               for key in viga_batch.INPUT_KEYS if key != "sys_t"}
+        out["sys_t"] = np.array(p["sys_t"])
+        for key in ("n1", "n2"):
+            out[key] = np.array(sel[key], dtype=np.int64)
+        for key in ("bar1", "bar2"):
+            out[key] = np.array(sel[key])
+        return out
+
+    m = min(n, SAMPLE)
+
+    def objects():
+        return [
+            {
+                "mn": p["mn"][i].tolist(), "mp": p["mp"][i].tolist(),
+                "sistema": str(p["sys_t"][i]),
+                "seccion": [f"{p[k][i]:g}" for k in viga_modelo.SECTION_FIELDS],
+                "estribo": '3/8"', "varilla": '5/8"',
+                "armado": [
+                    (str(sel["n1"][i, j]), str(sel["bar1"][i, j]),
+                     str(sel["n2"][i, j]), str(sel["bar2"][i, j]))
+                    for j in range(6)
+                ],
+            }
+            for i in range(m)
+        ]
+
+    used_c, beams = measure(compact)
+    used_f, _ = measure(columns)
+    used_o, _ = measure(objects)
+
+    print(f"{n} vigas")
+    print(f"BEAM_DTYPE:         {used_c / n:7.1f} bytes/viga "
+          f"({used_c / 2**20:7.1f} MiB; itemsize {viga_modelo.BEAM_DTYPE.itemsize})")
+    print(f"columnas float64:   {used_f / n:7.1f} bytes/viga "
+          f"({used_f / 2**20:7.1f} MiB)")
+    print(f"objetos de Python:  {used_o / m:7.1f} bytes/viga "
+          f"({used_o / m * n / 2**20:7.1f} MiB estimado)")
+
+    t0 = time.perf_counter()
+    chunk = viga_modelo.inputs(beams)
+    chunk["beams"] = beams
+    viga_batch.design_chunk(chunk)
+    secs = time.perf_counter() - t0
+    print(f"diseño desde el modelo y escritura del armado: {secs:.2f} s "
+          f"({n / secs:,.0f} vigas/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""Tiempo del optimizador de sección con un millón de candidatos por viga.
+
+Para ``--vigas`` vigas sintéticas evalúa una malla de
+``b`` 20–80 cm × ``h`` 30–120 cm (paso 0,25 cm) × 3 ``f'c`` × 4 varillas
+(unos 1,04 millones de secciones) con ``viga_optimo.optimize`` e informa el
+tiempo por viga frente al objetivo de 1 s; termina con código 1 si alguna
+viga lo supera.
+
+Uso::
+
+    python benchmarks/bench_optimo.py --vigas 10
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import sintetico
+
+TARGET_S = 1.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=10)
+    parser.add_argument("--paso", type=float, default=0.25,
+                        help="paso de b y h en cm")
+    args = parser.parse_args(argv)
+
+    import viga_core
+    import viga_optimo
+
+    grid = {
+        "b": np.arange(20.0, 80.0 + args.paso / 2, args.paso),
+        "h": np.arange(30.0, 120.0 + args.paso / 2, args.paso),
+    }
+    p = sintetico.synthetic_project(args.vigas)
+    mn_c, mp_c = viga_core.correct_moments(p["mn"], p["mp"], p["sys_t"])
+
+    times = []
+    for i in range(args.vigas):
+        t0 = time.perf_counter()
+        res = viga_optimo.optimize(mn_c[i], mp_c[i], grid)
+        times.append(time.perf_counter() - t0)
+    times = np.array(times)
+    best = res["best"]
+    ok = times.max() <= TARGET_S
+    print(f"{res['candidates']:,} candidatos por viga, {args.vigas} vigas")
+    print(f"tiempo por viga: media {times.mean():.3f} s, máx {times.max():.3f} s "
+          f"(objetivo {TARGET_S:.0f} s) -> {'OK' if ok else 'LENTO'}")
+    print(f"{res['candidates'] / times.mean():,.0f} candidatos/s")
+    if best is not None:
+        print(f"última viga: {best['b']:g}×{best['h']:g} cm, f'c {best['fc']:g}, "
+              f"Ø{best['bar']}, S/ {best['cost']:.2f} por m, "
+              f"{len(res['pareto'])} puntos en el frente de Pareto")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
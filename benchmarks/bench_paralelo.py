@@ -0,0 +1,42 @@
+"""Escalamiento del diseño paralelo de 1 a N procesos.
+
+Uso::
+
+    python benchmarks/bench_paralelo.py --vigas 500000 --bloque 20000
+"""
+
+import argparse
+import os
+import time
+
+from sintetico import synthetic_project
+
+import viga_paralelo
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=500000)
+    parser.add_argument("--bloque", type=int, default=viga_paralelo.CHUNK_SIZE)
+    parser.add_argument("--max-procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--por-piso", action="store_true",
+                        help="repartir por piso en lugar de por bloques")
+    args = parser.parse_args(argv)
+
+    project = synthetic_project(args.vigas)
+    story = project["story"] if args.por_piso else None
+    print(f"{args.vigas} vigas, bloque {args.bloque}")
+    counts = sorted({2 ** k for k in range(args.max_procesos.bit_length())}
+                    | {args.max_procesos})
+    base = None
+    for workers in counts:
+        t0 = time.perf_counter()
+        viga_paralelo.design_project(project, workers, args.bloque, story)
+        secs = time.perf_counter() - t0
+        base = base or secs
+        print(f"{workers:3d} procesos: {secs:7.3f} s "
+              f"({args.vigas / secs:12,.0f} vigas/s, x{base / secs:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Tiempo de redibujo: ruta anterior (``ax.clear`` + ``canvas.draw``) vs. blitting.
+
+Se ejecuta con la plataforma Qt ``offscreen``::
+
+    python benchmarks/bench_redibujo.py --actualizaciones 1000
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+from matplotlib.backends.backend_qt5agg import (  # noqa: E402
+    FigureCanvasQTAgg as FigureCanvas,
+)
+from matplotlib.figure import Figure  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+from scipy.interpolate import CubicSpline  # noqa: E402
+
+import sintetico  # noqa: E402,F401  (agrega la raíz al sys.path)
+import viga_plots  # noqa: E402
+
+X_CTRL = np.array([0, 0.5, 1.0])
+
+
+def legacy_moments(ax, canvas, mn, mp):
+    """Ruta anterior de ``plot_corrected``: limpia y reconstruye todo."""
+    xs = np.linspace(0, 1.0, 200)
+    csn = CubicSpline(X_CTRL, mn)
+    csp = CubicSpline(X_CTRL, -mp)
+    ax.clear()
+    ax.plot([0, 1.0], [0, 0], 'k-', lw=6)
+    ax.plot(xs, csn(xs), 'b--', label='Neg corregido')
+    ax.plot(xs, csp(xs), 'r--', label='Pos corregido')
+    for i, x_ext in zip((0, 2), (0.0, 1.0)):
+        ax.plot([x_ext, x_ext], [0, csn(X_CTRL[i])], 'b--', lw=2)
+        ax.plot([x_ext, x_ext], [0, csp(X_CTRL[i])], 'r--', lw=2)
+    for x, y in zip(X_CTRL, csn(X_CTRL)):
+        ax.text(x, y + np.sign(y) * 0.05, f"{y:.2f}", ha='center', fontsize=8)
+    for x, y in zip(X_CTRL, csp(X_CTRL)):
+        ax.text(x, y - np.sign(y) * 0.05, f"{y:.2f}", ha='center', fontsize=8)
+    ax.set_xlim(-0.02, 1.02)
+    ax.set_xticks([0, 0.5, 1.0])
+    ax.set_xticklabels(['Extremo I', 'Centro', 'Extremo II'], fontsize=9)
+    ax.set_ylabel('TN·m', fontsize=9)
+    ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1), fontsize=8)
+    canvas.draw()
+
+
+def legacy_distribution(ax, canvas, req_n, req_p, des_n, des_p):
+    """Ruta anterior de ``draw_distribution``."""
+    ax.clear()
+    ax.plot([0, 1], [0, 0], 'k-', lw=6)
+    max_val = max(np.abs(np.concatenate([req_n, req_p, des_n, des_p])).max(), 1)
+    ax.plot(X_CTRL, req_n, 'b-o', label='As req -')
+    ax.plot(X_CTRL, -req_p, 'r-o', label='As req +')
+    ax.plot(X_CTRL, des_n, 'g--o', label='As dis -')
+    ax.plot(X_CTRL, -des_p, 'm--o', label='As dis +')
+    ax.set_xlim(-0.05, 1.05)
+    ax.set_ylim(-1.2 * max_val, 1.2 * max_val)
+    ax.axis('off')
+    ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1), fontsize=8)
+    canvas.draw()
+
+
+def _canvas(figsize):
+    fig = Figure(figsize=figsize, constrained_layout=True)
+    canvas = FigureCanvas(fig)
+    canvas.resize(600, 400)
+    canvas.show()
+    return canvas, fig.add_subplot()
+
+
+def _time(label, n, fn):
+    app = QApplication.instance()
+    t0 = time.perf_counter()
+    for i in range(n):
+        fn(i)
+        app.processEvents()
+    secs = time.perf_counter() - t0
+    print(f"{label:32s} {secs:7.3f} s  ({secs / n * 1000:6.2f} ms/actualización)")
+    return secs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--actualizaciones", type=int, default=1000)
+    args = parser.parse_args(argv)
+    n = args.actualizaciones
+
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+    rng = np.random.default_rng(0)
+    # Variaciones pequeñas, como al cambiar un combo de diseño
+    mn = 10 + rng.uniform(-1, 1, (n, 3))
+    mp = 8 + rng.uniform(-1, 1, (n, 3))
+    req = 6 + rng.uniform(-0.5, 0.5, (n, 6))
+    des = 7 + rng.uniform(-0.5, 0.5, (n, 6))
+
+    canvas, ax = _canvas((6, 3))
+    old_m = _time("momentos, ruta anterior", n,
+                  lambda i: legacy_moments(ax, canvas, mn[i], mp[i]))
+    canvas, ax = _canvas((6, 3))
+    plot = viga_plots.MomentPlot(ax, viga_plots.BlitManager(canvas), '--')
+    new_m = _time("momentos, artistas + blitting", n,
+                  lambda i: plot.update(mn[i], mp[i]))
+
+    canvas, ax = _canvas((5, 6))
+    old_d = _time("distribución, ruta anterior", n, lambda i: legacy_distribution(
+        ax, canvas, req[i, :3], req[i, 3:], des[i, :3], des[i, 3:]))
+    canvas, ax = _canvas((5, 6))
+    dist = viga_plots.DistributionPlot(ax, viga_plots.BlitManager(canvas))
+    new_d = _time("distribución, artistas + blitting", n, lambda i: dist.update(
+        req[i, :3], req[i, 3:], des[i, :3], des[i, 3:]))
+
+    print(f"aceleración: momentos x{old_m / new_m:.1f}, "
+          f"distribución x{old_d / new_d:.1f}")
+
+
+if __name__ == "__main__":
+    main()
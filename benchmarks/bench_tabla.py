@@ -0,0 +1,88 @@
+"""Desplazamiento, orden y filtro de la tabla de proyecto con muchas vigas.
+
+Diseña ``--vigas`` vigas sintéticas en un ``viga_proyecto.ProjectData``,
+las muestra en ``viga_tabla.ProjectWindow`` y mide el tiempo de cuadro al
+recorrer la tabla con pasos de rueda (3 filas) en distintas zonas,
+además del tiempo de ordenar por una columna y de aplicar el
+filtro "Solo NO OK". Termina con código 1 si el p99 del cuadro supera
+16 ms.
+
+Uso::
+
+    python benchmarks/bench_tabla.py --vigas 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+import sintetico
+
+FRAME_MS = 16.0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=100000)
+    parser.add_argument("--pasos", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtCore import Qt
+    from PyQt5.QtWidgets import QApplication
+
+    import viga_batch
+    import viga_proyecto
+    import viga_tabla
+
+    app = QApplication.instance() or QApplication([])
+    project = sintetico.synthetic_project(args.vigas)
+    t0 = time.perf_counter()
+    data = viga_proyecto.ProjectData()
+    step = viga_batch.CHUNK_SIZE
+    for start in range(0, args.vigas, step):
+        chunk = viga_batch.take(project, slice(start, start + step))
+        chunk["id"] = project["id"][start:start + step]
+        data.append(chunk, viga_batch.design_chunk(chunk))
+    load = time.perf_counter() - t0
+
+    win = viga_tabla.ProjectWindow(data)
+    win.show()
+    app.processEvents()
+
+    bar = win.view.verticalScrollBar()
+    frames = []
+    for k in range(args.pasos):
+        # Se salta a otra zona de la tabla (sin medir) y se mide un paso de
+        # rueda de 3 filas, que repinta solo la franja que aparece
+        bar.setValue(int(bar.maximum() * k / args.pasos))
+        app.processEvents()
+        t = time.perf_counter()
+        bar.setValue(bar.value() + 3)
+        app.processEvents()
+        frames.append((time.perf_counter() - t) * 1000)
+
+    t = time.perf_counter()
+    win.view.sortByColumn(5, Qt.DescendingOrder)
+    sort_ms = (time.perf_counter() - t) * 1000
+    t = time.perf_counter()
+    win.cb_no_ok.setChecked(True)
+    filter_ms = (time.perf_counter() - t) * 1000
+
+    frames = np.array(frames)
+    p50, p99 = np.percentile(frames, [50, 99])
+    ok = p99 <= FRAME_MS
+    print(f"{len(data)} vigas diseñadas y cargadas en {load:.2f} s")
+    print(f"ordenar {sort_ms:.1f} ms, filtrar NO OK {filter_ms:.1f} ms "
+          f"({win.model.rowCount()} filas)")
+    print(f"cuadro al desplazar: p50 {p50:.2f} ms, p99 {p99:.2f} ms, "
+          f"máx {frames.max():.2f} ms (objetivo {FRAME_MS:.0f} ms) -> "
+          f"{'OK' if ok else 'LENTO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
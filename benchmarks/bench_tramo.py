@@ -0,0 +1,84 @@
+"""Tiempo del diseño a lo largo del tramo (estaciones × vigas).
+
+Diseña ``--vigas`` vigas sintéticas con su armado automático y mide
+``viga_tramo.span_design``: cortes teóricos y prácticos de cada grupo de
+barras y longitudes de desarrollo en las ``STATIONS`` de ``viga_core``.
+Informa el tiempo por cada 100 000 vigas del proyecto completo y el de una
+sola viga con las curvas de acero para el gráfico (uso interactivo), frente
+a sus objetivos; termina con código 1 si alguno se supera.
+
+Uso::
+
+    python benchmarks/bench_tramo.py --vigas 100000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+import sintetico
+
+TARGET_MS = 2500.0   # por cada 100 000 vigas
+TARGET_ONE_MS = 5.0  # una viga con curvas
+REPEAT = 3
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--vigas", type=int, default=100000)
+    parser.add_argument("--luz", type=float, default=6.0)
+    args = parser.parse_args(argv)
+
+    import viga_barras
+    import viga_core
+    import viga_modelo
+    import viga_tramo
+
+    p = sintetico.synthetic_project(args.vigas)
+    res = viga_core.design_beams(
+        p["mn"], p["mp"], p["sys_t"], p["b"], p["h"], p["r"], p["fc"],
+        p["fy"], p["phi"], p["de"], p["db"],
+    )
+    sec = [p[k][:, None] for k in ("b", "h", "r", "fc", "fy", "phi", "de")]
+    index = viga_barras.default_index()
+    ids = viga_barras.layered_lookup(
+        np.hstack([res["as_n"], res["as_p"]]),
+        np.hstack([res["mn_corr"], res["mp_corr"]]), *sec, index)
+    beams = viga_modelo.new_beams(args.vigas)
+    viga_modelo.set_layout_from_index(beams, ids, index)
+    layout = [beams[k] for k in viga_modelo.LAYOUT_FIELDS]
+    data = [res["mn_corr"], res["mp_corr"]] + [
+        p[k] for k in ("b", "h", "r", "fc", "fy", "phi", "de")] + [res["d"]]
+
+    times = []
+    for _ in range(REPEAT):
+        t0 = time.perf_counter()
+        out = viga_tramo.span_design(*data, *layout, args.luz)
+        times.append(time.perf_counter() - t0)
+
+    one = [v[:1] for v in data + layout]
+    one_times = []
+    for _ in range(50):
+        t0 = time.perf_counter()
+        viga_tramo.span_design(*one, args.luz, curves=True)
+        one_times.append(time.perf_counter() - t0)
+
+    n_st = len(viga_core.STATIONS)
+    per_100k = min(times) / args.vigas * 100000 * 1000
+    one_ms = float(np.median(one_times)) * 1000
+    ok = per_100k <= TARGET_MS and one_ms <= TARGET_ONE_MS
+    teo = out["teo"]
+    cut = teo[..., 1] - teo[..., 0] < args.luz - 1e-9
+    print(f"{args.vigas} vigas × {n_st} estaciones: "
+          f"{int(cut.sum())} grupos de barras cortados dentro del tramo")
+    print(f"span_design: {min(times) * 1000:.0f} ms ({per_100k:.0f} ms por "
+          f"100 000 vigas, objetivo {TARGET_MS:.0f} ms)")
+    print(f"una viga con curvas: {one_ms:.2f} ms (objetivo "
+          f"{TARGET_ONE_MS:.0f} ms) -> {'OK' if ok else 'LENTO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+"""Prueba de carga del servicio HTTP local (``viga_servicio``).
+
+Inicia el servicio en un puerto libre (o usa ``--url``) y mide:
+
+* peticiones individuales ``/corregir`` desde ``--conexiones`` conexiones
+  persistentes durante ``--segundos``: latencia p50/p99 y peticiones por
+  segundo;
+* un lote NDJSON de ``--vigas`` vigas en ``/lote/areas``, enviado por
+  partes mientras se lee la respuesta: vigas por segundo;
+* durante ese lote, la latencia de una petición individual cada 10 ms, para
+  comprobar que el bucle de eventos sigue atendiendo.
+
+Termina con código 1 si el p99 individual supera el objetivo.
+
+Uso::
+
+    python benchmarks/carga_servicio.py --conexiones 16 --segundos 5
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+import numpy as np
+
+import sintetico
+
+TARGET_P99_MS = 20.0
+PROBE_INTERVAL = 0.01
+
+
+async def read_response(reader):
+    """Estado y cuerpo de una respuesta (``Content-Length`` o ``chunked``)."""
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding") == "chunked":
+        parts = []
+        while True:
+            size = int(await reader.readline(), 16)
+            data = await reader.readexactly(size + 2)
+            if not size:
+                break
+            parts.append(data[:-2])
+        return status, b"".join(parts)
+    return status, await reader.readexactly(int(headers["content-length"]))
+
+
+def request_bytes(path, body):
+    return (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: "
+            f"application/json\r\nContent-Length: {len(body)}\r\n\r\n"
+            .encode("latin-1") + body)
+
+
+async def single_client(host, port, bodies, deadline, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        writer.write(request_bytes("/corregir", bodies[i % len(bodies)]))
+        status, _ = await read_response(reader)
+        latencies.append(time.perf_counter() - t0)
+        if status != 200:
+            raise RuntimeError(f"respuesta {status}")
+        i += 1
+    writer.close()
+
+
+async def single_phase(host, port, bodies, connections, seconds):
+    latencies = []
+    t0 = time.perf_counter()
+    deadline = t0 + seconds
+    await asyncio.gather(*(
+        single_client(host, port, bodies[k::connections], deadline, latencies)
+        for k in range(connections)))
+    return np.array(latencies), time.perf_counter() - t0
+
+
+async def batch_phase(host, port, lines, probe_body):
+    """Envía el lote por partes y mide una petición individual cada 10 ms."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"POST /lote/areas HTTP/1.1\r\nHost: localhost\r\n"
+                 b"Content-Type: application/x-ndjson\r\n"
+                 b"Transfer-Encoding: chunked\r\n\r\n")
+
+    async def send():
+        for k in range(0, len(lines), 1000):
+            data = b"".join(lines[k:k + 1000])
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+    probes = []
+    done = asyncio.Event()
+
+    async def probe():
+        r, w = await asyncio.open_connection(host, port)
+        while not done.is_set():
+            t0 = time.perf_counter()
+            w.write(request_bytes("/corregir", probe_body))
+            await read_response(r)
+            probes.append(time.perf_counter() - t0)
+            await asyncio.sleep(PROBE_INTERVAL)
+        w.close()
+
+    t0 = time.perf_counter()
+    probe_task = asyncio.create_task(probe())
+    sender = asyncio.create_task(send())
+    status, body = await read_response(reader)
+    secs = time.perf_counter() - t0
+    done.set()
+    await sender
+    await probe_task
+    writer.close()
+    if status != 200:
+        raise RuntimeError(f"respuesta {status}")
+    return body.count(b"\n"), secs, np.array(probes)
+
+
+def start_server(workers):
+    root = sintetico.ROOT
+    proc = subprocess.Popen(
+        [sys.executable, os.path.join(root, "viga2.0.py"), "servicio",
+         "--puerto", "0", "--procesos", str(workers)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+        cwd=root)
+    line = proc.stderr.readline()
+    if not line.startswith("Servicio en "):
+        proc.kill()
+        raise RuntimeError(line or "el servicio no inició")
+    return proc, line.split()[2]
+
+
+def ms(values, q):
+    return float(np.percentile(values, q)) * 1000 if len(values) else float("nan")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--url", help="servicio ya iniciado (por defecto se inicia uno)")
+    parser.add_argument("--procesos", type=int, default=0,
+                        help="procesos del servicio iniciado; 0 usa todos")
+    parser.add_argument("--conexiones", type=int, default=16)
+    parser.add_argument("--segundos", type=float, default=5.0)
+    parser.add_argument("--vigas", type=int, default=100000)
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.procesos or os.cpu_count() or 1)
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port
+
+    p = sintetico.synthetic_project(args.vigas)
+    mn, mp = p["mn"].tolist(), p["mp"].tolist()
+    bodies = [json.dumps({"mn": a, "mp": b}).encode() for a, b in
+              zip(mn[:1000], mp[:1000])]
+    lines = [json.dumps({"id": i, "mn": a, "mp": b, "b": bb, "h": hh})
+             .encode() + b"\n"
+             for i, (a, b, bb, hh) in enumerate(
+                 zip(mn, mp, p["b"].tolist(), p["h"].tolist()))]
+
+    try:
+        lat, secs = asyncio.run(single_phase(
+            host, port, bodies, args.conexiones, args.segundos))
+        n_out, batch_s, probes = asyncio.run(
+            batch_phase(host, port, lines, bodies[0]))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    ok = ms(lat, 99) <= TARGET_P99_MS and n_out == args.vigas
+    print(f"individual /corregir, {args.conexiones} conexiones: "
+          f"{len(lat)} peticiones en {secs:.1f} s ({len(lat) / secs:,.0f} "
+          f"pet/s), p50 {ms(lat, 50):.2f} ms, p99 {ms(lat, 99):.2f} ms "
+          f"(objetivo {TARGET_P99_MS:.0f} ms)")
+    print(f"lote NDJSON /lote/areas: {n_out} vigas en {batch_s:.2f} s "
+          f"({n_out / batch_s:,.0f} vigas/s)")
+    print(f"individual durante el lote: {len(probes)} peticiones, "
+          f"p50 {ms(probes, 50):.2f} ms, p99 {ms(probes, 99):.2f} ms "
+          f"-> {'OK' if ok else 'LENTO'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
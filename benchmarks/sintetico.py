@@ -0,0 +1,33 @@
+"""Proyectos sintéticos para los benchmarks."""
+
+import os
+import sys
+
+import numpy as np
+
+# Permite ejecutar los benchmarks desde cualquier carpeta
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from viga_core import DIAM_CM  # noqa: E402
+
+
+def synthetic_project(n, seed=0, beams_per_story=500):
+    """Diccionario de entrada de ``n`` vigas con datos aleatorios realistas."""
+    rng = np.random.default_rng(seed)
+    return {
+        "id": [f"V{i}" for i in range(n)],
+        "story": np.arange(n) // beams_per_story,
+        "mn": rng.uniform(0, 30, (n, 3)),
+        "mp": rng.uniform(0, 20, (n, 3)),
+        "sys_t": rng.choice(["dual1", "dual2"], n),
+        "b": rng.choice([25.0, 30.0, 40.0], n),
+        "h": rng.choice([40.0, 50.0, 60.0, 70.0], n),
+        "r": np.full(n, 4.0),
+        "fc": rng.choice([210.0, 280.0], n),
+        "fy": np.full(n, 4200.0),
+        "phi": np.full(n, 0.9),
+        "de": np.full(n, DIAM_CM['3/8"']),
+        "db": rng.choice([DIAM_CM['5/8"'], DIAM_CM['3/4"']], n),
+    }
@@ -0,0 +1,100 @@
+"""Prueba de resistencia del hover de los diagramas de momentos.
+
+Recalcula el diagrama muchas veces seguidas (10 000 por defecto) y cada
+cierto número de ciclos mide la memoria residente del proceso, la cantidad de
+artistas y de manejadores registrados y la latencia de un evento de hover.
+Todo debe mantenerse plano; si la memoria crece más que ``--tolerancia-kb``
+o aparecen artistas o manejadores nuevos, termina con código 1.
+
+    python benchmarks/soak_hover.py --recalculos 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np  # noqa: E402
+from matplotlib.backend_bases import MouseEvent  # noqa: E402
+from matplotlib.backends.backend_qt5agg import (  # noqa: E402
+    FigureCanvasQTAgg as FigureCanvas,
+)
+from matplotlib.figure import Figure  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+import sintetico  # noqa: E402,F401  (agrega la raíz al sys.path)
+import viga_plots  # noqa: E402
+
+
+def _hover_latency(canvas, ax, samples=50):
+    """Latencia media (ms) de un evento de movimiento sobre la curva."""
+    t0 = time.perf_counter()
+    for k in range(samples):
+        x = (k + 0.5) / samples
+        px, py = ax.transData.transform((x, 0.0))
+        event = MouseEvent('motion_notify_event', canvas, px, py)
+        canvas.callbacks.process('motion_notify_event', event)
+    return (time.perf_counter() - t0) / samples * 1000
+
+
+def _rss_kib():
+    """Memoria residente actual (KiB); máximo histórico fuera de Linux."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _n_callbacks(canvas):
+    return sum(len(v) for v in canvas.callbacks.callbacks.values())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recalculos", type=int, default=10000)
+    parser.add_argument("--cada", type=int, default=1000)
+    parser.add_argument("--tolerancia-kb", type=float, default=2048)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    fig = Figure(figsize=(6, 3), constrained_layout=True)
+    canvas = FigureCanvas(fig)
+    canvas.resize(600, 300)
+    canvas.show()
+    ax = fig.add_subplot()
+    plot = viga_plots.MomentPlot(
+        ax, viga_plots.BlitManager(canvas), '--', hover=True
+    )
+    rng = np.random.default_rng(0)
+    plot.update(rng.uniform(5, 15, 3), rng.uniform(5, 15, 3))
+    app.processEvents()
+
+    rows = []
+    for i in range(1, args.recalculos + 1):
+        plot.update(rng.uniform(5, 15, 3), rng.uniform(5, 15, 3))
+        if i % args.cada == 0:
+            app.processEvents()
+            rows.append((
+                i,
+                _rss_kib(),
+                len(ax.get_children()),
+                _n_callbacks(canvas),
+                _hover_latency(canvas, ax),
+            ))
+            print("{:6d} recálculos: {:9.1f} KiB, {} artistas, "
+                  "{} manejadores, hover {:.3f} ms".format(*rows[-1]))
+
+    first, last = rows[0], rows[-1]
+    growth = last[1] - first[1]
+    ok = growth <= args.tolerancia_kb and first[2:4] == last[2:4]
+    print(f"crecimiento de memoria: {growth:.1f} KiB -> "
+          f"{'OK' if ok else 'NO OK'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""Suite de benchmarks del flujo de diseño con salida JSON y comparación.
+
+Mide cada etapa por separado y el flujo completo sobre datos sintéticos de
+1 a 1 000 000 de vigas:
+
+- ``correct_moments``, ``as_required`` (``_calc_as_req``), ``as_limits``
+  (``_calc_as_limits``), ``base_required`` (verificación de base de
+  ``update_design_as``) y ``moment_curves`` (curvas de momento);
+- ``design_beams`` y ``design_chunk`` (flujo completo con armado);
+- los gráficos ``MomentPlot``, ``DistributionPlot`` y ``SectionPlot`` bajo
+  ``QT_QPA_PLATFORM=offscreen`` (se omiten con ``--sin-gui``).
+
+Uso::
+
+    python benchmarks/suite.py --salida base.json
+    python benchmarks/suite.py --salida nuevo.json --comparar base.json --umbral 0.2
+
+Con ``--comparar`` se marcan como ``LENTO`` las mediciones que empeoran más
+que el umbral relativo, y el proceso termina con código 1 si hay alguna.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+
+from sintetico import synthetic_project
+
+import viga_batch
+import viga_core
+
+SIZES = (1, 1000, 100000, 1000000)
+GUI_UPDATES = 200
+
+
+def measure(fn, min_time=0.2, max_repeat=50):
+    """Mejor tiempo (s) de ``fn`` repitiendo hasta ``min_time`` segundos."""
+    best = float("inf")
+    total = 0.0
+    for _ in range(max_repeat):
+        t0 = time.perf_counter()
+        fn()
+        secs = time.perf_counter() - t0
+        best = min(best, secs)
+        total += secs
+        if total >= min_time:
+            break
+    return best
+
+
+def core_cases(p):
+    """Etapas del núcleo sobre el proyecto sintético ``p``."""
+    mn_c, mp_c = viga_core.correct_moments(p["mn"], p["mp"], p["sys_t"])
+    d = viga_core.effective_depth(p["h"], p["r"], p["de"], p["db"])
+    n_bars = np.full(len(d), 4)
+    return {
+        "correct_moments": lambda: viga_core.correct_moments(
+            p["mn"], p["mp"], p["sys_t"]),
+        "as_required": lambda: viga_core.as_required(
+            mn_c, p["fc"][:, None], p["b"][:, None], d[:, None],
+            p["fy"][:, None], p["phi"][:, None]),
+        "as_limits": lambda: viga_core.as_limits(p["fc"], p["fy"], p["b"], d),
+        "base_required": lambda: viga_core.base_required(
+            n_bars, p["db"], n_bars, p["db"], p["r"], p["de"]),
+        "moment_curves": lambda: viga_core.moment_curves(mn_c),
+        "design_beams": lambda: viga_core.design_beams(
+            p["mn"], p["mp"], p["sys_t"], p["b"], p["h"], p["r"], p["fc"],
+            p["fy"], p["phi"], p["de"], p["db"]),
+        "design_chunk": lambda: viga_batch.design_chunk(p),
+    }
+
+
+def gui_cases(n_updates=GUI_UPDATES):
+    """Actualizaciones seguidas de cada gráfico en lienzos Qt fuera de pantalla."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+    from matplotlib.figure import Figure
+    from PyQt5.QtWidgets import QApplication
+
+    import viga_plots
+
+    app = QApplication.instance() or QApplication([])
+
+    def canvas(figsize):
+        fig = Figure(figsize=figsize, constrained_layout=True)
+        cv = FigureCanvasQTAgg(fig)
+        cv.resize(600, 400)
+        cv.show()
+        return cv, fig.add_subplot()
+
+    rng = np.random.default_rng(0)
+    mom = 10 + rng.uniform(-1, 1, (n_updates, 2, 3))
+    areas = 6 + rng.uniform(-0.5, 0.5, (n_updates, 4, 3))
+
+    cv, ax = canvas((6, 3))
+    moment = viga_plots.MomentPlot(ax, viga_plots.BlitManager(cv), hover=True)
+    cv, ax = canvas((5, 6))
+    dist = viga_plots.DistributionPlot(ax, viga_plots.BlitManager(cv))
+    cv, ax = canvas((3, 3))
+    section = viga_plots.SectionPlot(ax, viga_plots.BlitManager(cv))
+    app.processEvents()
+
+    def loop(update):
+        def run():
+            for i in range(n_updates):
+                update(i)
+            app.processEvents()
+        return run
+
+    return {
+        "MomentPlot.update": loop(lambda i: moment.update(*mom[i])),
+        "DistributionPlot.update": loop(lambda i: dist.update(*areas[i])),
+        "SectionPlot.update": loop(
+            lambda i: section.update(30 + i % 3, 50, 4, 0.95, 1.59)),
+    }
+
+
+def run_suite(sizes=SIZES, gui=True):
+    results = {}
+    for n in sizes:
+        project = synthetic_project(n)
+        for name, fn in core_cases(project).items():
+            secs = measure(fn)
+            results[f"{name}/{n}"] = {"segundos": secs, "vigas": n}
+            print(f"{name:22s} {n:>9d} vigas  {secs * 1000:10.3f} ms")
+    if gui:
+        for name, fn in gui_cases().items():
+            secs = measure(fn, max_repeat=3)
+            results[name] = {"segundos": secs, "actualizaciones": GUI_UPDATES}
+            print(f"{name:22s} {GUI_UPDATES:>5d} redibujos  "
+                  f"{secs / GUI_UPDATES * 1000:8.3f} ms/redibujo")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Lista de ``(clave, antes, ahora)`` que empeoran más de ``threshold``."""
+    slow = []
+    for key, res in results.items():
+        ref = baseline.get(key)
+        if ref is None:
+            continue
+        before, now = ref["segundos"], res["segundos"]
+        ratio = now / before if before > 0 else float("inf")
+        flag = "LENTO" if ratio > 1 + threshold else "ok"
+        print(f"{key:32s} {before * 1000:10.3f} -> {now * 1000:10.3f} ms "
+              f"({ratio:5.2f}x) {flag}")
+        if flag == "LENTO":
+            slow.append((key, before, now))
+    return slow
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tamanos", type=int, nargs="+", default=list(SIZES),
+                        help="número de vigas de cada medición")
+    parser.add_argument("--sin-gui", action="store_true",
+                        help="omitir las mediciones de gráficos Qt")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", help="JSON de referencia para comparar")
+    parser.add_argument("--umbral", type=float, default=0.2,
+                        help="empeoramiento relativo tolerado (0.2 = 20 %%)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.tamanos, gui=not args.sin_gui)
+    report = {
+        "meta": {
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+        },
+        "resultados": results,
+    }
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            baseline = json.load(f)["resultados"]
+        slow = compare(results, baseline, args.umbral)
+        if slow:
+            print(f"{len(slow)} mediciones más lentas que la referencia "
+                  f"(umbral {args.umbral:.0%})")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""Búsqueda de armados de ``viga_barras`` frente a recorridos por fuerza bruta."""
+
+import numpy as np
+import pytest
+
+import viga_barras
+import viga_core
+
+
+@pytest.fixture(scope="module")
+def index():
+    return viga_barras.default_index()
+
+
+def brute_lookup(index, as_req, avail):
+    """Combinación de menor área con ``As >= as_req`` que cabe en ``avail``."""
+    ok = (index.area >= as_req) & (index.width <= avail + 1e-9)
+    if not ok.any():
+        return -1
+    return int(np.flatnonzero(ok)[np.argmin(index.area[ok])])
+
+
+def test_index_is_sorted_by_area(index):
+    assert np.all(np.diff(index.area) >= 0)
+    assert len(index.area) == len(set(zip(index.n1, index.c1, index.n2,
+                                          index.c2)))
+
+
+def test_lookup_matches_brute_force(index):
+    rng = np.random.default_rng(2)
+    as_req = np.concatenate([rng.uniform(0, 60, 3000), index.area[::7],
+                             [0.0, 1e3]])
+    avail = rng.choice([8.0, 12.0, 17.1, 20.1, 25.0, 40.0], len(as_req))
+    ids = index.lookup(as_req, avail)
+    for i, (a, w) in enumerate(zip(as_req, avail)):
+        ref = brute_lookup(index, a, w)
+        if ref < 0:
+            assert ids[i] == -1
+        else:
+            # A igual área puede haber varias; basta con la misma área
+            assert ids[i] >= 0
+            assert index.area[ids[i]] == pytest.approx(index.area[ref])
+            assert index.width[ids[i]] <= w + 1e-9
+
+
+def test_select_bars_base_and_labels(index):
+    bars = viga_barras.select_bars([[5.0, 30.0, 200.0]], 30.0, 4.0, 0.95)
+    assert bars["area"][0, 0] >= 5.0
+    assert bars["base_req"][0, 0] <= 30.0 + 1e-9
+    assert bars["label"][0, 2] == viga_barras.NO_FIT
+    assert bars["n1"][0, 2] == 0
+    assert np.isnan(bars["base_req"][0, 2])
+    n1, d1 = bars["n1"][0, 0], viga_core.DIAM_CM[bars["bar1"][0, 0]]
+    n2 = bars["n2"][0, 0]
+    d2 = viga_core.DIAM_CM[bars["bar2"][0, 0]] if n2 else 0.0
+    assert bars["base_req"][0, 0] == pytest.approx(
+        viga_core.base_required(n1, d1, n2, d2, 4.0, 0.95))
+
+
+def brute_layered(index, as_req, mu, b, h, r, fc, fy, phi, de):
+    """Área del armado más barato que cubre ``As`` con el ``d`` de sus barras.
+
+    Como ``layered_lookup``: en una capa cualquier combinación; si ninguna
+    cabe, un solo diámetro en hasta ``MAX_LAYERS`` capas.
+    """
+    ids = np.arange(len(index.area))
+    layers, d = index.depth(ids, b, h, r, de)
+    as_min, as_max = viga_core.as_limits(fc, fy, b, d)
+    req = np.clip(viga_core.as_required(mu, fc, b, d, fy, phi), as_min, as_max)
+    covers = (index.area >= as_req - 1e-9) & (index.area >= req - 1e-9)
+    one = covers & (index.width <= b - 2 * r - 2 * de + 1e-9)
+    multi = (covers & (index.n2 == 0) & (layers >= 1)
+             & (layers <= viga_core.MAX_LAYERS))
+    for ok in (one, multi):
+        if ok.any():
+            return index.area[ok].min()
+    return None
+
+
+def test_layered_lookup_matches_brute_force(index):
+    rng = np.random.default_rng(3)
+    n = 400
+    b = rng.choice([25.0, 30.0, 35.0, 40.0], n)
+    h = rng.choice([40.0, 50.0, 60.0, 70.0], n)
+    mu = rng.uniform(0, 60, n)
+    r, fc, fy, phi, de = 4.0, 210.0, 4200.0, 0.9, 0.95
+    d = viga_core.effective_depth(h, r, de, 1.59)
+    as_req, _, _, _ = viga_core.required_areas(mu[:, None], mu[:, None], b,
+                                               d, fc, fy, phi)
+    as_req = as_req[:, 0]
+    ids = viga_barras.layered_lookup(as_req, mu, b, h, r, fc, fy, phi, de)
+    layers, d_bars = index.depth(ids, b, h, r, de)
+    for i in range(n):
+        ref = brute_layered(index, as_req[i], mu[i], b[i], h[i], r, fc, fy,
+                            phi, de)
+        if ref is None:
+            assert ids[i] == -1
+            continue
+        assert ids[i] >= 0
+        assert index.area[ids[i]] == pytest.approx(ref)
+        assert 1 <= layers[i] <= viga_core.MAX_LAYERS
+    # Hay casos de varias capas en la muestra
+    assert (layers > 1).any()
+
+
+def test_layered_lookup_keeps_one_layer_when_it_fits(index):
+    # Momento pequeño: el armado de una capa cubre As_min con su propio d
+    ids = viga_barras.layered_lookup(5.0, 2.0, 30.0, 60.0, 4.0, 210.0, 4200.0,
+                                     0.9, 0.95)
+    assert ids == index.lookup(5.0, 30.0 - 8.0 - 1.9)
+
+
+def test_layered_lookup_no_fit(index):
+    ids = viga_barras.layered_lookup([500.0], [400.0], 25.0, 40.0, 4.0, 210.0,
+                                     4200.0, 0.9, 0.95)
+    assert ids[0] == -1
+    assert index.label_of(ids)[0] == viga_barras.NO_FIT
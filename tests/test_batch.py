@@ -0,0 +1,145 @@
+"""Línea de comandos ``lote``: ida y vuelta por CSV y mensajes de error."""
+
+import csv
+
+import numpy as np
+import pytest
+
+import viga_batch
+import viga_core
+
+HEADER = "id,M1-,M2-,M3-,M1+,M2+,M3+,sistema,b,h,varilla\n"
+ROWS = [
+    "V1,12,5,10,3,8,2,dual2,30,50,5/8\"",
+    "V2,20.5,9,18,6,14,4,dual1,25,60,1.91",
+    "V3,30,12,25,10,20,8,,35,70,",
+    "V4,0,0,0,0,0,0,dual2,30,50,5/8\"",
+    "V5,45,20,40,15,30,12,DUAL2,40,70,3/4\"",
+    "V6,8,3,6,2,5,1,dual1,,,",
+    "V7,60,25,55,20,40,18,dual2,25,40,1\"",
+]
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def read_rows(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture
+def cuadro(tmp_path):
+    return write(tmp_path / "vigas.csv", HEADER + "\n".join(ROWS) + "\n")
+
+
+def test_round_trip(cuadro, tmp_path, capsys):
+    out = str(tmp_path / "res.csv")
+    assert viga_batch.main([cuadro, out, "--bloque", "3"]) == 0
+    assert "7 vigas" in capsys.readouterr().err
+    rows = read_rows(out)
+    assert rows[0] == viga_batch.OUT_COLS
+    assert [r[0] for r in rows[1:]] == [f"V{i}" for i in range(1, 8)]
+
+    # Mismos valores que design_beams con los datos (y valores por defecto)
+    # de cada fila
+    mn = np.array([[float(v) for v in r.split(",")[1:4]] for r in ROWS])
+    mp = np.array([[float(v) for v in r.split(",")[4:7]] for r in ROWS])
+    sys_t = ["dual2", "dual1", "dual2", "dual2", "dual2", "dual1", "dual2"]
+    b = np.array([30, 25, 35, 30, 40, 30, 25], dtype=float)
+    h = np.array([50, 60, 70, 50, 70, 50, 40], dtype=float)
+    db = np.array([1.59, 1.91, 1.59, 1.59, 1.91, 1.59, 2.54])
+    res = viga_core.design_beams(mn, mp, sys_t, b, h, 4, 210, 4200, 0.9,
+                                 0.95, db)
+    values = np.array([[float(v) for v in r[1:16]] for r in rows[1:]])
+    expected = np.column_stack([
+        res["mn_corr"], res["mp_corr"], res["d"], res["as_min"],
+        res["as_max"], res["as_n"], res["as_p"],
+    ])
+    np.testing.assert_allclose(values, expected, atol=5e-5)
+
+    col = {name: i for i, name in enumerate(rows[0])}
+    for r in rows[1:]:
+        labels = r[col["Ar1-"]:col["Ar3+"] + 1]
+        assert all(labels)
+        if r[col["ok"]] == "OK":
+            assert "Aumentar sección" not in labels
+
+
+def test_capacity_columns_and_ok(cuadro, tmp_path):
+    out = str(tmp_path / "res.csv")
+    assert viga_batch.main([cuadro, out, "--capacidad"]) == 0
+    rows = read_rows(out)
+    assert rows[0] == viga_batch.OUT_COLS + viga_batch.CAPACITY_COLS
+    col = {name: i for i, name in enumerate(rows[0])}
+    for r in rows[1:]:
+        dc = [float(r[col[f"DC{i}{s}"]]) for s in "-+" for i in (1, 2, 3)]
+        if r[col["ok"]] == "OK":
+            assert max(dc) <= 1.0
+        else:
+            assert max(dc) > 1.0 or "Aumentar sección" in r
+
+
+def test_processes_and_cache_match_single_process(cuadro, tmp_path):
+    plain = str(tmp_path / "plain.csv")
+    assert viga_batch.main([cuadro, plain, "--bloque", "2"]) == 0
+    expected = read_rows(plain)
+
+    par = str(tmp_path / "par.csv")
+    assert viga_batch.main([cuadro, par, "--bloque", "2",
+                            "--procesos", "2"]) == 0
+    assert read_rows(par) == expected
+
+    db = str(tmp_path / "cache.sqlite")
+    for name in ("cold.csv", "warm.csv"):
+        out = str(tmp_path / name)
+        assert viga_batch.main([cuadro, out, "--bloque", "2", "--cache", db,
+                                "--procesos", "2"]) == 0
+        assert read_rows(out) == expected
+
+
+def test_blank_rows_are_skipped(tmp_path):
+    text = "\n" + HEADER + ROWS[0] + "\n\n,,,,,,,,,,\n" + ROWS[1] + "\n\n"
+    out = str(tmp_path / "res.csv")
+    assert viga_batch.main([write(tmp_path / "v.csv", text), out]) == 0
+    assert [r[0] for r in read_rows(out)[1:]] == ["V1", "V2"]
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "El CSV está vacío"),
+    ("\n\n", "El CSV está vacío"),
+    ("id,M1-,M2-,M3-\n", "Faltan columnas en el CSV: M1+, M2+, M3+"),
+    (HEADER + ROWS[0] + "\nV2,1,2,3\n", "Línea 3: 4 columnas, se esperaban 11"),
+    (HEADER + ROWS[0] + "\nV2,1,x,3,4,5,6,,,,\n",
+     "Línea 3, viga 'V2': could not convert string to float"),
+    (HEADER + "V9,1,2,3,4,5,6,dual 2,,,\n",
+     "Línea 2, viga 'V9': Sistema desconocido: 'dual 2'"),
+    (HEADER + "V9,1,2,3,4,5,6,,,,7/8\"\n",
+     "Línea 2, viga 'V9': Diámetro no disponible"),
+])
+def test_errors(tmp_path, capsys, text, message):
+    out = str(tmp_path / "res.csv")
+    assert viga_batch.main([write(tmp_path / "v.csv", text), out]) == 1
+    err = capsys.readouterr().err
+    assert err.startswith("Error: ")
+    assert message in err
+    assert "Traceback" not in err
+
+
+def test_missing_file(tmp_path, capsys):
+    assert viga_batch.main([str(tmp_path / "no.csv"),
+                            str(tmp_path / "res.csv")]) == 1
+    assert capsys.readouterr().err.startswith("Error: ")
+
+
+@pytest.mark.parametrize("module", ["viga_batch", "viga_tramo",
+                                    "viga_memoria", "viga_etabs"])
+@pytest.mark.parametrize("size", ["0", "-5", "x"])
+def test_chunk_size_must_be_positive(cuadro, tmp_path, capsys, module, size):
+    main = __import__(module).main
+    with pytest.raises(SystemExit) as exc:
+        main([cuadro, str(tmp_path / "out"), "--bloque", size])
+    assert exc.value.code == 2
+    assert "--bloque" in capsys.readouterr().err
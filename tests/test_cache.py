@@ -0,0 +1,60 @@
+"""Caché de diseño ``viga_cache``: mismos resultados y desalojo LRU."""
+
+import io
+import sqlite3
+
+import numpy as np
+
+import viga_batch
+import viga_cache
+
+
+def chunk_of(n, seed=0):
+    rng = np.random.default_rng(seed)
+    lines = ["id,M1-,M2-,M3-,M1+,M2+,M3+,sistema,b,h"]
+    for j in range(n):
+        m = rng.uniform(1, 40, 6).round(2)
+        lines.append(",".join([f"V{j}", *map(str, m),
+                               rng.choice(["dual1", "dual2"]),
+                               str(rng.choice([25, 30, 35])),
+                               str(rng.choice([50, 60, 70]))]))
+    return next(viga_batch.iter_chunks(io.StringIO("\n".join(lines) + "\n")))
+
+
+def test_cached_design_matches_direct(tmp_path):
+    chunk = chunk_of(300)
+    ref = viga_batch.design_chunk(chunk)
+    with viga_cache.DesignCache(str(tmp_path / "c.db")) as cache:
+        first = viga_cache.design_chunk_cached(chunk, cache)
+        second = viga_cache.design_chunk_cached(chunk, cache)
+        assert cache.stats()["aciertos"] == 300
+        assert cache.stats()["fallos"] == 300
+    for res in (first, second):
+        for key, value in ref.items():
+            np.testing.assert_array_equal(res[key], value, err_msg=key)
+
+
+def stored_keys(path):
+    with sqlite3.connect(path) as db:
+        return {k for (k,) in db.execute("SELECT clave FROM diseno")}
+
+
+def test_lru_eviction_uses_deferred_reads(tmp_path):
+    path = str(tmp_path / "c.db")
+    keys = [bytes([k]) * 16 for k in range(6)]
+    row = np.zeros((1, viga_cache.N_VALUES))
+    with viga_cache.DesignCache(path, max_entries=4) as cache:
+        for key in keys[:4]:
+            cache.put_many([key], row)
+        # La lectura de la primera clave solo queda en memoria...
+        assert list(cache.get_many(keys[:1])) == keys[:1]
+        # ...y se escribe antes de desalojar: sale la segunda
+        cache.put_many(keys[4:5], row)
+        assert cache.evictions == 1
+        assert stored_keys(path) == {keys[0], *keys[2:5]}
+        cache.get_many(keys[2:3])
+    # Las lecturas pendientes se escriben al cerrar: sale la cuarta
+    with viga_cache.DesignCache(path, max_entries=4) as cache:
+        assert len(cache) == 4
+        cache.put_many(keys[5:], row)
+    assert stored_keys(path) == {keys[0], keys[2], keys[4], keys[5]}
@@ -0,0 +1,100 @@
+"""Envolvente de combinaciones E.060 frente a un recorrido viga por viga."""
+
+import csv
+
+import numpy as np
+import pytest
+
+import viga_batch
+import viga_combos
+
+
+def brute_envelope(D, L, SX, SY):
+    """Máximo negativo y positivo de cada combinación escrita a mano."""
+    combos = [
+        1.4 * D + 1.7 * L,
+        1.25 * (D + L) + SX, 1.25 * (D + L) - SX,
+        1.25 * (D + L) + SY, 1.25 * (D + L) - SY,
+        0.9 * D + SX, 0.9 * D - SX, 0.9 * D + SY, 0.9 * D - SY,
+    ]
+    mn = max(0.0, -min(combos))
+    mp = max(0.0, max(combos))
+    return mn, mp, int(np.argmin(combos)), int(np.argmax(combos))
+
+
+@pytest.fixture
+def moments():
+    rng = np.random.default_rng(5)
+    m = rng.uniform(-30, 30, (4, 200, 3))
+    m[2:, :10] = 0.0  # sin sismo
+    m[:, 10:12] = 0.0  # viga sin momentos
+    return m
+
+
+def test_envelope_matches_brute_force(moments):
+    env = viga_combos.envelope(moments, block=64)
+    assert env["names"] == list(viga_combos.COMBINATIONS)
+    for j in range(moments.shape[1]):
+        for k in range(3):
+            mn, mp, gn, gp = brute_envelope(*moments[:, j, k])
+            assert env["mn"][j, k] == pytest.approx(mn, abs=1e-12)
+            assert env["mp"][j, k] == pytest.approx(mp, abs=1e-12)
+            assert env["gov_n"][j, k] == (gn if mn > 0 else -1)
+            assert env["gov_p"][j, k] == (gp if mp > 0 else -1)
+
+
+def test_gravity_only_is_governed_by_1_4d_1_7l():
+    D = np.array([[-10.0, 6.0, -8.0]])
+    L = np.array([[-4.0, 3.0, -3.0]])
+    zero = np.zeros_like(D)
+    env = viga_combos.envelope(np.stack([D, L, zero, zero]))
+    np.testing.assert_allclose(env["mn"], [[1.4 * 10 + 1.7 * 4, 0.0,
+                                            1.4 * 8 + 1.7 * 3]])
+    np.testing.assert_allclose(env["mp"], [[0.0, 1.4 * 6 + 1.7 * 3, 0.0]])
+    lab_n, lab_p = viga_combos.governing_labels(env)
+    assert lab_n.tolist() == [["1.4D+1.7L", "-", "1.4D+1.7L"]]
+    assert lab_p.tolist() == [["-", "1.4D+1.7L", "-"]]
+
+
+def test_custom_table_and_validation(moments):
+    table = {"D": (1.0, 0.0, 0.0, 0.0)}
+    env = viga_combos.envelope(moments, table)
+    np.testing.assert_allclose(env["mn"], np.maximum(-moments[0], 0))
+    np.testing.assert_allclose(env["mp"], np.maximum(moments[0], 0))
+    with pytest.raises(ValueError, match="4 factores"):
+        viga_combos.envelope(moments, {"mal": (1.0, 2.0)})
+    with pytest.raises(ValueError, match="Se esperan momentos"):
+        viga_combos.envelope(moments[:3])
+
+
+def test_cli_round_trip(tmp_path, moments):
+    cols = [f"{c}{i}" for c in viga_combos.LOAD_CASES for i in (1, 2, 3)]
+    src = tmp_path / "casos.csv"
+    with open(src, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id"] + cols)
+        for j in range(5):
+            writer.writerow([f"V{j}"] + moments[:, j].ravel().tolist())
+    out, table = tmp_path / "momentos.csv", tmp_path / "tabla.csv"
+    assert viga_combos.main([str(src), str(out),
+                             "--guardar-tabla", str(table)]) == 0
+    assert viga_combos.read_table(table) == viga_combos.COMBINATIONS
+
+    env = viga_combos.envelope(moments[:, :5])
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0][:7] == ["id"] + viga_batch.MOMENT_COLS
+    values = np.array([[float(v) for v in r[1:7]] for r in rows[1:]])
+    np.testing.assert_allclose(values, np.hstack([env["mn"], env["mp"]]),
+                               atol=5e-5)
+
+
+@pytest.mark.parametrize("text, message", [
+    ("", "El CSV está vacío"),
+    ("id,D1,D2\nV1,1,2\n", "Faltan columnas en el CSV"),
+])
+def test_cli_errors(tmp_path, capsys, text, message):
+    src = tmp_path / "casos.csv"
+    src.write_text(text, encoding="utf-8")
+    assert viga_combos.main([str(src), str(tmp_path / "m.csv")]) == 1
+    assert message in capsys.readouterr().err
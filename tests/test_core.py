@@ -0,0 +1,201 @@
+"""``viga_core`` frente al cálculo escalar original de la interfaz."""
+
+import numpy as np
+import pytest
+
+import viga_barras
+import viga_batch
+import viga_core
+
+
+def baseline_correct(mn, mp, sys_t):
+    """``MomentApp.correct_moments`` de la versión original, viga por viga."""
+    mn_k = np.abs(mn) * 100000
+    mp_k = np.abs(mp) * 100000
+    factor = 0.5 if sys_t == 'dual2' else 1/3
+
+    for j in (0, 2):  # extremos
+        mp_k[j] = max(mp_k[j], factor * mn_k[j])
+        mn_k[j] = max(mn_k[j], factor * mp_k[j])
+
+    max_ext = max(mn_k[0], mn_k[2], mp_k[0], mp_k[2])
+    floor = 0.25 * max_ext
+    mn_k[1] = max(mn_k[1], floor)
+    mp_k[1] = max(mp_k[1], floor)
+
+    return mn_k / 100000, mp_k / 100000
+
+
+def baseline_as_req(Mu, fc, b, d, fy, phi):
+    """``DesignWindow._calc_as_req`` de la versión original."""
+    Mu_kgcm = abs(Mu) * 100000
+    term = 1.7 * fc * b * d / (2 * fy)
+    root = (2.89 * (fc * b * d) ** 2) / (fy ** 2) - (
+        6.8 * fc * b * Mu_kgcm
+    ) / (phi * (fy ** 2))
+    root = max(root, 0)
+    return term - 0.5 * np.sqrt(root)
+
+
+def baseline_limits(fc, fy, b, d):
+    """``DesignWindow._calc_as_limits`` de la versión original."""
+    beta1 = 0.85 if fc <= 280 else 0.85 - ((fc - 280) / 70) * 0.05
+    as_min = 0.7 * (np.sqrt(fc) / fy) * b * d
+    pmax = 0.75 * ((0.85 * fc * beta1 / fy) * (6000 / (6000 + fy)))
+    return as_min, pmax * b * d
+
+
+@pytest.fixture
+def moments():
+    rng = np.random.default_rng(0)
+    mn = rng.uniform(-40, 40, (500, 3))
+    mp = rng.uniform(-40, 40, (500, 3))
+    # Casos límite: extremos nulos y centro que gobierna
+    mn[:5] = 0.0
+    mp[5:10, [0, 2]] = 0.0
+    return mn, mp
+
+
+@pytest.mark.parametrize("sys_t", ["dual1", "dual2"])
+def test_correct_moments_matches_baseline(moments, sys_t):
+    mn, mp = moments
+    mn_c, mp_c = viga_core.correct_moments(mn, mp, sys_t)
+    for i in range(len(mn)):
+        ref_n, ref_p = baseline_correct(mn[i].copy(), mp[i].copy(), sys_t)
+        np.testing.assert_allclose(mn_c[i], ref_n, rtol=1e-12, atol=1e-12)
+        np.testing.assert_allclose(mp_c[i], ref_p, rtol=1e-12, atol=1e-12)
+
+
+def test_correct_moments_mixed_systems(moments):
+    mn, mp = moments
+    sys_t = np.where(np.arange(len(mn)) % 2, "dual2", "dual1")
+    mn_c, mp_c = viga_core.correct_moments(mn, mp, sys_t)
+    for i in range(len(mn)):
+        ref_n, ref_p = baseline_correct(mn[i].copy(), mp[i].copy(), sys_t[i])
+        np.testing.assert_allclose(mn_c[i], ref_n, rtol=1e-12)
+        np.testing.assert_allclose(mp_c[i], ref_p, rtol=1e-12)
+
+
+def test_correct_moments_single_beam_does_not_modify_input():
+    mn = np.array([12.0, 5.0, 10.0])
+    mp = np.array([3.0, 8.0, 2.0])
+    mn_c, mp_c = viga_core.correct_moments(mn, mp, "dual2")
+    np.testing.assert_allclose(mn_c, [12.0, 5.0, 10.0])
+    np.testing.assert_allclose(mp_c, [6.0, 8.0, 5.0])
+    np.testing.assert_array_equal(mn, [12.0, 5.0, 10.0])
+    np.testing.assert_array_equal(mp, [3.0, 8.0, 2.0])
+
+
+@pytest.mark.parametrize("fc", [210.0, 280.0, 350.0])
+def test_required_areas_match_baseline(moments, fc):
+    mn, mp = (np.abs(m) for m in moments)
+    b, h, r, fy, phi = 30.0, 60.0, 4.0, 4200.0, 0.9
+    d = viga_core.effective_depth(h, r, 0.95, 1.59)
+    as_n, as_p, as_min, as_max = viga_core.required_areas(
+        mn, mp, b, d, fc, fy, phi)
+    ref_min, ref_max = baseline_limits(fc, fy, b, d)
+    assert as_min == pytest.approx(ref_min, rel=1e-12)
+    assert as_max == pytest.approx(ref_max, rel=1e-12)
+    for got, ms in ((as_n, mn), (as_p, mp)):
+        ref = np.clip([[baseline_as_req(m, fc, b, d, fy, phi) for m in row]
+                       for row in ms], ref_min, ref_max)
+        np.testing.assert_allclose(got, ref, rtol=1e-12)
+
+
+def test_design_beams_per_beam_sections(moments):
+    mn, mp = moments
+    n = len(mn)
+    b = np.full(n, 25.0)
+    b[::2] = 40.0
+    h = np.where(np.arange(n) % 3, 50.0, 70.0)
+    res = viga_core.design_beams(mn, mp, "dual2", b, h, 4.0, 210.0, 4200.0,
+                                 0.9, 0.95, 1.59)
+    for i in (0, 1, 2, n - 1):
+        one = viga_core.design_beams(mn[i:i + 1], mp[i:i + 1], "dual2", b[i],
+                                     h[i], 4.0, 210.0, 4200.0, 0.9, 0.95, 1.59)
+        for key in ("mn_corr", "mp_corr", "as_n", "as_p"):
+            np.testing.assert_allclose(res[key][i], one[key][0], rtol=1e-12)
+
+
+def test_phi_mn_hand_computed():
+    # As = 10 cm², f'c = 210, fy = 4200, b = 30, d = 44:
+    # a = 10·4200 / (0.85·210·30) = 7.843 cm
+    # φMn = 0.9·10·4200·(44 − 7.843/2) / 10⁵ = 15.1496 TN·m
+    cap = viga_core.phi_mn(10.0, 210.0, 4200.0, 30.0, 44.0, 0.9)
+    assert cap == pytest.approx(15.14964705882353, rel=1e-12)
+    # Una columna por posición y sección por viga
+    got = viga_core.phi_mn(np.array([[10.0, 5.94]]), np.array([210.0]),
+                           4200.0, np.array([30.0]), np.array([[44.0, 40.0]]),
+                           0.9)
+    a = 5.94 * 4200 / (0.85 * 210 * 30)
+    np.testing.assert_allclose(
+        got, [[15.14964705882353, 0.9 * 5.94 * 4200 * (40 - a / 2) / 1e5]],
+        rtol=1e-12)
+
+
+def test_capacity_ratios_hand_computed():
+    # 4Ø1/2" + 1Ø5/8" en la posición 1, 4Ø1/2" en la 2 y nada en la 3
+    as1 = np.array([5.16, 5.16, 0.0])
+    as2 = np.array([2.0, 0.0, 0.0])
+    db1, db2 = 1.27, 1.59
+    mu = np.array([11.0, 12.0, 3.0])
+    d, cap, dc = viga_core.capacity_ratios(mu, as1, db1, as2, db2, 30.0,
+                                           50.0, 4.0, 210.0, 4200.0, 0.9,
+                                           0.95)
+    # Centroide de una capa: h − r − φ_estribo − Σ(As·db/2) / ΣAs
+    d0 = 50 - 4 - 0.95 - 0.5 * (5.16 * 1.27 + 2.0 * 1.59) / 7.16
+    d1 = 50 - 4 - 0.95 - 0.5 * 1.27
+    np.testing.assert_allclose(d[:2], [d0, d1], rtol=1e-12)
+    assert np.isnan(d[2])
+    for k, (as_, dk) in enumerate(((7.16, d0), (5.16, d1))):
+        a = as_ * 4200 / (0.85 * 210 * 30)
+        ref = 0.9 * as_ * 4200 * (dk - a / 2) / 1e5
+        assert cap[k] == pytest.approx(ref, rel=1e-12)
+        assert dc[k] == pytest.approx(mu[k] / ref, rel=1e-12)
+    # Sin barras no hay capacidad
+    assert cap[2] == 0 and dc[2] == np.inf
+    # 11 TN·m cabe en 7.16 cm² (D/C < 1); 12 TN·m no cabe en 5.16 cm²
+    assert dc[0] <= 1 < dc[1]
+
+
+def test_ok_flag_follows_dc_and_required_area():
+    rng = np.random.default_rng(8)
+    n = 400
+    chunk = {
+        "mn": rng.uniform(0, 50, (n, 3)), "mp": rng.uniform(0, 30, (n, 3)),
+        "sys_t": np.array(["dual2"] * n), "b": rng.choice([25.0, 30.0], n),
+        "h": rng.choice([40.0, 50.0, 60.0], n), "r": 4.0, "fc": 210.0,
+        "fy": 4200.0, "phi": 0.9, "de": 0.95, "db": 1.59,
+    }
+    res = viga_batch.design_chunk(chunk)
+    index = viga_barras.default_index()
+    ids = res["armado"]
+    area = np.where(ids >= 0, index.area[np.maximum(ids, 0)], 0.0)
+    as_req = np.hstack([res["as_n"], res["as_p"]])
+    mu = np.abs(np.hstack([res["mn_corr"], res["mp_corr"]]))
+    expected = (ids >= 0) & (area >= as_req) & (mu <= res["phi_mn"])
+    np.testing.assert_array_equal(res["ok"], expected)
+    np.testing.assert_allclose(res["dc"][ids >= 0],
+                               (mu / res["phi_mn"])[ids >= 0], rtol=1e-12)
+    assert (~res["ok"]).any() and res["ok"].any()
+
+
+def test_bar_area_uses_table():
+    for key, db in viga_core.DIAM_CM.items():
+        assert viga_core.bar_area(db) == viga_core.BAR_DATA[key]
+    np.testing.assert_allclose(viga_core.bar_area([1.59, 1.0]),
+                               [1.99, np.pi / 4])
+
+
+@pytest.mark.parametrize("key", ['1/2"', '5/8"', '3/4"', '1"'])
+def test_design_beams_counts_bars_with_table_areas(key):
+    rng = np.random.default_rng(13)
+    n = 3000
+    mn, mp = rng.uniform(0, 40, (n, 3)), rng.uniform(0, 25, (n, 3))
+    db = viga_core.DIAM_CM[key]
+    res = viga_core.design_beams(mn, mp, "dual2", 30.0, 60.0, 4.0, 210.0,
+                                 4200.0, 0.9, 0.95, db)
+    as_gov = np.maximum(res["as_n"].max(axis=1), res["as_p"].max(axis=1))
+    n_bars = np.ceil(as_gov / viga_core.BAR_DATA[key])
+    np.testing.assert_allclose(
+        res["base_req"], viga_core.base_required(n_bars, db, 0, 0, 4.0, 0.95))
@@ -0,0 +1,39 @@
+"""Curvas de momento con ``BASIS`` frente a la interpolación original."""
+
+import numpy as np
+import pytest
+
+import viga_core
+
+CubicSpline = pytest.importorskip("scipy.interpolate").CubicSpline
+
+
+def test_basis_matches_cubic_spline():
+    # Interpolación de MomentApp.plot_original: CubicSpline por los tres
+    # puntos de control, negativo con signo y positivo invertido
+    rng = np.random.default_rng(1)
+    mn = rng.uniform(0, 40, (50, 3))
+    mp = rng.uniform(0, 40, (50, 3))
+    curves_n = viga_core.moment_curves(mn)
+    curves_p = viga_core.moment_curves(-mp)
+    for i in range(len(mn)):
+        np.testing.assert_allclose(
+            curves_n[i], CubicSpline(viga_core.X_CTRL, mn[i])(viga_core.STATIONS),
+            rtol=1e-10, atol=1e-10)
+        np.testing.assert_allclose(
+            curves_p[i], CubicSpline(viga_core.X_CTRL, -mp[i])(viga_core.STATIONS),
+            rtol=1e-10, atol=1e-10)
+
+
+def test_basis_at_other_stations():
+    xs = np.linspace(0, 1.0, 37)
+    m = np.array([12.0, -3.5, 7.25])
+    np.testing.assert_allclose(
+        viga_core.moment_curves(m, viga_core.moment_basis(xs)),
+        CubicSpline(viga_core.X_CTRL, m)(xs), rtol=1e-10, atol=1e-10)
+
+
+def test_basis_interpolates_control_points():
+    basis = viga_core.moment_basis(viga_core.X_CTRL)
+    np.testing.assert_allclose(basis, np.eye(3), atol=1e-15)
+    np.testing.assert_allclose(viga_core.BASIS.sum(axis=1), 1.0)
@@ -0,0 +1,106 @@
+"""Importación de fuerzas de ETABS/SAP2000 frente a un recorrido por fila."""
+
+import os
+
+import numpy as np
+import pytest
+
+import viga_etabs
+
+HEADER = "Story,Beam,Unique Name,Output Case,Case Type,Station,P,V2,M3\n"
+UNITS = ",,,,,m,tonf,tonf,tonf-m\n"
+
+
+def write_export(path, rows, delim=","):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("TABLE:  Element Forces - Beams\n")
+        f.write(HEADER.replace(",", delim) + UNITS.replace(",", delim))
+        for story, beam, frame, case, station, m3 in rows:
+            f.write(delim.join([story, beam, frame, case, "Combination",
+                                f"{station:g}", "0", "0", f"{m3:.4f}"])
+                    + "\n")
+    return str(path)
+
+
+def synthetic_rows(rng, n_frames=40):
+    rows = []
+    for k in range(n_frames):
+        stations = np.round(np.linspace(0, rng.uniform(3, 8),
+                                        rng.integers(3, 12)), 3)
+        for case in ("C1", "C2", "C3"):
+            for s in stations:
+                rows.append(("P1", f"B{k}", str(k + 1), case, s,
+                             rng.uniform(-30, 30)))
+    order = rng.permutation(len(rows))
+    return [rows[i] for i in order]
+
+
+def brute_envelope(rows, cases=None):
+    """Extremos I/J y estación más cercana al centro, elemento por elemento."""
+    by_frame = {}
+    for _, _, frame, case, s, m3 in rows:
+        if cases is None or case in cases:
+            by_frame.setdefault(frame, {}).setdefault(round(s, 4), []).append(m3)
+    out = {}
+    for frame, st in by_frame.items():
+        xs = sorted(st)
+        mid = min(xs, key=lambda x: abs((x - xs[0]) / (xs[-1] - xs[0]) - 0.5))
+        at = [xs[0], mid, xs[-1]]
+        out[frame] = ([max(-min(st[x]), 0.0) for x in at],
+                      [max(max(st[x]), 0.0) for x in at])
+    return out
+
+
+@pytest.mark.parametrize("delim", [",", "\t"])
+@pytest.mark.parametrize("cases", [None, ["C1", "C3"]])
+def test_envelope_matches_brute_force(tmp_path, delim, cases):
+    rows = synthetic_rows(np.random.default_rng(2))
+    path = write_export(tmp_path / "fuerzas.csv", rows, delim)
+    ids, mn, mp = viga_etabs.read_envelope(path, cases, chunk_size=97)
+    ref = brute_envelope(rows, cases)
+    assert sorted(ids) == sorted(ref)
+    for frame, n_row, p_row in zip(ids, mn, mp):
+        np.testing.assert_allclose(n_row, ref[frame][0], atol=1e-4)
+        np.testing.assert_allclose(p_row, ref[frame][1], atol=1e-4)
+
+
+def test_progress_is_byte_offset(tmp_path):
+    rows = synthetic_rows(np.random.default_rng(6), 10)
+    path = write_export(tmp_path / "fuerzas.csv", rows)
+    reducer = viga_etabs.EnvelopeReducer()
+    done = list(viga_etabs.iter_envelope(path, reducer, chunk_size=50))
+    assert done == sorted(done)
+    assert done[-1] == os.path.getsize(path)
+
+
+def test_two_station_frames_are_rejected(tmp_path, capsys):
+    rows = [("P1", "B1", "1", "C1", s, 5.0) for s in (0.0, 2.5, 5.0)]
+    rows += [("P1", f"B{k}", str(k), "C1", s, 5.0)
+             for k in (2, 3) for s in (0.0, 5.0)]
+    path = write_export(tmp_path / "fuerzas.csv", rows)
+    with pytest.raises(ValueError, match=r"'2' con 2 estaciones.*1 elementos"):
+        viga_etabs.read_envelope(path)
+    assert viga_etabs.main([path, str(tmp_path / "m.csv")]) == 1
+    assert "al menos 3" in capsys.readouterr().err
+
+
+def test_story_and_label_without_unique_name(tmp_path):
+    text = ("Story;Beam;Output Case;Station;M3\n"
+            "P1;B1;C1;0;-10\nP1;B1;C1;3;4\nP1;B1;C1;6;-8\n"
+            "P2;B1;C1;0;-12\nP2;B1;C1;3;5\nP2;B1;C1;6;-9\n")
+    path = tmp_path / "fuerzas.csv"
+    path.write_text(text, encoding="utf-8")
+    ids, mn, mp = viga_etabs.read_envelope(str(path), factor=2.0)
+    assert ids == ["P1-B1", "P2-B1"]
+    np.testing.assert_allclose(mn, [[20, 0, 16], [24, 0, 18]])
+    np.testing.assert_allclose(mp, [[0, 8, 0], [0, 10, 0]])
+
+
+def test_order_of_first_appearance_for_any_chunk_size(tmp_path):
+    rows = [("P1", "B", frame, "C1", s, 1.0)
+            for frame in ("30", "7", "12", "5") for s in (0.0, 2.0, 4.0)]
+    rows += [("P1", "B", "7", "C2", s, -1.0) for s in (0.0, 2.0, 4.0)]
+    path = write_export(tmp_path / "fuerzas.csv", rows)
+    for size in (3, 5, 100):
+        ids, _, _ = viga_etabs.read_envelope(path, chunk_size=size)
+        assert ids == ["30", "7", "12", "5"], size
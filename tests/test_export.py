@@ -0,0 +1,91 @@
+"""Exportación de figuras ``viga_export``: barras de la sección y archivos."""
+
+import numpy as np
+import pytest
+
+import viga_barras
+import viga_batch
+import viga_core
+
+pytest.importorskip("matplotlib")
+
+import viga_export  # noqa: E402
+
+
+def test_section_bars_use_largest_position_per_face():
+    index = viga_barras.default_index()
+    as_req = np.array([8.0, 3.0, 12.0, 4.0, 9.0, 2.0])
+    ids = index.lookup(as_req, 30.0 - 2 * 4.0 - 2 * 0.95)
+    bottom, top = viga_export.section_bars(ids, 30.0, 4.0, 0.95, index)
+    diam = [viga_core.DIAM_CM[k] for k in index.keys]
+    for face, j in ((bottom, 4), (top, 2)):
+        i = ids[j]
+        d1 = diam[index.c1[i]]
+        d2 = diam[index.c2[i]] if index.c2[i] >= 0 else 0.0
+        k1, k2, _ = viga_core.bar_layers(index.n1[i], d1, index.n2[i], d2,
+                                         30.0, 4.0, 0.95)
+        for got, ref in zip(face, (k1, d1, k2, d2)):
+            np.testing.assert_array_equal(got, ref)
+
+
+def test_section_bars_without_layout():
+    ids = np.array([-1, -1, -1, 5, -1, -1])
+    bottom, top = viga_export.section_bars(ids, 30.0, 4.0, 0.95)
+    assert top is None and bottom is not None
+
+
+def test_cli_writes_one_figure_per_beam(tmp_path, capsys):
+    src = tmp_path / "vigas.csv"
+    src.write_text("id,M1-,M2-,M3-,M1+,M2+,M3+\n"
+                   "V 1,12,5,10,3,8,2\nV/2,20,9,18,6,14,4\n",
+                   encoding="utf-8")
+    out = tmp_path / "figs"
+    assert viga_export.main([str(src), str(out), "--dpi", "40"]) == 0
+    assert "2 figuras" in capsys.readouterr().err
+    files = sorted(p.name for p in out.iterdir())
+    assert files == ["V_1.png", "V_2.png"]
+    assert (out / "V_1.png").read_bytes()[:4] == b"\x89PNG"
+
+    with open(src, newline="", encoding="utf-8") as f:
+        chunk = next(viga_batch.iter_chunks(f))
+    with pytest.raises(ValueError, match="Formato no soportado"):
+        viga_export.export_project(chunk, str(out), "jpg")
+
+
+def test_file_names_are_unique():
+    used = set()
+    assert viga_export.file_names(["V 1", "V_1", "V/1", "v_1", ""],
+                                  used) == ["V_1", "V_1_2", "V_1_3",
+                                            "v_1_4", "viga"]
+    # Los bloques siguientes no reutilizan los nombres anteriores
+    assert viga_export.file_names(["V_1", "V2"], used) == ["V_1_5", "V2"]
+
+
+def test_colliding_ids_across_chunks_keep_every_figure(tmp_path, monkeypatch):
+    src = tmp_path / "vigas.csv"
+    src.write_text("id,M1-,M2-,M3-,M1+,M2+,M3+\n"
+                   "V 1,12,5,10,3,8,2\nV_1,20,9,18,6,14,4\n"
+                   "V_1,8,3,6,2,5,1\n", encoding="utf-8")
+    chunks = []
+    iter_chunks = viga_batch.iter_chunks
+
+    def small_chunks(f, chunk_size=2):
+        for chunk in iter_chunks(f, 2):
+            chunks.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(viga_batch, "iter_chunks", small_chunks)
+    created = []
+    original = viga_export.FigureExporter.__init__
+
+    def counting_init(self, *args, **kwargs):
+        created.append(self)
+        original(self, *args, **kwargs)
+
+    monkeypatch.setattr(viga_export, "_exporter", None)
+    monkeypatch.setattr(viga_export.FigureExporter, "__init__", counting_init)
+    out = tmp_path / "figs"
+    assert viga_export.main([str(src), str(out), "--dpi", "30"]) == 0
+    assert sorted(p.name for p in out.iterdir()) == [
+        "V_1.png", "V_1_2.png", "V_1_3.png"]
+    assert len(chunks) == 2 and len(created) == 1
@@ -0,0 +1,129 @@
+"""Instrumentación ``viga_instr``: costo nulo desactivada y agregación."""
+
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+import viga_instr
+
+
+def load_instr(monkeypatch, value):
+    """Copia aparte del módulo importada con ``VIGA_INSTR=value``."""
+    monkeypatch.setenv("VIGA_INSTR", value)
+    spec = importlib.util.spec_from_file_location(
+        f"viga_instr_{value or 'vacio'}", viga_instr.__file__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class Canvas:
+    def draw(self):
+        return "dibujado"
+
+
+def work(x):
+    return x * 2
+
+
+@pytest.mark.parametrize("value", ["", "0", " 0 "])
+def test_disabled_is_identity(monkeypatch, value):
+    instr = load_instr(monkeypatch, value)
+    assert not instr.ENABLED
+    assert instr.timed()(work) is work
+    assert instr.timed("otro")(work) is work
+    assert instr.span("bloque") is instr.span("otro")
+    with instr.span("bloque"):
+        pass
+    canvas = Canvas()
+    assert instr.wrap(canvas, "draw", "canvas.draw") is canvas
+    assert "draw" not in vars(canvas)
+    assert instr.snapshot() == {}
+
+
+def test_enabled_records_calls(monkeypatch):
+    instr = load_instr(monkeypatch, "1")
+    assert instr.ENABLED
+    timed = instr.timed()(work)
+    assert timed is not work and timed.__wrapped__ is work
+    assert [timed(i) for i in range(5)] == [0, 2, 4, 6, 8]
+    with instr.span("bloque"):
+        pass
+    canvas = instr.wrap(Canvas(), "draw", "canvas.draw")
+    assert canvas.draw() == "dibujado"
+
+    snap = instr.snapshot()
+    assert snap[f"{__name__}.work"]["llamadas"] == 5
+    assert snap["bloque"]["llamadas"] == 1
+    assert snap["canvas.draw"]["llamadas"] == 1
+    events = instr.RECORDER.trace_events()
+    assert len(events) == 7
+    assert {e["pid"] for e in events} == {os.getpid()}
+    assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+
+
+def test_record_buckets_and_percentiles():
+    rec = viga_instr.Recorder()
+    # Cubeta k: [2**(k-1), 2**k) µs
+    for dur_us, bucket in ((0, 0), (0.5, 0), (1, 1), (1.9, 1), (3, 2),
+                           (1000, 10), (1 << 40, viga_instr.N_BUCKETS - 1)):
+        rec.reset()
+        rec.record("x", 0, int(dur_us * 1000))
+        assert rec.hist["x"].index(1) == bucket, dur_us
+
+    rec.reset()
+    for _ in range(90):
+        rec.record("x", 0, 5000)  # 5 µs -> cubeta 3 (hasta 8 µs)
+    for _ in range(10):
+        rec.record("x", 0, 900000)  # 900 µs -> cubeta 10 (hasta 1024 µs)
+    st = rec.snapshot()["x"]
+    assert st["llamadas"] == 100
+    assert st["min_ms"] == 0.005 and st["max_ms"] == 0.9
+    assert st["ultima_ms"] == 0.9
+    assert st["total_ms"] == pytest.approx(90 * 0.005 + 10 * 0.9)
+    assert st["p50_ms"] == 0.008
+    assert st["p99_ms"] == 1.024
+    assert st["histograma_us"] == {"8": 90, "1024": 10}
+
+
+def record_many(n):
+    rec = viga_instr.RECORDER
+    rec.reset()
+    for k in range(n):
+        rec.record("hijo", k, 2000 + k)
+    return os.getpid()
+
+
+def test_drain_and_merge_across_processes():
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        pid, state = pool.submit(viga_instr.collect, record_many, 30).result()
+    assert pid != os.getpid()
+    assert state["stats"]["hijo"][0] == 30
+    assert {e[3] for e in state["events"]} == {pid}
+
+    rec = viga_instr.Recorder(max_events=50)
+    for k in range(40):
+        rec.record("padre", k, 1000)
+    rec.merge(state)
+    rec.merge(state)
+    snap = rec.snapshot()
+    assert snap["hijo"]["llamadas"] == 60
+    assert snap["hijo"]["min_ms"] == 0.002
+    assert snap["hijo"]["max_ms"] == 0.002029
+    assert snap["padre"]["llamadas"] == 40
+    # 40 + 30 + 30 eventos en un límite de 50: se descartan 50
+    assert len(rec.events) == 50
+    assert rec.dropped == 50
+    state = rec.drain()
+    assert state["dropped"] == 50 and len(state["events"]) == 50
+    assert rec.snapshot() == {} and rec.dropped == 0
+
+
+def test_dropped_counts_overflow_of_own_events():
+    rec = viga_instr.Recorder(max_events=3)
+    for k in range(5):
+        rec.record("x", k, 1000)
+    assert rec.dropped == 2
+    assert [e[1] for e in rec.events] == [2, 3, 4]
@@ -0,0 +1,121 @@
+"""Memoria de cálculo ``viga_memoria`` en Markdown, HTML y DOCX."""
+
+import html
+import re
+import zipfile
+
+import numpy as np
+import pytest
+
+import viga_batch
+import viga_core
+import viga_memoria
+
+CSV = ("id,M1-,M2-,M3-,M1+,M2+,M3+,sistema,b,h\n"
+       "V|1,12,5,10,3,8,2,dual2,30,50\n"
+       "V2,20.5,9,18,6,14,4,dual1,25,60\n"
+       "V3,60,25,55,20,40,18,dual2,25,40\n")
+MN = np.array([[12, 5, 10], [20.5, 9, 18], [60, 25, 55]], dtype=float)
+MP = np.array([[3, 8, 2], [6, 14, 4], [20, 40, 18]], dtype=float)
+
+
+@pytest.fixture
+def reference():
+    return viga_core.design_beams(
+        MN, MP, np.array(["dual2", "dual1", "dual2"]),
+        np.array([30.0, 25.0, 25.0]), np.array([50.0, 60.0, 40.0]),
+        4.0, 210.0, 4200.0, 0.9, 0.95, 1.59)
+
+
+@pytest.fixture
+def cuadro(tmp_path):
+    path = tmp_path / "vigas.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return str(path)
+
+
+def expected_texts(ref, i):
+    """Valores de la viga ``i`` tal como deben aparecer en la memoria."""
+    texts = [f"d = h - r - φ_estribo - 0.5 φ_barra = {ref['d'][i]:.2f} cm",
+             f"As_min = {ref['as_min'][i]:.2f} cm²",
+             f"As_max = {ref['as_max'][i]:.2f} cm²"]
+    for k in range(3):
+        texts.append(f"M{k + 1}- = {ref['mn_corr'][i][k]:.2f} TN·m → "
+                     f"As-req = {ref['as_n'][i][k]:.2f} cm²")
+        texts.append(f"M{k + 1}+ = {ref['mp_corr'][i][k]:.2f} TN·m → "
+                     f"As+req = {ref['as_p'][i][k]:.2f} cm²")
+    return texts
+
+
+def test_iter_beams_matches_core(cuadro, reference):
+    with open(cuadro, newline="", encoding="utf-8") as f:
+        beams = list(viga_memoria.iter_beams(viga_batch.iter_chunks(f, 2)))
+    assert [b["id"] for b in beams] == ["V|1", "V2", "V3"]
+    with open(cuadro, newline="", encoding="utf-8") as f:
+        res = viga_batch.design_chunk(next(viga_batch.iter_chunks(f)))
+    for i, beam in enumerate(beams):
+        for text in expected_texts(reference, i):
+            assert text in beam["lines"]
+        moments = np.hstack([reference["mn_corr"][i], reference["mp_corr"][i]])
+        as_req = np.hstack([reference["as_n"][i], reference["as_p"][i]])
+        assert len(beam["rows"]) == 6
+        for row, m, a, cap, ok in zip(beam["rows"], moments, as_req,
+                                      res["phi_mn"][i], res["ok"][i]):
+            assert row[1] == f"{m:.2f}" and row[2] == f"{a:.2f}"
+            assert row[5] == f"{cap:.2f}"
+            assert row[7] == ("OK" if ok else "NO OK")
+        assert beam["ok"] == bool(res["ok"][i].all())
+
+
+def test_memoria_lines():
+    lines = viga_memoria.memoria_lines(30, 50, 4, 44.26, 3.2, 21.16,
+                                       [12, 5, 10], [3, 8, 2],
+                                       [7.7, 3.2, 6.33], [3.7, 5.0, 3.2])
+    assert lines[1] == "b = 30.00 cm, h = 50.00 cm, r = 4.00 cm"
+    assert "M2+ = 8.00 TN·m → As+req = 5.00 cm²" in lines
+    assert len(lines) == 7 + 6
+
+
+def test_markdown(cuadro, tmp_path, reference):
+    out = tmp_path / "memoria.md"
+    assert viga_memoria.main([cuadro, str(out)]) == 0
+    text = out.read_text(encoding="utf-8")
+    assert text.startswith("# Memoria de cálculo\n")
+    for i in range(3):
+        for line in expected_texts(reference, i):
+            assert line + "  \n" in text
+    # Cada fila de tabla tiene las 8 columnas aunque el id traiga "|"
+    assert "## Viga V\\|1 —" in text
+    table = [line for line in text.splitlines() if line.startswith("| M")]
+    assert len(table) == 18
+    for line in table:
+        assert len(re.split(r"(?<!\\)\|", line)) == 10
+
+
+def test_html(cuadro, tmp_path, reference):
+    out = tmp_path / "memoria.html"
+    assert viga_memoria.main([cuadro, str(out)]) == 0
+    text = out.read_text(encoding="utf-8")
+    assert text.count("<table>") == 3 and text.rstrip().endswith("</html>")
+    for i in range(3):
+        for line in expected_texts(reference, i):
+            assert html.escape(line) in text
+
+
+def test_docx(cuadro, tmp_path, reference):
+    out = tmp_path / "memoria.docx"
+    assert viga_memoria.main([cuadro, str(out)]) == 0
+    with zipfile.ZipFile(out) as zf:
+        assert {"[Content_Types].xml", "_rels/.rels",
+                "word/document.xml"} <= set(zf.namelist())
+        xml = zf.read("word/document.xml").decode("utf-8")
+    assert xml.count("<w:tbl>") == 3
+    texts = re.findall(r"<w:t[^>]*>([^<]*)</w:t>", xml)
+    for i in range(3):
+        for line in expected_texts(reference, i):
+            assert line in texts
+
+
+def test_unknown_format(cuadro, tmp_path, capsys):
+    assert viga_memoria.main([cuadro, str(tmp_path / "m.pdf")]) == 1
+    assert "Formato no soportado: pdf" in capsys.readouterr().err
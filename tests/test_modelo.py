@@ -0,0 +1,68 @@
+"""Modelo compacto ``viga_modelo``: datos exactos y armado por códigos."""
+
+import io
+
+import numpy as np
+import pytest
+
+import viga_barras
+import viga_batch
+import viga_core
+import viga_modelo
+
+
+def test_inputs_are_exact_float64():
+    rng = np.random.default_rng(4)
+    beams = viga_modelo.new_beams(100)
+    mn = rng.uniform(0, 50, (100, 3)).round(4)
+    beams["mn"] = mn
+    beams["b"] = 27.3
+    beams["phi"] = 0.9
+    inp = viga_modelo.inputs(beams)
+    np.testing.assert_array_equal(inp["mn"], mn)
+    assert inp["b"][0] == 27.3
+    assert inp["phi"][0] == 0.9
+    assert inp["mn"].dtype == np.float64
+
+
+def test_design_from_model_matches_csv_columns():
+    text = ("id,M1-,M2-,M3-,M1+,M2+,M3+,b,h,phi\n"
+            "V1,12.3456,5.1,10.2,3.3,8.7,2.05,27.3,55.1,0.9\n"
+            "V2,33.3333,14.2,29.9,11.1,22.2,9.99,33.3,66.7,0.85\n")
+    chunk = next(viga_batch.iter_chunks(io.StringIO(text)))
+    mn = np.array([[12.3456, 5.1, 10.2], [33.3333, 14.2, 29.9]])
+    mp = np.array([[3.3, 8.7, 2.05], [11.1, 22.2, 9.99]])
+    ref = viga_core.design_beams(mn, mp, "dual2", np.array([27.3, 33.3]),
+                                 np.array([55.1, 66.7]),
+                                 4.0, 210.0, 4200.0, np.array([0.9, 0.85]),
+                                 0.95, 1.59)
+    res = viga_batch.design_chunk(chunk)
+    for key in ("mn_corr", "mp_corr", "d", "as_n", "as_p"):
+        np.testing.assert_array_equal(res[key], ref[key])
+
+
+def test_layout_codes_round_trip():
+    index = viga_barras.default_index()
+    ids = np.array([[0, 5, 40, -1, len(index.area) - 1, 17]])
+    beams = viga_modelo.new_beams(1)
+    viga_modelo.set_layout_from_index(beams, ids, index)
+    expected = np.where(ids >= 0, index.area[np.maximum(ids, 0)], 0.0)
+    np.testing.assert_allclose(viga_modelo.layout_areas(beams), expected)
+    assert beams["n1"][0, 3] == 0 and beams["c1"][0, 3] == 0
+
+
+def test_bar_codes():
+    codes = viga_modelo.bar_codes(['3/8"', "1.59", "", '3/8"'])
+    assert viga_modelo.BAR_KEYS[codes[0]] == '3/8"'
+    assert viga_modelo.BAR_KEYS[codes[1]] == '5/8"'
+    assert codes[2] == 0 and codes[3] == codes[0]
+    for bad in ('7/8"', "2.0", "x"):
+        with pytest.raises(ValueError, match="Diámetro no disponible"):
+            viga_modelo.bar_code(bad)
+
+
+def test_system_codes():
+    np.testing.assert_array_equal(
+        viga_modelo.system_codes(["dual1", "dual2", "dual2"]), [0, 1, 1])
+    with pytest.raises(ValueError, match="Sistema desconocido: 'dual3'"):
+        viga_modelo.system_codes(["dual2", "dual3"])
@@ -0,0 +1,132 @@
+"""Optimizador de sección ``viga_optimo`` frente a un recorrido exhaustivo."""
+
+import csv
+import itertools
+import math
+
+import numpy as np
+import pytest
+
+import viga_core
+import viga_optimo
+from viga_core import BAR_DATA, DIAM_CM
+
+GRID = {
+    "b": np.arange(20.0, 41.0, 5.0),
+    "h": np.arange(30.0, 71.0, 10.0),
+    "fc": np.array([210.0, 280.0]),
+    "bar": ('1/2"', '5/8"', '3/4"'),
+}
+R, FY, PHI, DE = 4.0, 4200.0, 0.9, DIAM_CM['3/8"']
+
+
+def brute_candidates(mn, mp):
+    """Candidatos factibles evaluados uno por uno con escalares."""
+    out = []
+    for b, h, fc, bar in itertools.product(*GRID.values()):
+        area, db = BAR_DATA[bar], DIAM_CM[bar]
+        d = h - R - DE - db / 2
+        as_min, as_max = (float(v) for v in viga_core.as_limits(fc, FY, b, d))
+        roots, areas = [], []
+        for m in list(mn) + list(mp):
+            mu = abs(m) * 100000
+            root = (2.89 * (fc * b * d) ** 2 / FY ** 2
+                    - 6.8 * fc * b * mu / (PHI * FY ** 2))
+            roots.append(root)
+            areas.append(1.7 * fc * b * d / (2 * FY)
+                         - 0.5 * math.sqrt(max(root, 0)))
+        as_gov = max(areas)
+        n_gov = math.ceil(max(as_gov, as_min) / area)
+        base = 2 * R + 2 * DE + n_gov * db + (n_gov - 1) * viga_core.SPACING_CM
+        if min(roots) < 0 or as_gov > as_max or base > b or d <= 0:
+            continue
+        steel = sum(math.ceil(max(a, as_min) / area) * area for a in areas)
+        steel = steel / 3 * 1e-4 * viga_optimo.STEEL_DENSITY
+        concrete = b * h * 1e-4
+        cost = (concrete * viga_optimo.CONCRETE_PRICE[fc]
+                + steel * viga_optimo.STEEL_PRICE)
+        out.append({"b": b, "h": h, "fc": fc, "bar": bar, "d": d,
+                    "concrete": concrete, "steel": steel, "cost": cost})
+    return out
+
+
+def dominated(c, others):
+    return any(o["concrete"] <= c["concrete"] and o["steel"] <= c["steel"]
+               and (o["concrete"] < c["concrete"] or o["steel"] < c["steel"])
+               for o in others)
+
+
+@pytest.mark.parametrize("mn, mp", [
+    ([12.0, 5.0, 10.0], [3.0, 8.0, 2.0]),
+    ([30.0, 12.0, 25.0], [10.0, 20.0, 8.0]),
+    ([2.0, 1.0, 2.0], [1.0, 1.5, 1.0]),
+])
+@pytest.mark.parametrize("block", [7, viga_optimo.BLOCK_SIZE])
+def test_optimize_matches_exhaustive_search(mn, mp, block):
+    res = viga_optimo.optimize(mn, mp, GRID, R, FY, PHI, DE, block=block)
+    ref = brute_candidates(mn, mp)
+    assert res["candidates"] == 5 * 5 * 2 * 3
+    assert res["feasible"] == len(ref)
+    assert ref, "la malla de prueba debe tener secciones factibles"
+
+    cheapest = min(c["cost"] for c in ref)
+    assert res["best"]["cost"] == pytest.approx(cheapest)
+    match = [c for c in ref if c["cost"] == pytest.approx(cheapest)]
+    assert any(all(res["best"][k] == pytest.approx(c[k]) for k in c
+                   if k != "bar") and res["best"]["bar"] == c["bar"]
+               for c in match)
+
+    front = sorted({(round(c["concrete"], 9), round(c["steel"], 9))
+                    for c in ref if not dominated(c, ref)})
+    got = [(round(c["concrete"], 9), round(c["steel"], 9))
+           for c in res["pareto"]]
+    assert got == front
+
+
+def test_infeasible_grid():
+    res = viga_optimo.optimize([200.0] * 3, [150.0] * 3, GRID)
+    assert res["best"] is None and res["pareto"] == []
+    assert res["feasible"] == 0
+
+
+def test_pareto_front_keeps_non_dominated_points():
+    rng = np.random.default_rng(1)
+    x, y = rng.integers(0, 20, 300), rng.integers(0, 20, 300)
+    idx = viga_optimo.pareto_front(x, y)
+    ref = {(a, b) for a, b in zip(x, y)
+           if not any(c <= a and d <= b and (c < a or d < b)
+                      for c, d in zip(x, y))}
+    assert {(x[i], y[i]) for i in idx} == ref
+    assert list(x[idx]) == sorted(x[idx])
+
+
+@pytest.fixture
+def cuadro(tmp_path):
+    src = tmp_path / "vigas.csv"
+    src.write_text("id,M1-,M2-,M3-,M1+,M2+,M3+\nV1,12,5,10,3,8,2\n",
+                   encoding="utf-8")
+    return str(src)
+
+
+def test_cli_custom_concrete_price(cuadro, tmp_path):
+    out = str(tmp_path / "secciones.csv")
+    assert viga_optimo.main([cuadro, out, "--b", "20", "40", "5",
+                             "--fc", "245", "--precio-concreto",
+                             "245=400"]) == 0
+    with open(out, newline="", encoding="utf-8") as f:
+        row = dict(zip(*csv.reader(f)))
+    assert row["fc"] == "245" and float(row["b"]) <= 40
+
+
+@pytest.mark.parametrize("args, message", [
+    (["--fc", "245"], "sin precio de concreto para f'c = 245"),
+    (["--b", "20", "40", "0"], "debe ser mayor que cero"),
+    (["--h", "30", "90", "-5"], "debe ser mayor que cero"),
+    (["--b", "40", "20", "5"], "MAX debe ser mayor"),
+    (["--precio-concreto", "245"], "FC=PRECIO"),
+])
+def test_cli_rejects_bad_grid(cuadro, tmp_path, capsys, args, message):
+    with pytest.raises(SystemExit) as exc:
+        viga_optimo.main([cuadro, str(tmp_path / "s.csv")] + args)
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
@@ -0,0 +1,78 @@
+"""Diseño en paralelo ``viga_paralelo`` frente a ``design_chunk`` en serie."""
+
+import io
+
+import numpy as np
+import pytest
+
+import viga_batch
+import viga_paralelo
+
+N = 500
+
+
+def project_text(n=N, seed=21):
+    rng = np.random.default_rng(seed)
+    lines = ["id,M1-,M2-,M3-,M1+,M2+,M3+,sistema,b,h,varilla"]
+    for j in range(n):
+        m = rng.uniform(0, 50, 6).round(2)
+        lines.append(",".join([
+            f"V{j}", *map(str, m), rng.choice(["dual1", "dual2"]),
+            str(rng.choice([25, 30, 40])), str(rng.choice([40, 50, 70])),
+            rng.choice(['5/8"', '3/4"']),
+        ]))
+    return "\n".join(lines) + "\n"
+
+
+def read_project(text, chunk_size=N):
+    return list(viga_batch.iter_chunks(io.StringIO(text), chunk_size))
+
+
+def assert_same(res, ref):
+    assert set(res) == set(ref)
+    for key, value in ref.items():
+        np.testing.assert_array_equal(res[key], value, err_msg=key)
+
+
+def test_partition_by_story():
+    story = np.array(["P3", "P1", "P2", "P1", "P3", "P3", "P2", "P1"])
+    parts = viga_paralelo.partition(len(story), story=story)
+    assert [p.tolist() for p in parts] == [[1, 3, 7], [2, 6], [0, 4, 5]]
+    for part in parts:
+        assert len(set(story[part])) == 1
+    blocks = viga_paralelo.partition(10, chunk_size=4)
+    assert [b.tolist() for b in blocks] == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_design_project_by_story_matches_serial(workers):
+    text = project_text()
+    ref = viga_batch.design_chunk(read_project(text)[0])
+    project = read_project(text)[0]
+    story = np.random.default_rng(3).choice(["P1", "P2", "P3", "P4"], N)
+    res = viga_paralelo.design_project(project, workers, story=story)
+    assert_same(res, ref)
+    # Por bloques y con un grupo ya creado
+    with viga_paralelo.new_pool(2) as pool:
+        res = viga_paralelo.design_project(read_project(text)[0],
+                                           chunk_size=64, pool=pool)
+    assert_same(res, ref)
+
+
+def test_iter_designed_keeps_order():
+    text = project_text()
+    serial = [(c, viga_batch.design_chunk(c)) for c in read_project(text, 45)]
+    got = list(viga_paralelo.iter_designed(iter(read_project(text, 45)),
+                                           workers=2, max_pending=3))
+    assert len(got) == len(serial)
+    for (chunk, res), (ref_chunk, ref) in zip(got, serial):
+        assert chunk["id"] == ref_chunk["id"]
+        assert_same(res, ref)
+        np.testing.assert_array_equal(chunk["beams"], ref_chunk["beams"])
+
+
+def test_empty_project():
+    project = read_project(project_text(1))[0]
+    empty = viga_batch.take(project, np.array([], dtype=int))
+    res = viga_paralelo.design_project(empty, 2)
+    assert len(res["d"]) == 0
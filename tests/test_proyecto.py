@@ -0,0 +1,135 @@
+"""Proyecto columnar ``viga_proyecto.ProjectData`` y su apertura en la ventana."""
+
+import io
+import os
+
+import numpy as np
+import pytest
+
+import viga_batch
+import viga_proyecto
+
+N = 300
+
+
+def project_csv(n=N, seed=12):
+    rng = np.random.default_rng(seed)
+    lines = ["id,M1-,M2-,M3-,M1+,M2+,M3+,b,h,estribo,varilla"]
+    for j in range(n):
+        m = rng.uniform(1, 60, 6).round(2)
+        lines.append(",".join([
+            f"V{j:03d}" + ("-A" if j % 7 == 0 else ""), *map(str, m),
+            str(rng.choice([25, 30, 40])), str(rng.choice([40, 50, 70])),
+            rng.choice(['3/8"', "6mm"]), rng.choice(['5/8"', "12mm"]),
+        ]))
+    return "\n".join(lines) + "\n"
+
+
+@pytest.fixture(scope="module")
+def loaded():
+    text = project_csv()
+    data = viga_proyecto.ProjectData(capacity=8)
+    chunks = list(viga_batch.iter_chunks(io.StringIO(text), 37))
+    results = [viga_batch.design_chunk(c) for c in chunks]
+    for chunk, res in zip(chunks, results):
+        data.append(chunk, res)
+    return data, chunks, results
+
+
+def test_growth_keeps_rows_in_order(loaded):
+    data, chunks, results = loaded
+    assert len(data) == N
+    # La capacidad crece al doble desde 8
+    assert len(data._ids) == 512
+    # Después de crecer, cada columna sigue contigua
+    assert data._values.flags.f_contiguous
+    assert data.column(1).flags.c_contiguous
+    ids = [i for c in chunks for i in c["id"]]
+    assert data.ids.tolist() == ids
+    mn = np.vstack([r["mn_corr"] for r in results])
+    as_p = np.vstack([r["as_p"] for r in results])
+    ok = np.concatenate([r["ok"].all(axis=1) for r in results])
+    np.testing.assert_array_equal(data.values[:, 0:3], mn)
+    np.testing.assert_array_equal(data.values[:, 9:12], as_p)
+    np.testing.assert_array_equal(data.ok, ok)
+    dc = np.concatenate([r["dc"].max(axis=1) for r in results])
+    np.testing.assert_array_equal(
+        data.column(len(viga_proyecto.HEADERS) - 2), dc)
+
+
+def test_order_is_stable(loaded):
+    data, _, _ = loaded
+    rows = np.arange(N)
+    j = viga_proyecto.HEADERS.index("M2-")
+    up = data.order(rows, j)
+    key = data.column(j)
+    assert (np.diff(key[up]) >= 0).all()
+    np.testing.assert_array_equal(up, np.argsort(key, kind="stable"))
+    down = data.order(rows, j, descending=True)
+    assert (np.diff(key[down]) <= 0).all()
+    by_id = data.order(rows[::-1], 0)
+    assert data.ids[by_id].tolist() == sorted(data.ids.tolist())
+    # Estado: las NO OK primero, en su orden original
+    status = data.order(rows, len(viga_proyecto.HEADERS) - 1)
+    n_bad = int((~data.ok).sum())
+    assert (~data.ok[status[:n_bad]]).all()
+    assert (np.diff(status[:n_bad]) > 0).all()
+
+
+def test_select_filters(loaded):
+    data, _, _ = loaded
+    np.testing.assert_array_equal(data.select(), np.arange(N))
+    bad = data.select(only_no_ok=True)
+    np.testing.assert_array_equal(bad, np.flatnonzero(~data.ok))
+    tagged = data.select(text="-A")
+    assert data.ids[tagged].tolist() == [f"V{j:03d}-A" for j in range(0, N, 7)]
+    both = data.select(only_no_ok=True, text="-A")
+    np.testing.assert_array_equal(both, np.intersect1d(bad, tagged))
+    assert len(data.select(text="no existe")) == 0
+
+
+def test_beam_returns_inputs(loaded):
+    data, chunks, results = loaded
+    i = 40  # segundo bloque
+    chunk, res, k = chunks[1], results[1], i - 37
+    mn, mp, section = data.beam(i)
+    np.testing.assert_array_equal(mn, res["mn_corr"][k])
+    np.testing.assert_array_equal(mp, res["mp_corr"][k])
+    for key in viga_proyecto.SECTION_KEYS:
+        assert section[key] == np.broadcast_to(chunk[key], (37,))[k]
+    mn[:] = 0  # copia
+    assert data.beam(i)[0].any()
+
+
+def test_load_csv(tmp_path):
+    path = tmp_path / "vigas.csv"
+    path.write_text(project_csv(50), encoding="utf-8")
+    data = viga_proyecto.load_csv(str(path), chunk_size=16)
+    assert len(data) == 50 and data.ids[-1] == "V049-A"
+
+
+def test_design_window_adds_bars_missing_from_combos():
+    pytest.importorskip("PyQt5")
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+
+    import viga_gui
+    import viga_tabla
+
+    app = QApplication.instance() or QApplication([])
+    section = viga_tabla._section_texts(
+        {"b": 30.0, "h": 50.0, "r": 4.0, "fc": 210.0, "fy": 4200.0,
+         "phi": 0.9, "de": 0.6, "db": 1.2})
+    assert (section["estribo"], section["varilla"]) == ("6mm", "12mm")
+    win = viga_gui.DesignWindow(np.array([12.0, 5, 10]),
+                                np.array([3.0, 8, 2]), section=section)
+    try:
+        assert win.cb_estribo.currentText() == "6mm"
+        assert win.cb_varilla.currentText() == "12mm"
+        items = [win.cb_varilla.itemText(i)
+                 for i in range(win.cb_varilla.count())]
+        assert items == ['12mm', '1/2"', '5/8"', '3/4"', '1"']
+        assert win._section_params()[-2:] == (0.6, 1.2)
+    finally:
+        win.close()
+        app.processEvents()
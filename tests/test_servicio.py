@@ -0,0 +1,164 @@
+"""Servicio HTTP ``viga_servicio``: operaciones, lotes y rutas."""
+
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+import viga_barras
+import viga_core
+import viga_servicio
+
+BEAM = {"mn": [12, 5, 10], "mp": [3, 8, 2], "sistema": "dual2",
+        "b": 30, "h": 50, "varilla": '5/8"'}
+
+
+def test_correct_matches_core():
+    items = [dict(BEAM, id="V1"),
+             dict(BEAM, mn=[20, 9, 18], mp=[6, 14, 4], sistema="DUAL1")]
+    rows = viga_servicio.run_items("corregir", items)
+    mn_c, mp_c = viga_core.correct_moments(
+        np.array([[12, 5, 10], [20, 9, 18]], dtype=float),
+        np.array([[3, 8, 2], [6, 14, 4]], dtype=float),
+        np.array(["dual2", "dual1"]))
+    assert rows[0]["id"] == "V1" and "id" not in rows[1]
+    np.testing.assert_allclose([r["mn"] for r in rows], mn_c)
+    np.testing.assert_allclose([r["mp"] for r in rows], mp_c)
+
+
+def test_areas_and_limits_match_core():
+    items = [BEAM, dict(BEAM, corregido=True, estribo="0.8")]
+    rows = viga_servicio.run_items("areas", items)
+    mn = np.array([[12, 5, 10]] * 2, dtype=float)
+    mp = np.array([[3, 8, 2]] * 2, dtype=float)
+    mn_c, mp_c = viga_core.correct_moments(mn[:1], mp[:1], "dual2")
+    mn[0], mp[0] = mn_c[0], mp_c[0]
+    d = viga_core.effective_depth(50.0, 4.0, np.array([0.95, 0.8]), 1.59)
+    as_n, as_p, as_min, as_max = viga_core.required_areas(
+        mn, mp, 30.0, d, 210.0, 4200.0, 0.9)
+    for key, ref in (("mn", mn), ("mp", mp), ("d", d), ("as_n", as_n),
+                     ("as_p", as_p), ("as_min", as_min), ("as_max", as_max)):
+        np.testing.assert_allclose([r[key] for r in rows], ref, err_msg=key)
+
+    limits = viga_servicio.run_items("limites", items)
+    assert [r["d"] for r in limits] == pytest.approx(d.tolist())
+    assert [r["as_min"] for r in limits] == pytest.approx(as_min.tolist())
+
+
+def test_bars_with_and_without_mu():
+    index = viga_barras.default_index()
+    single = viga_servicio.run_items(
+        "barras", [{"as_req": [5.0, 12.0], "b": 30}])[0]
+    bars = viga_barras.select_bars(np.array([5.0, 12.0]), 30.0, 4.0, 0.95,
+                                   index)
+    assert single["armado"] == bars["label"].tolist()
+    assert single["capas"] == [1, 1]
+
+    layered = viga_servicio.run_items(
+        "barras", [{"as_req": [5.0, 40.0], "mu": [8.0, 60.0], "b": 25,
+                    "h": 60}])[0]
+    assert layered["area"][0] >= 5.0 and layered["area"][1] >= 40.0
+    assert layered["capas"][0] == 1 and layered["capas"][1] >= 2
+
+    with pytest.raises(ValueError, match="'mu' debe venir"):
+        viga_servicio.op_bars([{"as_req": [5.0], "mu": [2.0]},
+                               {"as_req": [5.0]}])
+
+
+@pytest.mark.parametrize("item, message", [
+    ({"mn": [1, 2], "mp": [1, 2, 3]}, "'mn' debe tener 3 valores"),
+    ({"mn": [1, 2, 3], "mp": ["a", 2, 3]}, "'mp' debe ser numérico"),
+    (dict(BEAM, sistema="muros"), "muros"),
+    (dict(BEAM, b="ancho"), "'b' debe ser numérico"),
+    (dict(BEAM, varilla='9/8"'), "Diámetro no disponible"),
+])
+def test_invalid_item_reports_error_without_affecting_others(item, message):
+    rows = viga_servicio.run_items("areas", [BEAM, dict(item, id=7), BEAM])
+    assert "error" not in rows[0] and "error" not in rows[2]
+    assert rows[1]["id"] == 7
+    assert message in rows[1]["error"]
+    assert rows[0] == rows[2]
+
+
+def test_ndjson_and_json_batches():
+    lines = [json.dumps(BEAM), "", "{no es json", '"texto"',
+             json.dumps(dict(BEAM, id="V2"))]
+    out = viga_servicio.run_ndjson("corregir", "\n".join(lines).encode())
+    rows = [json.loads(line) for line in out.decode().splitlines()]
+    assert len(rows) == 4
+    assert rows[1] == {"error": "JSON inválido"}
+    assert rows[2] == {"error": "Se esperaba un objeto JSON"}
+    assert rows[3]["id"] == "V2" and rows[3]["mn"] == rows[0]["mn"]
+
+    body = json.dumps([BEAM, 3]).encode()
+    rows = json.loads(viga_servicio.run_json("corregir", body))
+    assert rows[0] == viga_servicio.run_items("corregir", [BEAM])[0]
+    assert "error" in rows[1]
+    with pytest.raises(ValueError, match="arreglo"):
+        viga_servicio.run_json("corregir", b"{}")
+
+
+async def _request(port, method, path, body=b"", ctype="application/json"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: x\r\nConnection: close"
+                 f"\r\nContent-Type: {ctype}\r\nContent-Length: {len(body)}"
+                 "\r\n\r\n".encode() + body)
+    raw = await reader.read()
+    writer.close()
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split()[1])
+    if b"chunked" in head:
+        data, rest = b"", payload
+        while True:
+            size, _, rest = rest.partition(b"\r\n")
+            size = int(size, 16)
+            if not size:
+                break
+            data, rest = data + rest[:size], rest[size + 2:]
+        payload = data
+    return status, payload
+
+
+def test_http_routes():
+    async def scenario():
+        server = viga_servicio.DesignServer(workers=1)
+        srv = await server.start(port=0)
+        port = srv.sockets[0].getsockname()[1]
+        try:
+            results = {
+                "salud": await _request(port, "GET", "/salud"),
+                "404": await _request(port, "POST", "/nada"),
+                "405": await _request(port, "GET", "/corregir"),
+                "post": await _request(port, "POST", "/corregir",
+                                       json.dumps(BEAM).encode()),
+                "bad": await _request(port, "POST", "/corregir", b"[1]"),
+                "invalid": await _request(port, "POST", "/areas",
+                                          json.dumps(dict(BEAM, b="x"))
+                                          .encode()),
+                "lote": await _request(port, "POST", "/lote/corregir",
+                                       json.dumps([BEAM] * 3).encode()),
+                "ndjson": await _request(
+                    port, "POST", "/lote/corregir",
+                    ((json.dumps(BEAM) + "\n") * 5 + "x\n").encode(),
+                    viga_servicio.NDJSON),
+            }
+        finally:
+            srv.close()
+            await srv.wait_closed()
+            server.close()
+        return results
+
+    res = asyncio.run(scenario())
+    assert res["salud"][0] == 200
+    assert json.loads(res["salud"][1])["estado"] == "ok"
+    assert res["404"][0] == 404 and res["405"][0] == 405
+    status, body = res["post"]
+    expected = viga_servicio.run_items("corregir", [BEAM])[0]
+    assert status == 200 and json.loads(body) == expected
+    assert res["bad"][0] == 400
+    assert res["invalid"][0] == 400
+    assert "'b'" in json.loads(res["invalid"][1])["error"]
+    assert json.loads(res["lote"][1]) == [expected] * 3
+    rows = [json.loads(line) for line in res["ndjson"][1].splitlines()]
+    assert rows == [expected] * 5 + [{"error": "JSON inválido"}]
@@ -0,0 +1,178 @@
+"""Cortes a lo largo del tramo ``viga_tramo`` y longitudes de desarrollo."""
+
+import csv
+import io
+import math
+import warnings
+
+import numpy as np
+import pytest
+
+import viga_barras
+import viga_batch
+import viga_core
+import viga_modelo
+import viga_tramo
+
+
+def hand_ld(db, fc, fy, top):
+    """E.060 12.2.2 simplificada, calculada barra por barra."""
+    k = 6.6 if db <= 1.91 else 5.3
+    psi_t = 1.3 if top else 1.0
+    return max(fy * psi_t * db / (k * math.sqrt(fc)), 30.0)
+
+
+@pytest.mark.parametrize("top", [False, True])
+@pytest.mark.parametrize("fc, fy", [(210.0, 4200.0), (280.0, 4200.0),
+                                    (350.0, 2800.0)])
+def test_development_length_matches_hand_formula(fc, fy, top):
+    diams = sorted(viga_core.DIAM_CM.values())
+    ld = viga_tramo.development_length(diams, fc, fy, top)
+    assert ld.tolist() == pytest.approx(
+        [hand_ld(db, fc, fy, top) for db in diams])
+
+
+def test_development_length_limits():
+    # Ø3/4" aún usa 6.6; Ø1" pasa a 5.3; barras chicas quedan en 30 cm
+    assert viga_tramo.development_length(1.91, 210, 4200) == pytest.approx(
+        4200 * 1.91 / (6.6 * math.sqrt(210)))
+    assert viga_tramo.development_length(2.54, 210, 4200) == pytest.approx(
+        4200 * 2.54 / (5.3 * math.sqrt(210)))
+    assert viga_tramo.development_length(0.71, 210, 2800) == 30.0
+
+
+def chunk_from_rows(n, seed=3):
+    rng = np.random.default_rng(seed)
+    lines = ["id,M1-,M2-,M3-,M1+,M2+,M3+,b,h,luz"]
+    for j in range(n):
+        mn = rng.uniform(2, 40, 3).round(2)
+        mp = rng.uniform(1, 25, 3).round(2)
+        b, h = rng.choice([25, 30, 35]), rng.choice([45, 50, 60, 70])
+        luz = "" if j % 4 == 0 else f"{rng.uniform(3, 9):.2f}"
+        lines.append(",".join([f"V{j}", *map(str, mn), *map(str, mp),
+                               str(b), str(h), luz]))
+    return next(viga_batch.iter_chunks(io.StringIO("\n".join(lines) + "\n")))
+
+
+def chunk_beams(chunk, res):
+    """Armado en códigos de ``viga_modelo``, como lo arma ``chunk_span``."""
+    beams = viga_modelo.new_beams(len(res["d"]))
+    viga_modelo.set_layout_from_index(beams, res["armado"],
+                                      viga_barras.default_index())
+    return beams
+
+
+def brute_theoretical(req, rest, ctrl, n_st):
+    """Estaciones extremas donde ``req`` supera el acero restante."""
+    need = req > rest + 1e-9
+    last = next((i for i in range(ctrl, n_st) if not need[i]), n_st - 1)
+    first = next((i for i in range(ctrl, -1, -1) if not need[i]), 0)
+    return first, last
+
+
+def test_theoretical_cuts_match_station_areas():
+    chunk = chunk_from_rows(60)
+    res = viga_batch.design_chunk(chunk)
+    out = viga_tramo.chunk_span(chunk, res)
+    stations = viga_core.STATIONS
+    ctrl = np.abs(stations[:, None] - viga_core.X_CTRL).argmin(axis=0)
+    req = viga_tramo.station_areas(res["mn_corr"], res["mp_corr"], chunk["b"],
+                                   res["d"], chunk["fc"], chunk["fy"],
+                                   chunk["phi"])
+    area, _ = viga_tramo.layout_groups(*(chunk_beams(chunk, res)[k]
+                                         for k in ("n1", "c1", "n2", "c2")))
+    for i in range(len(res["d"])):
+        for p in range(6):
+            face = 0 if p < 3 else 1
+            for g, rest in enumerate((0.0, area[i, p, 0])):
+                if area[i, p, g] == 0:
+                    assert np.isnan(out["teo"][i, p, g]).all()
+                    continue
+                first, last = brute_theoretical(req[i, face], rest,
+                                                ctrl[p % 3], len(stations))
+                np.testing.assert_allclose(
+                    out["teo"][i, p, g],
+                    stations[[first, last]] * out["luz"][i], atol=1e-9)
+
+
+def test_practical_cuts_contain_theoretical_and_ld():
+    chunk = chunk_from_rows(80, seed=9)
+    res = viga_batch.design_chunk(chunk)
+    out = viga_tramo.chunk_span(chunk, res, span=5.0)
+    luz = out["luz"]
+    assert (luz[::4] == 5.0).all()
+    teo, corte, ld = out["teo"], out["corte"], out["ld"]
+    present = ~np.isnan(ld)
+    assert present[:, :, 0].all()
+    L = luz[:, None, None]
+    x_c = np.tile(viga_core.X_CTRL, 2)[None, :, None] * L
+    tol = 1e-9
+    assert (corte[..., 0][present] <= teo[..., 0][present] + tol).all()
+    assert (corte[..., 1][present] >= teo[..., 1][present] - tol).all()
+    # ld desde el punto de control, salvo donde se llega al apoyo
+    left = np.maximum(x_c - ld / 100, 0)
+    right = np.minimum(x_c + ld / 100, L)
+    assert (corte[..., 0][present] <= left[present] + tol).all()
+    assert (corte[..., 1][present] >= right[present] - tol).all()
+    assert (corte[present] >= 0).all()
+    assert (corte[..., 1] <= L + tol)[present].all()
+
+
+def test_curves_carry_full_layout_at_control_points():
+    chunk = chunk_from_rows(40, seed=11)
+    res = viga_batch.design_chunk(chunk)
+    out = viga_tramo.chunk_span(chunk, res, curves=True)
+    stations = viga_core.STATIONS
+    assert out["req"].shape == out["prov"].shape == (40, 2, len(stations))
+    # En cada punto de control están los dos grupos de cada posición
+    area, _ = viga_tramo.layout_groups(*(chunk_beams(chunk, res)[k]
+                                         for k in ("n1", "c1", "n2", "c2")))
+    total = area.sum(axis=-1)
+    ctrl = np.abs(stations[:, None] - viga_core.X_CTRL).argmin(axis=0)
+    for face in (0, 1):
+        prov = out["prov"][:, face, ctrl]
+        assert (prov >= total[:, 3 * face:3 * face + 3] - 1e-9).all()
+    # En los apoyos la demanda es el As de diseño (el centro cae entre
+    # estaciones)
+    ends = ctrl[[0, 2]]
+    np.testing.assert_allclose(out["req"][:, 0, ends], res["as_n"][:, [0, 2]])
+    np.testing.assert_allclose(out["req"][:, 1, ends], res["as_p"][:, [0, 2]])
+
+
+def test_cli_writes_empty_cells_for_missing_groups(tmp_path):
+    src = tmp_path / "vigas.csv"
+    src.write_text("id,M1-,M2-,M3-,M1+,M2+,M3+,luz\n"
+                   "V1,12,5,10,3,8,2,6.5\n"
+                   "V2,0,0,0,0,0,0,\n", encoding="utf-8")
+    out = tmp_path / "cortes.csv"
+    assert viga_tramo.main([str(src), str(out), "--luz", "4"]) == 0
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == viga_tramo.OUT_COLS
+    assert rows[1][:2] == ["V1", "6.50"]
+    assert rows[2][:2] == ["V2", "4.00"]
+    assert len(rows[1]) == len(viga_tramo.OUT_COLS)
+    values = dict(zip(rows[0], rows[1]))
+    assert values["M1-_g1_ld"] != ""
+
+
+
+@pytest.mark.parametrize("luz", ["0", "-3"])
+def test_non_positive_span_is_rejected(tmp_path, capsys, luz):
+    src = tmp_path / "vigas.csv"
+    src.write_text("id,M1-,M2-,M3-,M1+,M2+,M3+,luz\n"
+                   "V1,12,5,10,3,8,2,6\n"
+                   f"V2,12,5,10,3,8,2,{luz}\n", encoding="utf-8")
+    out = str(tmp_path / "cortes.csv")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        assert viga_tramo.main([str(src), out]) == 1
+    assert ("Línea 3, viga 'V2': la luz debe ser mayor que cero"
+            in capsys.readouterr().err)
+
+    chunk = chunk_from_rows(3)
+    res = viga_batch.design_chunk(chunk)
+    with pytest.raises(ValueError, match="Línea 2, viga 'V0'"):
+        viga_tramo.chunk_span(chunk, res, span=0.0)
+    with pytest.raises(SystemExit):
+        viga_tramo.main([str(src), out, "--luz", "0"])
@@ -0,0 +1,150 @@
+"""Trabajos de ``viga_workers`` sin ventana: avance, resultados y cancelación."""
+
+import csv
+
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt5")
+
+import viga_batch  # noqa: E402
+import viga_etabs  # noqa: E402
+import viga_workers  # noqa: E402
+
+HEADER = "id,M1-,M2-,M3-,M1+,M2+,M3+\n"
+
+
+def write_beams(path, n, trailing_newline=True):
+    rng = np.random.default_rng(n)
+    rows = [f"V{j}," + ",".join(map(str, rng.uniform(1, 40, 6).round(2)))
+            for j in range(n)]
+    text = HEADER + "\n".join(rows) + ("\n" if trailing_newline else "")
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("text, rows", [
+    ("", 0),
+    (HEADER, 0),
+    (HEADER.rstrip("\n"), 0),
+    (HEADER + "V1,1,2,3,4,5,6\n", 1),
+    (HEADER + "V1,1,2,3,4,5,6\nV2,1,2,3,4,5,6", 2),
+])
+def test_count_rows(tmp_path, text, rows):
+    path = tmp_path / "vigas.csv"
+    path.write_bytes(text.encode())
+    assert viga_workers.count_rows(str(path)) == rows
+
+
+@pytest.mark.parametrize("trailing", [True, False])
+def test_batch_job_progress_and_output(tmp_path, trailing):
+    src = write_beams(tmp_path / "vigas.csv", 23, trailing)
+    out = str(tmp_path / "res.csv")
+    steps = list(viga_workers.batch_job(src, out, chunk_size=5))
+    assert [done for done, _, _ in steps] == [5, 10, 15, 20, 23]
+    assert all(done <= total == 23 for done, total, _ in steps)
+    ids = [i for _, _, part in steps for i in part["id"]]
+    assert ids == [f"V{j}" for j in range(23)]
+
+    ref = str(tmp_path / "ref.csv")
+    viga_batch.run(src, ref)
+    with open(out, newline="") as a, open(ref, newline="") as b:
+        assert list(csv.reader(a)) == list(csv.reader(b))
+
+
+def test_progress_never_exceeds_total_with_quoted_newlines(tmp_path):
+    # Los saltos dentro de comillas inflan la estimación; el avance se
+    # limita igual a un total coherente
+    path = tmp_path / "vigas.csv"
+    path.write_text(HEADER + '"V\n1",1,2,3,4,5,6\nV2,1,2,3,4,5,6',
+                    encoding="utf-8")
+    steps = list(viga_workers.batch_job(str(path), chunk_size=1))
+    assert all(done <= total for done, total, _ in steps)
+    assert steps[-1][2]["id"] == ["V2"]
+
+
+def test_import_job_matches_read_envelope(tmp_path):
+    lines = ["Frame,Output Case,Station,M3"]
+    for k in range(60):
+        for s in (0, 2.5, 5):
+            lines.append(f"F{k},C1,{s},{(k % 7) - 3 + s}")
+    path = tmp_path / "fuerzas.csv"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    steps = list(viga_workers.import_job(str(path), chunk_size=40))
+    size = path.stat().st_size
+    assert all(done <= total == size for done, total, _ in steps)
+    assert steps[-1][0] == size
+    assert all(part is None for _, _, part in steps[:-1])
+    ids, mn, mp = steps[-1][2]
+    ref_ids, ref_mn, ref_mp = viga_etabs.read_envelope(str(path))
+    assert ids == ref_ids
+    np.testing.assert_array_equal(mn, ref_mn)
+    np.testing.assert_array_equal(mp, ref_mp)
+
+
+def test_export_job(tmp_path):
+    pytest.importorskip("matplotlib")
+    src = tmp_path / "vigas.csv"
+    src.write_text(HEADER + "V 1,12,5,10,3,8,2\nV_1,20,9,18,6,14,4\n"
+                   "V3,8,3,6,2,5,1", encoding="utf-8")
+    folder = tmp_path / "figs"
+    steps = list(viga_workers.export_job(str(src), str(folder), dpi=30,
+                                         chunk_size=2))
+    assert [(done, total) for done, total, _ in steps] == [(2, 3), (3, 3)]
+    paths = [p for _, _, part in steps for p in part]
+    assert sorted(p.name for p in folder.iterdir()) == sorted(
+        p.rsplit("/", 1)[-1] for p in paths)
+    assert len(set(paths)) == 3
+
+
+def run_worker(job, cancel_after=None):
+    """Ejecuta ``Worker.run`` en este hilo y devuelve las señales emitidas."""
+    worker = viga_workers.Worker(job)
+    events = []
+    sig = worker.signals
+
+    def on_progress(done, total):
+        events.append(("progress", done, total))
+        if cancel_after is not None and done >= cancel_after:
+            worker.cancel()
+
+    sig.progress.connect(on_progress)
+    sig.result.connect(lambda part: events.append(("result", part)))
+    sig.finished.connect(lambda: events.append(("finished",)))
+    sig.error.connect(lambda msg: events.append(("error", msg)))
+    sig.cancelled.connect(lambda: events.append(("cancelled",)))
+    worker.run()
+    return worker, events
+
+
+def test_worker_finishes_and_cancels():
+    closed = []
+
+    def job():
+        try:
+            for k in range(1, 6):
+                yield k, 5, k if k % 2 else None
+        finally:
+            closed.append(True)
+
+    _, events = run_worker(job)
+    assert events[-1] == ("finished",)
+    assert [e[1] for e in events if e[0] == "result"] == [1, 3, 5]
+
+    closed.clear()
+    worker, events = run_worker(job, cancel_after=2)
+    assert worker.is_cancelled
+    assert events[-1] == ("cancelled",)
+    assert ("finished",) not in events
+    assert max(e[1] for e in events if e[0] == "progress") == 2
+    assert closed == [True]
+
+
+def test_worker_reports_errors():
+    def job():
+        yield 1, 2, None
+        raise ValueError("Línea 3: dato inválido")
+
+    _, events = run_worker(job)
+    assert events[-1] == ("error", "Línea 3: dato inválido")
+    assert ("finished",) not in events
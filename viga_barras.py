@@ -0,0 +1,334 @@
+"""Selección automática de armado con un índice precalculado de combinaciones.
+
+Se enumeran una sola vez todas las combinaciones válidas de hasta 10 barras
+de cada uno de dos diámetros (los mismos de ``dia_opts`` en la ventana de
+diseño) y se ordenan por área. Para cada ancho libre posible se guarda la
+lista de combinaciones que caben en una capa, de modo que elegir el armado
+más económico con ``As >= As_req`` que además pasa la verificación de base
+es una búsqueda binaria vectorizada, sin prueba y error. ``layered_lookup``
+verifica además cada armado con el peralte al centroide de sus barras y
+resuelve las posiciones que no caben en una capa repartiendo barras de un
+solo diámetro en varias capas.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+import viga_core
+import viga_instr
+from viga_core import BAR_DATA, DIAM_CM, SPACING_CM
+
+# Diámetros disponibles para el armado longitudinal
+BAR_KEYS = ('1/2"', '5/8"', '3/4"', '1"')
+MAX_QTY = 10
+
+# Separación entre niveles de ancho en la clave combinada nivel/área; debe
+# ser mayor que el área de cualquier combinación.
+_STRIDE = 1024.0
+
+# Texto para las posiciones sin combinación que quepa en la sección
+NO_FIT = 'Aumentar sección'
+
+# Iteraciones del ajuste de cantidad de barras al peralte de las capas
+_LAYER_ITER = 4
+
+
+class BarIndex:
+    """Índice de combinaciones de barras ordenado por costo (área de acero).
+
+    Cada combinación es ``n1`` barras ``BAR_KEYS[c1]`` más ``n2`` barras
+    ``BAR_KEYS[c2]`` (``n2 = 0`` y ``c2 = -1`` si es de un solo diámetro).
+    """
+
+    def __init__(self, keys=BAR_KEYS, max_qty=MAX_QTY):
+        self.keys = tuple(keys)
+        area = np.array([BAR_DATA[k] for k in self.keys])
+        diam = np.array([DIAM_CM[k] for k in self.keys])
+
+        combos = []
+        for c1 in range(len(self.keys)):
+            for n1 in range(1, max_qty + 1):
+                combos.append((n1, c1, 0, -1))
+                for c2 in range(c1):
+                    for n2 in range(1, max_qty + 1):
+                        combos.append((n1, c1, n2, c2))
+        n1, c1, n2, c2 = np.array(combos).T
+        total = n1 * area[c1] + n2 * np.where(c2 >= 0, area[c2], 0)
+        width = (n1 * diam[c1] + n2 * np.where(c2 >= 0, diam[c2], 0)
+                 + np.maximum(n1 + n2 - 1, 0) * SPACING_CM)
+
+        # Más barata primero; a igual área, menos barras y un solo diámetro
+        order = np.lexsort((n2 > 0, n1 + n2, total))
+        self.n1, self.c1 = n1[order], c1[order]
+        self.n2, self.c2 = n2[order], c2[order]
+        self.area, self.width = total[order], width[order]
+        # Distancia del centroide al borde de la capa (barras sobre el estribo)
+        offset = 0.5 * (n1 * area[c1] * diam[c1]
+                        + n2 * np.where(c2 >= 0, area[c2] * diam[c2], 0)) / total
+        self.offset = offset[order]
+        self.labels = np.array([
+            self._label(*combo)
+            for combo in zip(self.n1, self.c1, self.n2, self.c2)
+        ])
+
+        # Textos por número de capas (fila final: sin armado)
+        self._layer_labels = np.array([
+            [text if n <= 1 else f"{text} en {n} capas"
+             for n in range(viga_core.MAX_LAYERS + 2)]
+            for text in self.labels
+        ] + [[NO_FIT] * (viga_core.MAX_LAYERS + 2)])
+
+        # Índice de n barras de un solo diámetro: single[c, n] (-1 si n = 0)
+        self.single = np.full((len(self.keys), max_qty + 1), -1)
+        one = self.n2 == 0
+        self.single[self.c1[one], self.n1[one]] = np.flatnonzero(one)
+
+        # Un tramo de la clave combinada por cada nivel de ancho: las
+        # combinaciones que caben en ese ancho, ordenadas por área y
+        # cerradas con un centinela (-1).
+        self.levels = np.unique(self.width)
+        keys, combo_ids = [], []
+        for j, w in enumerate(self.levels):
+            ids = np.flatnonzero(self.width <= w)
+            keys.append(j * _STRIDE + self.area[ids])
+            keys.append([j * _STRIDE + _STRIDE - 1])
+            combo_ids.append(ids)
+            combo_ids.append([-1])
+        self._keys = np.concatenate(keys)
+        self._ids = np.concatenate(combo_ids)
+
+    def _label(self, n1, c1, n2, c2):
+        text = f"{n1}Ø{self.keys[c1]}"
+        if n2:
+            text += f" + {n2}Ø{self.keys[c2]}"
+        return text
+
+    def label_of(self, ids, layers=None):
+        """Texto del armado de cada índice de ``lookup`` (``NO_FIT`` si es -1).
+
+        Con ``layers`` (capas de cada posición) se agrega "en N capas" a los
+        armados de más de una capa.
+        """
+        if layers is None:
+            return np.append(self.labels, NO_FIT)[ids]
+        layers = np.clip(layers, 0, viga_core.MAX_LAYERS + 1)
+        return self._layer_labels[ids, layers]
+
+    def depth(self, ids, b, h, r, de):
+        """Capas y peralte al centroide del armado de cada índice de ``lookup``.
+
+        Las combinaciones que caben en una capa usan el centroide
+        precalculado; las demás se reparten con ``viga_core.bar_layers``.
+        Los argumentos se difunden entre sí. Devuelve ``(capas, d)``; donde
+        ``ids`` es -1 hay 0 capas y ``d`` es NaN.
+        """
+        ids, b, h, r, de = np.broadcast_arrays(
+            np.asarray(ids), *(np.asarray(v, dtype=float) for v in (b, h, r, de)))
+        ok = ids >= 0
+        safe = np.where(ok, ids, 0)
+        avail = b - 2 * r - 2 * de
+        layers = ok.astype(int)
+        d = np.where(ok, h - r - de - self.offset[safe], np.nan)
+        multi = ok & (self.width[safe] > avail + 1e-9)
+        if multi.any():
+            i = safe[multi]
+            c1, c2 = self.c1[i], self.c2[i]
+            area = np.array([BAR_DATA[k] for k in self.keys])
+            diam = np.array([DIAM_CM[k] for k in self.keys])
+            d2 = np.where(c2 >= 0, diam[c2], 0)
+            sec = [v[multi] for v in (b, h, r, de)]
+            k1, k2, layers[multi] = viga_core.bar_layers(
+                self.n1[i], diam[c1], self.n2[i], d2, sec[0], sec[2], sec[3])
+            d[multi] = viga_core.layers_depth(
+                sec[1], sec[2], sec[3], k1, diam[c1], area[c1], k2, d2,
+                area[c2])
+        return layers, d
+
+    def base_width(self, ids, b, r, de):
+        """Ancho de base (cm) que ocupa el armado de cada índice de ``lookup``.
+
+        Es ``viga_core.base_required`` de la capa más llena: la única capa
+        si el armado cabe en una, o la primera del reparto de
+        ``viga_core.bar_layers``. Los argumentos se difunden entre sí; donde
+        ``ids`` es -1 devuelve NaN.
+        """
+        ids, b, r, de = np.broadcast_arrays(
+            np.asarray(ids), *(np.asarray(v, dtype=float) for v in (b, r, de)))
+        ok = ids >= 0
+        safe = np.where(ok, ids, 0)
+        cover = 2 * r + 2 * de
+        width = np.where(ok, self.width[safe] + cover, np.nan)
+        multi = ok & (self.width[safe] > b - cover + 1e-9)
+        if multi.any():
+            i = safe[multi]
+            c1, c2 = self.c1[i], self.c2[i]
+            diam = np.array([DIAM_CM[k] for k in self.keys])
+            d2 = np.where(c2 >= 0, diam[c2], 0)
+            sec = [v[multi] for v in (b, r, de)]
+            k1, k2, _ = viga_core.bar_layers(
+                self.n1[i], diam[c1], self.n2[i], d2, *sec)
+            width[multi] = viga_core.base_required(
+                k1[..., 0], diam[c1], k2[..., 0], d2, sec[1], sec[2])
+        return width
+
+    def lookup(self, as_req, avail):
+        """Índice de la combinación más barata para cada posición.
+
+        ``as_req`` es el área requerida (cm²) y ``avail`` el ancho libre para
+        barras ``b - 2r - 2φ_estribo`` (cm); ambos se difunden entre sí.
+        Devuelve ``-1`` donde ninguna combinación cumple.
+        """
+        pos = self._first(as_req, avail)
+        return np.where(pos >= 0, self._ids[pos], -1)
+
+    def _first(self, as_req, avail):
+        """Posición en la clave combinada del resultado de ``lookup``.
+
+        Las posiciones siguientes recorren, en orden de área, las demás
+        combinaciones que caben en ``avail`` hasta el centinela (-1 en
+        ``_ids``). Devuelve -1 donde ningún ancho alcanza.
+        """
+        as_req, avail = np.broadcast_arrays(
+            np.asarray(as_req, dtype=float), np.asarray(avail, dtype=float)
+        )
+        level = np.searchsorted(self.levels, avail + 1e-9, side='right') - 1
+        key = level * _STRIDE + np.clip(as_req, 0, _STRIDE - 2)
+        pos = np.searchsorted(self._keys, key, side='left')
+        pos = np.minimum(pos, len(self._ids) - 1)
+        return np.where((level >= 0) & (as_req < _STRIDE - 2), pos, -1)
+
+
+@lru_cache(maxsize=None)
+def default_index():
+    """Índice compartido para los diámetros de ``BAR_KEYS``."""
+    return BarIndex()
+
+
+@viga_instr.timed()
+def select_bars(as_req, b, r, de, index=None):
+    """Armado más económico con ``As >= as_req`` que cabe en la base ``b``.
+
+    Los argumentos se difunden (por ejemplo ``as_req`` ``(N, 6)`` con datos
+    de sección ``(N, 1)``). Devuelve un diccionario con ``n1``, ``bar1``,
+    ``n2``, ``bar2`` (claves de ``BAR_DATA`` o ``''``), ``area``,
+    ``base_req`` y ``label``; donde no hay solución ``n1 = 0`` y
+    ``label = NO_FIT``.
+    """
+    index = index or default_index()
+    b = np.asarray(b, dtype=float)
+    avail = b - 2 * np.asarray(r) - 2 * np.asarray(de)
+    ids = index.lookup(as_req, avail)
+    ok = ids >= 0
+    ids = np.where(ok, ids, 0)
+
+    keys = np.array(index.keys + ('',))
+    c1 = np.where(ok, index.c1[ids], -1)
+    c2 = np.where(ok, index.c2[ids], -1)
+    return {
+        'n1': np.where(ok, index.n1[ids], 0),
+        'bar1': keys[c1],
+        'n2': np.where(ok, index.n2[ids], 0),
+        'bar2': keys[c2],
+        'area': np.where(ok, index.area[ids], 0.0),
+        'base_req': np.where(ok, b - avail + index.width[ids], np.nan),
+        'label': index.label_of(np.where(ok, ids, -1)),
+    }
+
+
+def _required_at(mu, fc, b, d, fy, phi):
+    """``As`` requerido para ``mu`` con el peralte ``d``, recortado a sus límites."""
+    as_min, as_max = viga_core.as_limits(fc, fy, b, d)
+    return np.clip(viga_core.as_required(mu, fc, b, d, fy, phi), as_min, as_max)
+
+
+def _single_layers(n, diam, avail, h, r, de):
+    """Capas y peralte de ``n`` barras de un solo diámetro, sin eje de capas.
+
+    Forma cerrada de ``viga_core.bar_layers`` y ``viga_core.layers_depth``
+    para un diámetro: las capas llenas van primero y la última lleva el
+    resto.
+    """
+    per_layer = np.floor((avail + SPACING_CM) / (diam + SPACING_CM))
+    fits = per_layer >= 1
+    per_layer = np.maximum(per_layer, 1.0)
+    layers = np.ceil(n / per_layer)
+    full = layers - 1
+    # Suma del índice de capa de cada barra
+    level = per_layer * full * (full - 1) / 2 + full * (n - full * per_layer)
+    pitch = diam + viga_core.LAYER_SPACING_CM
+    offset = 0.5 * diam + pitch * level / np.maximum(n, 1)
+    layers = np.where(fits, layers, viga_core.MAX_LAYERS + 1)
+    return layers, h - r - de - offset
+
+
+@viga_instr.timed()
+def layered_lookup(as_req, mu, b, h, r, fc, fy, phi, de, index=None):
+    """Armado de cada posición verificado con el peralte de sus barras.
+
+    Recorre en orden de área, desde la que da ``BarIndex.lookup``, las
+    combinaciones que caben en una capa hasta la primera cuyo área también
+    cubre el acero requerido para ``mu`` (TN·m) con el ``d`` al centroide
+    de sus propias barras: la más barata que cumple. Donde nada cabe en
+    una capa prueba cada diámetro del índice repartiendo las barras en
+    capas como ``viga_core.bar_layers``: el peralte se recalcula al
+    centroide de las capas y se agregan barras hasta que alcance; se elige
+    el de menor área que quepa en ``MAX_LAYERS`` capas con a lo más
+    ``MAX_QTY`` barras.
+    Devuelve índices de ``index`` (-1 si ninguno cabe). Los argumentos se
+    difunden entre sí como en ``select_bars``.
+    """
+    index = index or default_index()
+    arrays = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float)
+          for v in (as_req, mu, b, h, r, fc, fy, phi, de)))
+    shape = arrays[0].shape
+    as_req, mu, b, h, r, fc, fy, phi, de = (v.ravel() for v in arrays)
+    area = np.array([BAR_DATA[k] for k in index.keys])
+    diam = np.array([DIAM_CM[k] for k in index.keys])
+    avail = b - 2 * r - 2 * de
+
+    # Cada pasada revisa solo las posiciones cuya combinación no alcanzó
+    # y pasa a la siguiente de su nivel de ancho; el centinela (-1) cierra
+    # el nivel
+    pos = index._first(as_req, avail)
+    ids = np.where(pos >= 0, index._ids[pos], -1)
+    active = np.flatnonzero(ids >= 0)
+    while active.size:
+        i = ids[active]
+        d = h[active] - r[active] - de[active] - index.offset[i]
+        req = _required_at(mu[active], fc[active], b[active], d,
+                           fy[active], phi[active])
+        active = active[index.area[i] < req]
+        pos[active] += 1
+        ids[active] = index._ids[pos[active]]
+        active = active[ids[active] >= 0]
+
+    miss = np.flatnonzero(ids < 0)
+    if not miss.size:
+        return ids.reshape(shape)
+    need, mu, b, h, r, fc, fy, phi, de = (
+        v[miss][:, None] for v in (as_req, mu, b, h, r, fc, fy, phi, de))
+    max_qty = index.single.shape[1] - 1
+
+    # Una columna por diámetro; la cantidad solo crece porque d baja al
+    # agregar capas, así que unas pocas pasadas bastan
+    n = np.ceil(need / area)
+    avail = b - 2 * r - 2 * de
+    for _ in range(_LAYER_ITER):
+        layers, d = _single_layers(n, diam, avail, h, r, de)
+        req = _required_at(mu, fc, b, d, fy, phi)
+        fits = (layers <= viga_core.MAX_LAYERS) & (n <= max_qty)
+        grown = np.where(fits, np.maximum(n, np.ceil(req / area)), n)
+        settled = grown == n
+        if settled.all():
+            break
+        n = grown
+    ok = fits & settled & (n >= 1)
+
+    cost = np.where(ok, n * area, np.inf)
+    best = np.argmin(cost, axis=1)
+    rows = np.arange(len(best))
+    qty = np.where(ok[rows, best], n[rows, best], 0).astype(int)
+    ids[miss] = index.single[best, qty]
+    return ids.reshape(shape)
@@ -0,0 +1,435 @@
+"""Diseño por lotes de vigas desde un CSV, sin abrir la interfaz gráfica.
+
+Lee el cuadro de vigas en bloques de tamaño fijo, aplica la misma lógica
+que ``correct_moments`` y ``_required_areas`` con ``viga_core`` y escribe
+los resultados en otro CSV a medida que avanza, de modo que la memoria no
+depende del número de filas.
+
+Columnas de entrada (las de sección son opcionales y toman los valores por
+defecto de la ventana de diseño)::
+
+    id, M1-, M2-, M3-, M1+, M2+, M3+, sistema, b, h, r, fc, fy, phi,
+    estribo, varilla
+
+``sistema`` es ``dual1`` o ``dual2``; ``estribo`` y ``varilla`` aceptan
+una clave de ``DIAM_CM`` (por ejemplo ``3/8"``) o su diámetro en cm. La
+columna opcional ``luz`` (m) solo la usa ``viga_tramo``.
+"""
+
+import argparse
+import contextlib
+import csv
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+
+import viga_barras
+import viga_core
+import viga_instr
+import viga_modelo
+
+MOMENT_COLS = ["M1-", "M2-", "M3-", "M1+", "M2+", "M3+"]
+
+# Valores por defecto de la ventana de diseño
+DEFAULTS = {
+    "sistema": "dual2",
+    "b": "30",
+    "h": "50",
+    "r": "4",
+    "fc": "210",
+    "fy": "4200",
+    "phi": "0.9",
+    "estribo": '3/8"',
+    "varilla": '5/8"',
+}
+
+OUT_COLS = (
+    ["id", "M1-c", "M2-c", "M3-c", "M1+c", "M2+c", "M3+c",
+     "d", "As_min", "As_max"]
+    + [f"As{i}-" for i in (1, 2, 3)]
+    + [f"As{i}+" for i in (1, 2, 3)]
+    + ["base_req", "base_ok"]
+    + [f"Ar{i}-" for i in (1, 2, 3)]
+    + [f"Ar{i}+" for i in (1, 2, 3)]
+    + ["ok"]
+)
+
+# Columnas opcionales con φMn y demanda/capacidad del armado elegido
+CAPACITY_COLS = (
+    [f"phiMn{i}-" for i in (1, 2, 3)]
+    + [f"phiMn{i}+" for i in (1, 2, 3)]
+    + [f"DC{i}-" for i in (1, 2, 3)]
+    + [f"DC{i}+" for i in (1, 2, 3)]
+)
+
+CHUNK_SIZE = 50000
+
+# Campos de entrada por viga de los bloques que genera ``parse_chunk``
+INPUT_KEYS = ("mn", "mp", "sys_t", "b", "h", "r", "fc", "fy", "phi", "de", "db")
+
+
+@viga_instr.timed()
+def parse_chunk(rows, header, lines=None):
+    """Convierte filas de texto del CSV en arreglos de entrada de ``design_beams``.
+
+    Las vigas se guardan en un arreglo ``viga_modelo.BEAM_DTYPE``
+    (``chunk["beams"]``); las demás claves son sus columnas en ``float64``.
+    ``lines`` son los números de línea de las filas en el archivo (se
+    guardan en ``chunk["linea"]``): si una fila no es válida, el
+    ``ValueError`` indica su línea y su ``id``.
+    """
+    idx = check_header(header)
+    lines = range(2, 2 + len(rows)) if lines is None else lines
+    try:
+        chunk = _parse_rows(rows, idx)
+    except ValueError as exc:
+        error = exc
+    else:
+        chunk["linea"] = np.asarray(lines, dtype=np.int64)
+        return chunk
+    # La conversión por bloques no dice qué fila falló: se buscan una a una
+    for line, row in zip(lines, rows):
+        try:
+            _parse_rows([row], idx)
+        except ValueError as exc:
+            raise ValueError(
+                f"Línea {line}, viga {row[idx['id']]!r}: {exc}") from None
+    raise error
+
+
+def check_header(header):
+    """Índice ``nombre -> columna``; ``ValueError`` si faltan ``id`` o momentos."""
+    idx = {name: i for i, name in enumerate(header)}
+    missing = [c for c in ["id"] + MOMENT_COLS if c not in idx]
+    if missing:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+    return idx
+
+
+def _parse_rows(rows, idx):
+    def column(name):
+        if name in idx:
+            i = idx[name]
+            return [row[i] or DEFAULTS[name] for row in rows]
+        return [DEFAULTS[name]] * len(rows)
+
+    moments = np.array(
+        [[row[idx[c]] for c in MOMENT_COLS] for row in rows], dtype=float
+    ).reshape(-1, 6)
+    beams = viga_modelo.new_beams(len(rows))
+    beams["mn"] = moments[:, :3]
+    beams["mp"] = moments[:, 3:]
+    beams["sys"] = viga_modelo.system_codes(
+        [s.strip().lower() for s in column("sistema")])
+    for key in viga_modelo.SECTION_FIELDS:
+        beams[key] = np.array(column(key), dtype=float)
+    beams["de"] = viga_modelo.bar_codes(column("estribo"))
+    beams["db"] = viga_modelo.bar_codes(column("varilla"))
+    chunk = viga_modelo.inputs(beams)
+    chunk["id"] = [row[idx["id"]] for row in rows]
+    chunk["beams"] = beams
+    # Luz en m (columna opcional ``luz``, ver ``viga_tramo``); NaN si falta
+    chunk["luz"] = np.array(
+        [row[idx["luz"]] or "nan" for row in rows] if "luz" in idx
+        else [np.nan] * len(rows), dtype=float)
+    return chunk
+
+
+def take(chunk, idx):
+    """Subconjunto de ``chunk`` con las vigas de índices ``idx``."""
+    out = {}
+    for key in INPUT_KEYS:
+        value = np.asarray(chunk[key])
+        out[key] = value[idx] if value.ndim else value
+    if "beams" in chunk:
+        out["beams"] = chunk["beams"][idx]
+    for key in ("luz", "linea"):
+        if key in chunk:
+            out[key] = chunk[key][idx]
+    return out
+
+
+def positive_int(text):
+    """Tipo de ``argparse`` para tamaños de bloque y otros enteros positivos."""
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"entero inválido: {text!r}") from None
+    if value <= 0:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que cero: {text}")
+    return value
+
+
+def positive_float(text):
+    """Tipo de ``argparse`` para opciones que deben ser mayores que cero."""
+    try:
+        value = float(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"número inválido: {text!r}") from None
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"debe ser mayor que cero: {text}")
+    return value
+
+
+def read_header(reader):
+    """Primera fila no vacía de un ``csv.reader``, sin espacios en los nombres.
+
+    Un archivo vacío es un ``ValueError``.
+    """
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            return [h.strip() for h in row]
+    raise ValueError("El CSV está vacío")
+
+
+def data_rows(reader, header):
+    """Genera ``(línea, fila)`` de un ``csv.reader`` después de ``header``.
+
+    Omite las filas en blanco, también las de solo separadores que dejan
+    las hojas de cálculo; una fila con menos columnas que ``header`` es un
+    ``ValueError`` con su número de línea.
+    """
+    n_cols = len(header)
+    for row in reader:
+        if not any(cell.strip() for cell in row):
+            continue
+        if len(row) < n_cols:
+            raise ValueError(
+                f"Línea {reader.line_num}: {len(row)} columnas, "
+                f"se esperaban {n_cols}")
+        yield reader.line_num, row
+
+
+def iter_chunks(f, chunk_size=CHUNK_SIZE):
+    """Genera bloques ya convertidos de a lo más ``chunk_size`` vigas."""
+    reader = csv.reader(f)
+    header = read_header(reader)
+    check_header(header)
+    rows = data_rows(reader, header)
+    while True:
+        with viga_instr.span("viga_batch.leer"):
+            block = list(itertools.islice(rows, chunk_size))
+        if not block:
+            return
+        lines, block = zip(*block)
+        yield parse_chunk(block, header, lines)
+
+
+@viga_instr.timed()
+def design_chunk(chunk, finish=True):
+    """Aplica ``viga_core.design_beams`` a un bloque leído con ``iter_chunks``.
+
+    Además del resultado de ``design_beams`` incluye ``armado``: el índice
+    en ``viga_barras.default_index()`` del armado más económico de cada
+    posición, verificado con el peralte de sus barras y repartido en varias
+    capas si no cabe en una (ver ``viga_barras.layered_lookup``; -1 si
+    tampoco cabe). Agrega también las capas y la capacidad de ese armado
+    (ver ``finish_chunk``); con ``finish=False`` eso queda para quien reúne
+    los resultados (otros procesos, la caché).
+    """
+    res = viga_core.design_beams(
+        chunk["mn"], chunk["mp"], chunk["sys_t"], chunk["b"], chunk["h"],
+        chunk["r"], chunk["fc"], chunk["fy"], chunk["phi"], chunk["de"],
+        chunk["db"],
+    )
+    sec = {k: np.reshape(chunk[k], (-1, 1)) for k in viga_modelo.SECTION_FIELDS}
+    de = np.reshape(chunk["de"], (-1, 1))
+    as_req = np.concatenate([res["as_n"], res["as_p"]], axis=-1)
+    res["armado"] = viga_barras.layered_lookup(
+        as_req, np.concatenate([res["mn_corr"], res["mp_corr"]], axis=-1),
+        sec["b"], sec["h"], sec["r"], sec["fc"], sec["fy"], sec["phi"], de,
+    )
+    return finish_chunk(chunk, res) if finish else res
+
+
+@viga_instr.timed()
+def finish_chunk(chunk, res):
+    """Completa ``res`` con las capas y la capacidad del armado elegido.
+
+    Agrega ``capas`` (número de capas de barras), ``d_bars`` (peralte al
+    centroide de las capas), ``phi_mn`` (φMn en TN·m), ``dc``
+    (``|Mu| / φMn``) y ``ok`` (hay armado, cubre el ``As`` requerido y
+    ``dc <= 1`` con ese peralte), todos ``(N, 6)``, calculados en una
+    pasada para todo el bloque. ``base_req`` y ``base_ok`` pasan a ser los
+    del armado elegido: el ancho de su capa más llena en la posición más
+    ancha y si todas las posiciones tienen armado que cabe en ``b``. Si el
+    bloque trae ``beams``, guarda allí el armado. Se aplica una sola vez,
+    también a los resultados leídos de la caché o diseñados en otros
+    procesos.
+    """
+    index = viga_barras.default_index()
+    ids = res["armado"]
+    if "beams" in chunk:
+        viga_modelo.set_layout_from_index(chunk["beams"], ids, index)
+    ok = ids >= 0
+    safe = np.where(ok, ids, 0)
+    area = np.array([viga_core.BAR_DATA[k] for k in index.keys])
+    diam = np.array([viga_core.DIAM_CM[k] for k in index.keys])
+    c1, c2 = index.c1[safe], index.c2[safe]
+    as1 = np.where(ok, index.n1[safe] * area[c1], 0.0)
+    as2 = np.where(ok & (c2 >= 0), index.n2[safe] * area[c2], 0.0)
+    sec = [np.reshape(chunk[k], (-1, 1)) for k in ("b", "h", "r", "de")]
+    res["capas"], d = index.depth(ids, *sec)
+    width = index.base_width(ids, sec[0], sec[2], sec[3])
+    res["base_req"] = np.where(ok, width, 0.0).max(axis=-1)
+    res["base_ok"] = ok.all(axis=-1) & (
+        res["base_req"] <= np.asarray(chunk["b"], dtype=float) + 1e-9)
+    mu = np.concatenate([res["mn_corr"], res["mp_corr"]], axis=-1)
+    res["d_bars"], res["phi_mn"], res["dc"] = viga_core.capacity_ratios(
+        mu, as1, diam[c1], as2, diam[c2], chunk["b"], chunk["h"], chunk["r"],
+        chunk["fc"], chunk["fy"], chunk["phi"], chunk["de"], d=d,
+    )
+    as_req = np.concatenate([res["as_n"], res["as_p"]], axis=-1)
+    res["ok"] = ok & (index.area[safe] >= as_req) & (res["dc"] <= 1)
+    return res
+
+
+@viga_instr.timed()
+def write_chunk(writer, ids, res, capacity=False):
+    """Escribe un bloque de resultados en el ``csv.writer`` de salida.
+
+    Con ``capacity`` agrega las columnas de ``CAPACITY_COLS``.
+    """
+    values = np.column_stack([
+        res["mn_corr"], res["mp_corr"], res["d"], res["as_min"],
+        res["as_max"], res["as_n"], res["as_p"], res["base_req"],
+    ])
+    status = np.where(res["base_ok"], "OK", "NO OK").tolist()
+    bars = viga_barras.default_index().label_of(
+        res["armado"], res["capas"]).tolist()
+    # Estado de la viga: las seis posiciones con armado que cumple
+    beam_ok = np.where(res["ok"].all(axis=-1), "OK", "NO OK").tolist()
+    rows = (
+        [i] + [f"{v:.4f}" for v in row] + [ok] + ar + [total]
+        for i, row, ok, ar, total in zip(
+            ids, values.tolist(), status, bars, beam_ok)
+    )
+    if capacity:
+        extra = np.hstack([res["phi_mn"], res["dc"]]).tolist()
+        rows = (row + [f"{v:.4f}" for v in cap]
+                for row, cap in zip(rows, extra))
+    writer.writerows(rows)
+
+
+def run(in_path, out_path, chunk_size=CHUNK_SIZE, workers=1, cache=None,
+        capacity=False):
+    """Diseña todo el cuadro de ``in_path`` y devuelve ``(filas, segundos)``.
+
+    Con ``workers > 1`` los bloques se diseñan en un grupo de procesos y se
+    escriben en el mismo orden del archivo de entrada. Con una
+    ``viga_cache.DesignCache`` solo se recalculan las vigas cuyos datos no
+    están en la caché. Con ``capacity`` la salida incluye φMn y la relación
+    demanda/capacidad de cada posición.
+    """
+    t0 = time.perf_counter()
+    n_rows = 0
+    with open(in_path, newline="", encoding="utf-8") as fin, \
+            open(out_path, "w", newline="", encoding="utf-8") as fout:
+        writer = csv.writer(fout)
+        writer.writerow(OUT_COLS + (CAPACITY_COLS if capacity else []))
+        chunks = iter_chunks(fin, chunk_size)
+        with contextlib.ExitStack() as stack:
+            if cache is not None:
+                import viga_cache
+                # Un solo grupo de procesos para las vigas nuevas de todos
+                # los bloques
+                pool = None
+                if workers > 1:
+                    import viga_paralelo
+                    pool = stack.enter_context(viga_paralelo.new_pool(workers))
+                designed = (
+                    (chunk, viga_cache.design_chunk_cached(
+                        chunk, cache, workers, pool))
+                    for chunk in chunks
+                )
+            elif workers > 1:
+                import viga_paralelo
+                designed = viga_paralelo.iter_designed(chunks, workers)
+            else:
+                designed = ((chunk, design_chunk(chunk)) for chunk in chunks)
+            for chunk, res in designed:
+                write_chunk(writer, chunk["id"], res, capacity)
+                n_rows += len(chunk["id"])
+    return n_rows, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py lote",
+        description="Diseño por lotes de vigas (NTP E.060) desde un CSV.",
+    )
+    parser.add_argument("entrada", help="CSV con el cuadro de vigas")
+    parser.add_argument("salida", help="CSV de resultados")
+    parser.add_argument(
+        "--bloque", type=positive_int, default=CHUNK_SIZE,
+        help=f"vigas por bloque (por defecto {CHUNK_SIZE})",
+    )
+    parser.add_argument(
+        "--procesos", type=int, default=1,
+        help="procesos en paralelo; 0 usa todos los núcleos (por defecto 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        help="base SQLite de resultados; solo se recalculan las vigas nuevas",
+    )
+    parser.add_argument(
+        "--cache-max", type=int, default=1000000,
+        help="máximo de vigas en la caché (por defecto 1000000)",
+    )
+    parser.add_argument(
+        "--capacidad", action="store_true",
+        help="agrega φMn y demanda/capacidad (DC) del armado de cada posición",
+    )
+    parser.add_argument(
+        "--instr",
+        help="guarda en este JSON llamadas e histogramas de tiempo por etapa",
+    )
+    parser.add_argument(
+        "--traza",
+        help="guarda los tiempos como traza de Chrome (chrome://tracing)",
+    )
+    args = parser.parse_args(argv)
+    if (args.instr or args.traza) and not viga_instr.ENABLED:
+        print("Error: --instr y --traza requieren VIGA_INSTR=1 "
+              "(viga2.0.py lote la activa sola)", file=sys.stderr)
+        return 1
+    workers = args.procesos or os.cpu_count() or 1
+
+    cache = None
+    try:
+        if args.cache:
+            import viga_cache
+            cache = viga_cache.DesignCache(args.cache, args.cache_max)
+        n_rows, secs = run(args.entrada, args.salida, args.bloque, workers,
+                           cache, args.capacidad)
+        if args.instr:
+            viga_instr.dump_json(args.instr)
+        if args.traza:
+            viga_instr.dump_trace(args.traza)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    finally:
+        if cache is not None:
+            stats = cache.stats()
+            cache.close()
+    rate = n_rows / secs if secs > 0 else float("inf")
+    print(
+        f"{n_rows} vigas en {secs:.2f} s ({rate:,.0f} filas/s)",
+        file=sys.stderr,
+    )
+    if cache is not None:
+        print(
+            f"caché: {stats['aciertos']} aciertos, {stats['fallos']} fallos "
+            f"({stats['tasa_aciertos']:.1%}), {stats['desalojos']} desalojos, "
+            f"{stats['entradas']} entradas",
+            file=sys.stderr,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+"""Caché persistente de resultados de diseño direccionada por contenido.
+
+Cada viga se identifica por un hash de sus datos de entrada (seis momentos,
+sistema dual1/dual2, b, h, r, f'c, fy, φ y diámetros de estribo y varilla).
+Al rediseñar un modelo en el que solo cambiaron algunas vigas, las demás se
+leen de la caché y solo se recalculan las que tienen una clave nueva.
+
+La caché es una base SQLite en modo WAL: varios procesos pueden leerla a la
+vez y las escrituras se serializan. El tamaño se limita a ``max_entries``
+vigas descartando las de uso más antiguo (LRU). Las lecturas no escriben:
+la hora de uso de las vigas leídas se guarda en memoria y se escribe en un
+solo lote al guardar, antes de desalojar o al cerrar.
+"""
+
+import hashlib
+import sqlite3
+import time
+
+import numpy as np
+
+import viga_batch
+
+# Cambiar al modificar fórmulas o el formato guardado invalida la caché
+CACHE_VERSION = b"viga-cache-4"
+
+# Campos guardados por viga y número de valores de cada uno
+FIELDS = (
+    ("mn_corr", 3), ("mp_corr", 3), ("d", 1), ("as_min", 1), ("as_max", 1),
+    ("as_n", 3), ("as_p", 3), ("base_req", 1), ("base_ok", 1), ("armado", 6),
+)
+N_VALUES = sum(n for _, n in FIELDS)
+
+# Máximo de parámetros por consulta ``IN (...)`` de SQLite
+_BATCH = 500
+# Horas de uso pendientes que fuerzan su escritura aunque no se guarde nada
+_TOUCH_FLUSH = 200000
+
+
+def input_keys(chunk):
+    """Clave de 16 bytes por viga a partir de sus datos de entrada."""
+    n = len(chunk["mn"])
+    cols = [np.reshape(chunk["mn"], (n, 3)), np.reshape(chunk["mp"], (n, 3)),
+            (np.asarray(chunk["sys_t"]) == "dual2").reshape(-1, 1)]
+    cols += [np.reshape(chunk[k], (-1, 1)) for k in viga_batch.INPUT_KEYS[3:]]
+    data = np.ascontiguousarray(
+        np.hstack([np.broadcast_to(c, (n, c.shape[1])) for c in cols]),
+        dtype=np.float64,
+    )
+    return [
+        hashlib.blake2b(row.tobytes(), digest_size=16, key=CACHE_VERSION).digest()
+        for row in data
+    ]
+
+
+def pack(res):
+    """Resultados de ``design_chunk`` como matriz ``(N, N_VALUES)``."""
+    n = len(res["mn_corr"])
+    return np.hstack([
+        np.reshape(np.asarray(res[name], dtype=np.float64), (n, size))
+        for name, size in FIELDS
+    ])
+
+
+def unpack(values):
+    """Inverso de ``pack``."""
+    res, col = {}, 0
+    for name, size in FIELDS:
+        block = values[:, col:col + size]
+        res[name] = block if size > 1 else block[:, 0]
+        col += size
+    res["base_ok"] = res["base_ok"].astype(bool)
+    res["armado"] = res["armado"].astype(np.int64)
+    return res
+
+
+class DesignCache:
+    """Caché en disco de resultados por viga con desalojo LRU.
+
+    ``hits``, ``misses`` y ``evictions`` acumulan las estadísticas de esta
+    instancia; ``stats()`` las devuelve junto con el número de entradas.
+    El número de filas se cuenta al abrir y se lleva al guardar; solo se
+    vuelve a contar (incluidas las de otros procesos) cuando la cuenta pasa
+    de ``max_entries``.
+    """
+
+    def __init__(self, path, max_entries=1000000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = self.misses = self.evictions = 0
+        self._db = sqlite3.connect(path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS diseno ("
+            "clave BLOB PRIMARY KEY, valor BLOB NOT NULL, uso INTEGER NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS diseno_uso ON diseno (uso)")
+        self._count = len(self)
+        # Pares (uso, clave) de las lecturas aún no escritos en la base
+        self._touched = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._db:
+            self._flush_touched()
+        self._db.close()
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM diseno").fetchone()[0]
+
+    def get_many(self, keys):
+        """Diccionario ``clave -> valores`` de las claves presentes."""
+        found = {}
+        now = time.time_ns()
+        keys = list(keys)
+        for i in range(0, len(keys), _BATCH):
+            part = keys[i:i + _BATCH]
+            marks = ",".join("?" * len(part))
+            rows = self._db.execute(
+                f"SELECT clave, valor FROM diseno WHERE clave IN ({marks})",
+                part,
+            ).fetchall()
+            for key, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float64)
+        self._touched.extend((now, key) for key in found)
+        if len(self._touched) >= _TOUCH_FLUSH:
+            with self._db:
+                self._flush_touched()
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return found
+
+    def _flush_touched(self):
+        """Escribe las horas de uso pendientes (dentro de una transacción)."""
+        if self._touched:
+            self._db.executemany(
+                "UPDATE diseno SET uso = ? WHERE clave = ?", self._touched)
+            self._touched = []
+
+    def put_many(self, keys, values):
+        """Guarda las filas ``values`` ``(N, N_VALUES)`` y aplica el límite."""
+        now = time.time_ns()
+        rows = [(k, np.ascontiguousarray(v, dtype=np.float64).tobytes(), now)
+                for k, v in zip(keys, values)]
+        with self._db:
+            self._flush_touched()
+            self._db.executemany(
+                "INSERT OR REPLACE INTO diseno (clave, valor, uso) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._count += len(rows)
+            if self._count <= self.max_entries:
+                return
+            # La cuenta puede incluir claves reemplazadas o no ver las de
+            # otros procesos: se cuenta de nuevo antes de desalojar
+            self._count = len(self)
+            excess = self._count - self.max_entries
+            if excess > 0:
+                self._db.execute(
+                    "DELETE FROM diseno WHERE clave IN ("
+                    "SELECT clave FROM diseno ORDER BY uso LIMIT ?)",
+                    (excess,),
+                )
+                self.evictions += excess
+                self._count = self.max_entries
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "aciertos": self.hits,
+            "fallos": self.misses,
+            "tasa_aciertos": self.hits / total if total else 0.0,
+            "desalojos": self.evictions,
+            "entradas": len(self),
+        }
+
+
+def design_chunk_cached(chunk, cache, workers=1, pool=None):
+    """Como ``viga_batch.design_chunk`` pero recalculando solo las vigas nuevas.
+
+    Con ``workers > 1`` las vigas que faltan en la caché se diseñan en un
+    grupo de procesos: ``pool`` (de ``viga_paralelo.new_pool``) si se da, de
+    modo que un lote use el mismo grupo para todos sus bloques.
+    """
+    keys = input_keys(chunk)
+    found = cache.get_many(keys)
+    values = np.empty((len(keys), N_VALUES))
+    hit = [i for i, key in enumerate(keys) if key in found]
+    miss = [i for i, key in enumerate(keys) if key not in found]
+    if hit:
+        values[hit] = np.stack([found[keys[i]] for i in hit])
+
+    if miss:
+        sub = viga_batch.take(chunk, np.array(miss))
+        if workers > 1:
+            import viga_paralelo
+            res = viga_paralelo.design_project(
+                sub, workers, pool=pool, finish=False)
+        else:
+            res = viga_batch.design_chunk(sub, finish=False)
+        values[miss] = pack(res)
+        cache.put_many([keys[i] for i in miss], values[miss])
+    # La capacidad del armado se deriva de lo guardado; no ocupa la caché
+    return viga_batch.finish_chunk(chunk, unpack(values))
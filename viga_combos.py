@@ -0,0 +1,206 @@
+"""Combinaciones de carga NTP E.060 y envolventes de momentos vectorizadas.
+
+Los momentos por caso de carga se pasan como un arreglo
+``(casos, vigas, 3)`` con signo (negativo = tracción en la fibra superior)
+en el extremo I, el centro y el extremo II, con los casos en el orden de
+``LOAD_CASES``. Todas las combinaciones se aplican en un solo producto
+tensorial con la matriz de factores, y la envolvente negativa/positiva
+resultante es la entrada de ``viga_core.correct_moments``.
+
+La tabla de combinaciones es un diccionario ``nombre -> factores`` que se
+puede modificar en código o leer de un CSV con ``read_table``.
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+import viga_batch
+
+# Casos de carga: muerta, viva y sismo en X e Y
+LOAD_CASES = ("D", "L", "SX", "SY")
+
+# Combinaciones de diseño de la NTP E.060 (9.2.1 y 9.2.3); factores en el
+# orden de LOAD_CASES
+COMBINATIONS = {
+    "1.4D+1.7L": (1.4, 1.7, 0.0, 0.0),
+    "1.25(D+L)+SX": (1.25, 1.25, 1.0, 0.0),
+    "1.25(D+L)-SX": (1.25, 1.25, -1.0, 0.0),
+    "1.25(D+L)+SY": (1.25, 1.25, 0.0, 1.0),
+    "1.25(D+L)-SY": (1.25, 1.25, 0.0, -1.0),
+    "0.9D+SX": (0.9, 0.0, 1.0, 0.0),
+    "0.9D-SX": (0.9, 0.0, -1.0, 0.0),
+    "0.9D+SY": (0.9, 0.0, 0.0, 1.0),
+    "0.9D-SY": (0.9, 0.0, 0.0, -1.0),
+}
+
+# Vigas por bloque al calcular envolventes muy grandes
+BLOCK_SIZE = 100000
+
+
+def combination_matrix(table=None):
+    """Nombres y matriz de factores ``(combinaciones, casos)`` de ``table``."""
+    table = COMBINATIONS if table is None else table
+    names = list(table)
+    factors = np.array([table[name] for name in names], dtype=float)
+    if factors.ndim != 2 or factors.shape[1] != len(LOAD_CASES):
+        raise ValueError(
+            f"Cada combinación debe tener {len(LOAD_CASES)} factores "
+            f"({', '.join(LOAD_CASES)})"
+        )
+    return names, factors
+
+
+def read_table(path):
+    """Lee una tabla de combinaciones con columnas ``nombre, D, L, SX, SY``."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        missing = [c for c in ("nombre",) + LOAD_CASES
+                   if c not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Faltan columnas en la tabla: {', '.join(missing)}")
+        return {
+            row["nombre"]: tuple(float(row[c] or 0) for c in LOAD_CASES)
+            for row in reader
+        }
+
+
+def write_table(path, table=None):
+    """Guarda ``table`` (por defecto ``COMBINATIONS``) para editarla."""
+    table = COMBINATIONS if table is None else table
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(("nombre",) + LOAD_CASES)
+        writer.writerows([name, *factors] for name, factors in table.items())
+
+
+def combine(moments, table=None):
+    """Momentos de todas las combinaciones ``(combinaciones, vigas, 3)``."""
+    _, factors = combination_matrix(table)
+    moments = np.asarray(moments, dtype=float)
+    return np.tensordot(factors, moments, axes=(1, 0))
+
+
+def envelope(moments, table=None, block=BLOCK_SIZE):
+    """Envolventes de diseño y combinación que gobierna cada valor.
+
+    Devuelve un diccionario con ``mn`` y ``mp`` ``(vigas, 3)`` (magnitudes
+    del máximo negativo y del máximo positivo), ``gov_n`` y ``gov_p`` con el
+    índice de la combinación que gobierna (-1 si ninguna produce momento de
+    ese signo) y ``names`` con los nombres de las combinaciones. Las vigas
+    se procesan en bloques de ``block`` para acotar la memoria.
+    """
+    names, factors = combination_matrix(table)
+    moments = np.asarray(moments, dtype=float)
+    if moments.ndim == 2:
+        moments = moments[:, None, :]
+    if moments.shape[0] != len(LOAD_CASES) or moments.shape[-1] != 3:
+        raise ValueError(
+            f"Se esperan momentos ({len(LOAD_CASES)}, vigas, 3); "
+            f"se recibió {moments.shape}"
+        )
+
+    n = moments.shape[1]
+    mn, mp = np.empty((n, 3)), np.empty((n, 3))
+    gov_n = np.empty((n, 3), dtype=np.int64)
+    gov_p = np.empty((n, 3), dtype=np.int64)
+    for start in range(0, n, block):
+        sl = slice(start, start + block)
+        comb = np.tensordot(factors, moments[:, sl], axes=(1, 0))
+        gov_n[sl] = comb.argmin(axis=0)
+        gov_p[sl] = comb.argmax(axis=0)
+        mn[sl] = -np.take_along_axis(comb, gov_n[sl][None], axis=0)[0]
+        mp[sl] = np.take_along_axis(comb, gov_p[sl][None], axis=0)[0]
+
+    gov_n[mn <= 0] = -1
+    gov_p[mp <= 0] = -1
+    return {
+        "mn": np.maximum(mn, 0.0),
+        "mp": np.maximum(mp, 0.0),
+        "gov_n": gov_n,
+        "gov_p": gov_p,
+        "names": names,
+    }
+
+
+def governing_labels(env):
+    """Nombres de la combinación que gobierna cada valor (``'-'`` si ninguna)."""
+    labels = np.array(env["names"] + ["-"])
+    return labels[env["gov_n"]], labels[env["gov_p"]]
+
+
+def read_cases(path):
+    """Lee un CSV con ``id`` y columnas ``D1, D2, D3, L1, ... SY3``."""
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = viga_batch.read_header(reader)
+        rows = [row for _, row in viga_batch.data_rows(reader, header)]
+    idx = {name: i for i, name in enumerate(header)}
+    cols = [f"{case}{i}" for case in LOAD_CASES for i in (1, 2, 3)]
+    missing = [c for c in ["id"] + cols if c not in idx]
+    if missing:
+        raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+    values = np.array(
+        [[row[idx[c]] or 0 for c in cols] for row in rows], dtype=float
+    ).reshape(-1, len(LOAD_CASES), 3)
+    return [row[idx["id"]] for row in rows], values.transpose(1, 0, 2)
+
+
+def write_envelope(path, ids, env):
+    """CSV de momentos para ``lote`` con la combinación que gobierna."""
+    lab_n, lab_p = governing_labels(env)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            ["id"] + viga_batch.MOMENT_COLS
+            + [f"Comb{c}" for c in viga_batch.MOMENT_COLS]
+        )
+        values = np.hstack([env["mn"], env["mp"]]).tolist()
+        labels = np.hstack([lab_n, lab_p]).tolist()
+        writer.writerows(
+            [i] + [f"{v:.4f}" for v in row] + lab
+            for i, row, lab in zip(ids, values, labels)
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py combos",
+        description="Envolvente de momentos con las combinaciones NTP E.060.",
+    )
+    parser.add_argument("entrada", help="CSV de momentos por caso de carga")
+    parser.add_argument("salida", help="CSV de momentos para 'lote'")
+    parser.add_argument(
+        "--tabla", help="CSV de combinaciones (nombre, D, L, SX, SY)",
+    )
+    parser.add_argument(
+        "--guardar-tabla", metavar="RUTA",
+        help="escribe la tabla de combinaciones usada para editarla",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        table = read_table(args.tabla) if args.tabla else COMBINATIONS
+        if args.guardar_tabla:
+            write_table(args.guardar_tabla, table)
+        ids, moments = read_cases(args.entrada)
+        t0 = time.perf_counter()
+        env = envelope(moments, table)
+        secs = time.perf_counter() - t0
+        write_envelope(args.salida, ids, env)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(
+        f"{len(ids)} vigas x {len(env['names'])} combinaciones en "
+        f"{secs * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
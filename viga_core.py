@@ -0,0 +1,330 @@
+"""Núcleo de cálculo de vigas según NTP E.060 (sin interfaz gráfica).
+
+Todas las funciones trabajan con arreglos de NumPy y admiten lotes de
+vigas: los momentos se pasan como arreglos ``(N, 3)`` (extremo I, centro,
+extremo II) y los datos de sección como escalares o arreglos ``(N,)``.
+Un solo paso vectorizado reemplaza los bucles por escalar de la interfaz.
+"""
+
+import numpy as np
+
+import viga_instr
+
+# Tabla de diámetros y áreas (cm²) para barras de refuerzo
+BAR_DATA = {
+    '6mm': 0.28,
+    '8mm': 0.50,
+    '3/8"': 0.71,
+    '12mm': 1.13,
+    '1/2"': 1.29,
+    '5/8"': 1.99,
+    '3/4"': 2.84,
+    '1"': 5.10,
+}
+
+# Diámetros equivalentes en centímetros para las mismas claves que BAR_DATA
+DIAM_CM = {
+    '6mm': 0.6,
+    '8mm': 0.8,
+    '3/8"': 0.95,
+    '12mm': 1.2,
+    '1/2"': 1.27,
+    '5/8"': 1.59,
+    '3/4"': 1.91,
+    '1"': 2.54,
+}
+
+# Separación libre entre barras de una misma capa (cm)
+SPACING_CM = 2.5
+
+# Separación libre vertical entre capas (cm) y número máximo de capas
+LAYER_SPACING_CM = 2.5
+MAX_LAYERS = 3
+
+# Puntos de control (extremo I, centro, extremo II) y estaciones de las
+# curvas de momento, en fracciones de la luz
+X_CTRL = np.array([0, 0.5, 1.0])
+STATIONS = np.linspace(0, 1.0, 200)
+
+
+def _as_beam_array(x):
+    """Convierte ``x`` en arreglo float con un eje de viga para difundir."""
+    x = np.asarray(x, dtype=float)
+    return x[..., None] if x.ndim else x
+
+
+def system_factor(sys_t):
+    """Factor de corrección: 1/2 para ``'dual2'`` y 1/3 para ``'dual1'``."""
+    return np.where(np.asarray(sys_t) == 'dual2', 0.5, 1 / 3)
+
+
+@viga_instr.timed()
+def correct_moments(mn, mp, sys_t):
+    """Corrige los momentos negativos y positivos según la NTP E.060.
+
+    ``mn`` y ``mp`` son arreglos ``(3,)`` o ``(N, 3)``; ``sys_t`` puede ser
+    ``'dual1'``/``'dual2'`` o un arreglo ``(N,)`` con el sistema de cada viga.
+    """
+    mn_c = np.abs(np.asarray(mn, dtype=float))
+    mp_c = np.abs(np.asarray(mp, dtype=float))
+    factor = system_factor(sys_t)
+    if mn_c.ndim > 1:
+        factor = np.broadcast_to(factor, mn_c.shape[:-1])[..., None]
+
+    # Extremos: primero el positivo y luego el negativo con el valor ya
+    # corregido, en el mismo orden que la corrección de la interfaz.
+    ext = [0, 2]
+    mp_c[..., ext] = np.maximum(mp_c[..., ext], factor * mn_c[..., ext])
+    mn_c[..., ext] = np.maximum(mn_c[..., ext], factor * mp_c[..., ext])
+
+    max_ext = np.maximum(mn_c[..., ext].max(axis=-1), mp_c[..., ext].max(axis=-1))
+    floor = 0.25 * max_ext
+    mn_c[..., 1] = np.maximum(mn_c[..., 1], floor)
+    mp_c[..., 1] = np.maximum(mp_c[..., 1], floor)
+
+    return mn_c, mp_c
+
+
+def moment_basis(xs):
+    """Matriz ``(len(xs), 3)`` que evalúa la curva de momentos en ``xs``.
+
+    Con solo tres nodos en 0, 0.5 y 1, el spline cúbico ``not-a-knot`` de
+    ``scipy.interpolate.CubicSpline`` es la parábola que pasa por ellos, es
+    decir, una combinación lineal fija de los polinomios de Lagrange.
+    """
+    xs = np.asarray(xs, dtype=float)
+    return np.stack([
+        2 * (xs - 0.5) * (xs - 1),
+        -4 * xs * (xs - 1),
+        2 * xs * (xs - 0.5),
+    ], axis=-1)
+
+
+BASIS = moment_basis(STATIONS)
+
+
+def moment_curves(m, basis=BASIS):
+    """Curvas de momento en las estaciones de ``basis`` con un solo producto.
+
+    ``m`` es ``(3,)`` o ``(N, 3)``; devuelve ``(estaciones,)`` o
+    ``(N, estaciones)``.
+    """
+    return np.asarray(m, dtype=float) @ basis.T
+
+
+def effective_depth(h, r, de, db):
+    """Peralte efectivo ``d = h - r - φ_estribo - 0.5 φ_barra`` (cm)."""
+    return (np.asarray(h, dtype=float) - r - de - 0.5 * np.asarray(db, dtype=float))
+
+
+def as_limits(fc, fy, b, d):
+    """Áreas de acero mínima y máxima (cm²) para cada sección."""
+    fc = np.asarray(fc, dtype=float)
+    fy = np.asarray(fy, dtype=float)
+    beta1 = np.where(fc <= 280, 0.85, 0.85 - ((fc - 280) / 70) * 0.05)
+    as_min = 0.7 * (np.sqrt(fc) / fy) * b * d
+    pmax = 0.75 * ((0.85 * fc * beta1 / fy) * (6000 / (6000 + fy)))
+    as_max = pmax * b * d
+    return as_min, as_max
+
+
+def as_required(Mu, fc, b, d, fy, phi):
+    """Área de acero requerida (cm²) para momentos ``Mu`` en TN·m."""
+    Mu_kgcm = np.abs(np.asarray(Mu, dtype=float)) * 100000  # TN·m a kg·cm
+    term = 1.7 * fc * b * d / (2 * fy)
+    root = (2.89 * (fc * b * d) ** 2) / (fy ** 2) - (
+        6.8 * fc * b * Mu_kgcm
+    ) / (phi * (fy ** 2))
+    root = np.maximum(root, 0)
+    return term - 0.5 * np.sqrt(root)
+
+
+@viga_instr.timed()
+def required_areas(mn, mp, b, d, fc, fy, phi):
+    """Áreas requeridas negativas y positivas recortadas a [As_min, As_max].
+
+    Devuelve ``(as_n, as_p, as_min, as_max)``; las áreas tienen la forma de
+    ``mn``/``mp`` y los límites la forma de los datos de sección.
+    """
+    as_min, as_max = as_limits(fc, fy, b, d)
+    sec = [_as_beam_array(v) for v in (b, d, fc, fy, phi)]
+    lo, hi = _as_beam_array(as_min), _as_beam_array(as_max)
+    as_n = np.clip(as_required(mn, sec[2], sec[0], sec[1], sec[3], sec[4]), lo, hi)
+    as_p = np.clip(as_required(mp, sec[2], sec[0], sec[1], sec[3], sec[4]), lo, hi)
+    return as_n, as_p, as_min, as_max
+
+
+_TABLE_DIAM = np.array(list(DIAM_CM.values()))
+_TABLE_AREA = np.array([BAR_DATA[k] for k in DIAM_CM])
+
+
+def bar_area(db):
+    """Área (cm²) de una barra de diámetro ``db`` en cm.
+
+    Para los diámetros de ``DIAM_CM`` es el área de ``BAR_DATA``, la misma
+    que usan ``viga_barras`` y el armado; para otros, ``π db² / 4``.
+    """
+    db = np.asarray(db, dtype=float)
+    match = np.abs(db[..., None] - _TABLE_DIAM) < 1e-6
+    return np.where(match.any(axis=-1),
+                    (match * _TABLE_AREA).sum(axis=-1), np.pi / 4 * db ** 2)
+
+
+def base_required(n1, d1, n2, d2, r, de):
+    """Ancho de base (cm) necesario para ``n1`` barras ``d1`` y ``n2`` barras ``d2``.
+
+    Considera recubrimiento y estribo a ambos lados y una separación libre
+    de ``SPACING_CM`` entre barras de una sola capa.
+    """
+    n1 = np.asarray(n1)
+    n2 = np.asarray(n2)
+    spacing = np.maximum(n1 + n2 - 1, 0) * SPACING_CM
+    return 2 * r + 2 * de + n1 * d1 + n2 * d2 + spacing
+
+
+def bars_depth(h, r, de, as1, db1, as2, db2):
+    """Peralte efectivo (cm) al centroide de dos grupos de barras en una capa.
+
+    ``as1``/``as2`` son las áreas de cada grupo (cm²) y ``db1``/``db2`` sus
+    diámetros (cm): cada barra apoya en el estribo, con su centro a
+    ``r + φ_estribo + db/2`` de la cara. Donde no hay barras devuelve NaN.
+    """
+    as1, db1, as2, db2 = (np.asarray(v, dtype=float)
+                          for v in (as1, db1, as2, db2))
+    total = as1 + as2
+    offset = np.divide(0.5 * (as1 * db1 + as2 * db2), total,
+                       out=np.full(np.shape(total), np.nan), where=total > 0)
+    return _as_beam_array(h) - _as_beam_array(r) - _as_beam_array(de) - offset
+
+
+def bar_layers(n1, d1, n2, d2, b, r, de, max_layers=MAX_LAYERS):
+    """Reparte ``n1`` barras ``d1`` y ``n2`` barras ``d2`` en capas.
+
+    Las barras mayores van primero, en las capas más cercanas a la cara, y
+    cada capa se llena mientras quepa en el ancho libre
+    ``b - 2r - 2φ_estribo`` con la separación ``SPACING_CM`` (el mismo
+    criterio de ``base_required`` para una capa). Los argumentos se
+    difunden entre sí (por ejemplo cantidades ``(N, 6)`` con datos de
+    sección ``(N, 1)``). Devuelve ``(k1, k2, capas)``: las barras de cada
+    grupo por capa ``(..., max_layers)`` y el número de capas, que vale
+    ``max_layers + 1`` si no caben (en ese caso ``k1``/``k2`` solo cubren
+    las primeras capas).
+    """
+    n1, d1, n2, d2, b, r, de = np.broadcast_arrays(
+        *(np.asarray(v, dtype=float) for v in (n1, d1, n2, d2, b, r, de)))
+    d1 = np.where(n1 > 0, d1, 0.0)
+    d2 = np.where(n2 > 0, d2, 0.0)
+    swap = d2 > d1
+    big_n, big_d = np.where(swap, n2, n1), np.where(swap, d2, d1)
+    small_n, small_d = np.where(swap, n1, n2), np.where(swap, d1, d2)
+
+    # Ancho que ocupa cada barra con su separación; el libre de la capa
+    # admite una separación más porque la última barra no la lleva
+    room = b - 2 * r - 2 * de + SPACING_CM
+    big_w, small_w = big_d + SPACING_CM, small_d + SPACING_CM
+    k_big = np.zeros(n1.shape + (max_layers,))
+    k_small = np.zeros_like(k_big)
+    for j in range(max_layers):
+        kb = np.clip(np.floor(room / big_w), 0, big_n)
+        ks = np.clip(np.floor((room - kb * big_w) / small_w), 0, small_n)
+        k_big[..., j], k_small[..., j] = kb, ks
+        big_n = big_n - kb
+        small_n = small_n - ks
+    used = (k_big + k_small > 0).sum(axis=-1)
+    layers = np.where(big_n + small_n > 0, max_layers + 1, used)
+
+    k1 = np.where(swap[..., None], k_small, k_big)
+    k2 = np.where(swap[..., None], k_big, k_small)
+    return k1, k2, layers
+
+
+def layers_depth(h, r, de, k1, d1, a1, k2, d2, a2):
+    """Peralte efectivo (cm) al centroide de barras repartidas en capas.
+
+    ``k1``/``k2`` son las barras de cada grupo por capa ``(..., capas)``
+    (ver ``bar_layers``), ``d1``/``d2`` sus diámetros y ``a1``/``a2`` el
+    área de una barra. La primera capa apoya en el estribo y las
+    siguientes quedan a ``LAYER_SPACING_CM`` libres de la anterior. Los
+    datos de sección se difunden como en ``bar_layers``; donde no hay
+    barras devuelve NaN. Con una sola capa coincide con ``bars_depth``.
+    """
+    k1 = np.asarray(k1, dtype=float)
+    k2 = np.asarray(k2, dtype=float)
+    d1, a1, d2, a2 = (np.asarray(v, dtype=float) for v in (d1, a1, d2, a2))
+    d1 = np.where(k1.sum(axis=-1) > 0, d1, 0.0)
+    d2 = np.where(k2.sum(axis=-1) > 0, d2, 0.0)
+    pitch = np.maximum(d1, d2) + LAYER_SPACING_CM
+    level = np.arange(k1.shape[-1]) * pitch[..., None]
+    area1 = k1 * a1[..., None]
+    area2 = k2 * a2[..., None]
+    total = (area1 + area2).sum(axis=-1)
+    moment = (area1 * (level + 0.5 * d1[..., None])
+              + area2 * (level + 0.5 * d2[..., None])).sum(axis=-1)
+    offset = np.divide(moment, total, out=np.full(np.shape(total), np.nan),
+                       where=total > 0)
+    return np.asarray(h, dtype=float) - r - de - offset
+
+
+def phi_mn(as_, fc, fy, b, d, phi):
+    """Momento resistente de diseño φMn (TN·m) de un área ``as_`` en tracción.
+
+    ``φ As fy (d - a/2)`` con ``a = As fy / (0.85 f'c b)``; ``as_`` y ``d``
+    tienen una columna por posición y los datos de sección se difunden por
+    viga.
+    """
+    as_ = np.asarray(as_, dtype=float)
+    fc, fy, b, phi = (_as_beam_array(v) for v in (fc, fy, b, phi))
+    a = as_ * fy / (0.85 * fc * b)
+    return phi * as_ * fy * (d - a / 2) / 100000  # kg·cm a TN·m
+
+
+@viga_instr.timed()
+def capacity_ratios(mu, as1, db1, as2, db2, b, h, r, fc, fy, phi, de,
+                    d=None):
+    """``d``, φMn y relación demanda/capacidad ``|Mu| / φMn`` del armado colocado.
+
+    ``mu`` y las áreas y diámetros de barras son ``(..., posiciones)``; la
+    sección son escalares o arreglos ``(N,)``. ``d`` es el peralte del
+    armado (por ejemplo de ``layers_depth``); por defecto el de una capa
+    con ``bars_depth``. Donde no hay barras la capacidad es 0 y la
+    relación es infinita.
+    """
+    if d is None:
+        d = bars_depth(h, r, de, as1, db1, as2, db2)
+    cap = np.nan_to_num(phi_mn(np.add(as1, as2), fc, fy, b, d, phi))
+    mu = np.abs(np.asarray(mu, dtype=float))
+    dc = np.divide(mu, cap, out=np.full(np.shape(cap), np.inf), where=cap > 0)
+    return d, cap, dc
+
+
+@viga_instr.timed()
+def design_beams(mn, mp, sys_t, b, h, r, fc, fy, phi, de, db):
+    """Corrige momentos y calcula el acero requerido de un lote de vigas.
+
+    ``mn``/``mp`` son arreglos ``(N, 3)`` de momentos (TN·m); los datos de
+    sección (cm, kg/cm²) y los diámetros de estribo ``de`` y varilla ``db``
+    (cm) son escalares o arreglos ``(N,)``. Devuelve un diccionario con
+    ``mn_corr``, ``mp_corr``, ``d``, ``as_min``, ``as_max``, ``as_n``,
+    ``as_p`` y la verificación de base: ``base_req`` es el ancho necesario
+    para colocar en una capa las barras ``db`` que cubren la posición más
+    cargada y ``base_ok`` indica si cabe en ``b``.
+    """
+    mn_c, mp_c = correct_moments(mn, mp, sys_t)
+    d = effective_depth(h, r, de, db)
+    as_n, as_p, as_min, as_max = required_areas(mn_c, mp_c, b, d, fc, fy, phi)
+    n = mn_c.shape[:-1]
+
+    as_gov = np.maximum(as_n.max(axis=-1), as_p.max(axis=-1))
+    n_bars = np.ceil(as_gov / bar_area(db))
+    base_req = base_required(n_bars, db, 0, 0, r, de)
+    return {
+        'mn_corr': mn_c,
+        'mp_corr': mp_c,
+        'd': np.broadcast_to(d, n),
+        'as_min': np.broadcast_to(as_min, n),
+        'as_max': np.broadcast_to(as_max, n),
+        'as_n': as_n,
+        'as_p': as_p,
+        'base_req': base_req,
+        'base_ok': base_req <= np.asarray(b, dtype=float),
+    }
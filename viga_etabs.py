@@ -0,0 +1,318 @@
+"""Importación de tablas de fuerzas de ETABS/SAP2000 en modo *streaming*.
+
+Las exportaciones de análisis traen una fila por elemento, estación y
+combinación de carga (tablas ``Element Forces - Beams`` de ETABS o
+``Element Forces - Frames`` de SAP2000, en CSV o TSV). Este módulo las
+reduce a los seis momentos que lee ``MomentApp.get_moments``: el máximo
+negativo y el máximo positivo en el extremo I, el centro y el extremo J.
+
+El archivo se lee por bloques; cada bloque se reduce de forma vectorizada
+al mínimo y máximo de ``M3`` por elemento y estación (se eliminan las
+combinaciones, que son la mayor parte de las filas), y solo ese resumen se
+guarda en memoria. Al final, por elemento, la primera estación es el
+extremo I, la última el J y la más cercana a la mitad del tramo el centro.
+Un elemento con menos de tres estaciones no tiene un valor en el centro y
+es un error: hay que exportar las fuerzas con más estaciones por tramo.
+
+Se usa la convención de signos de ETABS/SAP2000 para vigas: ``M3`` positivo
+tracciona la fibra inferior. Los momentos se devuelven como magnitudes,
+igual que se ingresan en la interfaz.
+"""
+
+import argparse
+import csv
+import itertools
+import sys
+import time
+
+import numpy as np
+
+import viga_batch
+
+CHUNK_SIZE = 200000
+
+# Nombres de columna aceptados, en orden de preferencia
+FRAME_COLS = ("Unique Name", "UniqueName", "Frame")
+LABEL_COLS = ("Beam", "Label")
+STORY_COLS = ("Story",)
+CASE_COLS = ("Output Case", "OutputCase", "Load Case/Combo", "Combo")
+STATION_COLS = ("Station",)
+MOMENT_COL = "M3"
+
+# Decimales con que se agrupan las estaciones (m)
+STATION_DECIMALS = 4
+# Extremo I, centro y extremo J
+MIN_STATIONS = 3
+
+
+def _find(idx, names):
+    for name in names:
+        if name in idx:
+            return idx[name]
+    return None
+
+
+def _columns(header):
+    """Índices de las columnas de elemento, caso, estación y ``M3``."""
+    idx = {name: i for i, name in enumerate(header)}
+    cols = {
+        "frame": _find(idx, FRAME_COLS),
+        "label": _find(idx, LABEL_COLS),
+        "story": _find(idx, STORY_COLS),
+        "case": _find(idx, CASE_COLS),
+        "station": _find(idx, STATION_COLS),
+        "m3": idx.get(MOMENT_COL),
+    }
+    if cols["frame"] is None and cols["label"] is None:
+        raise ValueError("Falta la columna del elemento (Frame, Unique Name o Beam)")
+    if cols["station"] is None or cols["m3"] is None:
+        raise ValueError("Faltan las columnas Station y M3")
+    return cols
+
+
+def _header(f):
+    """Encabezado y separador de la tabla; deja ``f`` en la primera fila.
+
+    Detecta el separador (coma, punto y coma o tabulación) y omite el
+    título ``TABLE: ...`` que agregan los programas.
+    """
+    for line in f:
+        if MOMENT_COL in line and "Station" in line:
+            break
+    else:
+        raise ValueError("No se encontró el encabezado de la tabla de fuerzas")
+    delim = max("\t,;", key=line.count)
+    header = [h.strip() for h in next(csv.reader([line], delimiter=delim))]
+    return header, delim
+
+
+def _is_units(line, delim, col):
+    """``True`` si ``line`` es la fila de unidades (``m``, ``tonf-m``)."""
+    fields = next(csv.reader([line], delimiter=delim))
+    try:
+        float(fields[col])
+    except (ValueError, IndexError):
+        return True
+    return False
+
+
+def _load(lines, delim, cols, dtype=float):
+    """Columnas ``cols`` de las líneas de texto ``lines`` como matriz."""
+    return np.loadtxt(lines, delimiter=delim, usecols=cols, dtype=dtype,
+                      ndmin=2, quotechar='"', comments=None)
+
+
+class EnvelopeReducer:
+    """Acumula mínimos y máximos de ``M3`` por elemento y estación.
+
+    ``add`` recibe bloques de filas ya separados en columnas; el resumen se
+    compacta cada vez que lo pendiente supera a lo ya reducido, de modo que
+    el costo total crece linealmente con el archivo.
+    """
+
+    def __init__(self):
+        self.names = []
+        self._codes = {}
+        empty = np.empty(0)
+        self._acc = (np.empty(0, dtype=np.int64), empty, empty, empty)
+        self._pending = []
+        self._n_pending = 0
+
+    def add(self, frames, stations, m3):
+        """Agrega filas ``frames`` (textos), ``stations`` y ``m3`` (números)."""
+        if len(frames) == 0:
+            return
+        uniq, first, inverse = np.unique(
+            np.asarray(frames), return_index=True, return_inverse=True)
+        # Códigos nuevos en el orden en que aparecen los elementos
+        for name in uniq[np.argsort(first)].tolist():
+            self._code(name)
+        lut = np.array([self._codes[name] for name in uniq.tolist()])
+        codes = lut[inverse.ravel()]
+        stations = np.round(np.asarray(stations, dtype=float), STATION_DECIMALS)
+        m3 = np.asarray(m3, dtype=float)
+        part = self._reduce(codes, stations, m3, m3)
+        self._pending.append(part)
+        self._n_pending += len(part[0])
+        if self._n_pending > len(self._acc[0]):
+            self._compact()
+
+    def _code(self, name):
+        code = self._codes.get(name)
+        if code is None:
+            code = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    @staticmethod
+    def _reduce(codes, stations, lo, hi):
+        """Mínimo de ``lo`` y máximo de ``hi`` por par elemento/estación."""
+        order = np.lexsort((stations, codes))
+        codes, stations = codes[order], stations[order]
+        new = np.ones(len(codes), dtype=bool)
+        new[1:] = (codes[1:] != codes[:-1]) | (stations[1:] != stations[:-1])
+        start = np.flatnonzero(new)
+        return (codes[start], stations[start],
+                np.minimum.reduceat(lo[order], start),
+                np.maximum.reduceat(hi[order], start))
+
+    def _compact(self):
+        if not self._pending:
+            return
+        parts = [self._acc] + self._pending
+        self._acc = self._reduce(*(np.concatenate(p) for p in zip(*parts)))
+        self._pending = []
+        self._n_pending = 0
+
+    def result(self):
+        """``(ids, mn, mp)`` con ``mn``/``mp`` ``(N, 3)``.
+
+        Los elementos quedan en el orden en que aparecen en el archivo,
+        cualquiera sea el tamaño de bloque.
+        """
+        self._compact()
+        codes, stations, lo, hi = self._acc
+        n = len(self.names)
+        if n == 0:
+            return [], np.empty((0, 3)), np.empty((0, 3))
+
+        # Filas ordenadas por elemento y estación: la primera de cada
+        # elemento es el extremo I y la última el extremo J.
+        first = np.searchsorted(codes, np.arange(n), side="left")
+        last = np.searchsorted(codes, np.arange(n), side="right") - 1
+        short = np.flatnonzero(last - first + 1 < MIN_STATIONS)
+        if len(short):
+            k = short[0]
+            more = (f"; {len(short) - 1} elementos más en el mismo caso"
+                    if len(short) > 1 else "")
+            raise ValueError(
+                f"Elemento {self.names[k]!r} con {last[k] - first[k] + 1} "
+                f"estaciones: se necesitan al menos {MIN_STATIONS} (extremo "
+                f"I, centro y extremo J){more}")
+        s_i, s_j = stations[first], stations[last]
+
+        # Centro: estación más cercana a la mitad de cada tramo
+        span = np.where(s_j > s_i, s_j - s_i, 1.0)
+        rel = (stations - s_i[codes]) / span[codes]
+        key = codes * 4.0 + rel
+        pos = np.searchsorted(key, np.arange(n) * 4.0 + 0.5)
+        pos = np.clip(pos, first + 1, last)
+        left = np.maximum(pos - 1, first)
+        take_left = (0.5 - rel[left]) <= (rel[pos] - 0.5)
+        mid = np.where(take_left, left, pos)
+
+        at = np.column_stack([first, mid, last])
+        mn = np.maximum(-lo[at], 0.0)
+        mp = np.maximum(hi[at], 0.0)
+        return self.names, mn, mp
+
+
+def read_envelope(path, cases=None, chunk_size=CHUNK_SIZE, factor=1.0):
+    """Lee una exportación de fuerzas y devuelve ``(ids, mn, mp)``.
+
+    ``cases`` limita la lectura a esas combinaciones (``Output Case``);
+    ``factor`` multiplica los momentos, por ejemplo para pasar de kN·m a
+    TN·m. ``mn`` y ``mp`` son magnitudes ``(N, 3)`` en los extremos I,
+    centro y J, listas para ``viga_core.correct_moments``.
+    """
+    reducer = EnvelopeReducer()
+    for _ in iter_envelope(path, reducer, cases, chunk_size, factor):
+        pass
+    return reducer.result()
+
+
+def iter_envelope(path, reducer, cases=None, chunk_size=CHUNK_SIZE,
+                  factor=1.0):
+    """Agrega el archivo a ``reducer`` bloque por bloque.
+
+    Después de cada bloque genera la posición en bytes dentro del archivo,
+    para informar el avance respecto de su tamaño (``os.path.getsize``).
+    """
+    cases = None if cases is None else sorted(cases)
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header, delim = _header(f)
+        cols = _columns(header)
+        if cases is not None and cols["case"] is None:
+            raise ValueError("Falta la columna Output Case para filtrar combinaciones")
+        if cols["frame"] is not None:
+            name_cols = [cols["frame"]]
+        elif cols["story"] is not None:
+            name_cols = [cols["story"], cols["label"]]
+        else:
+            name_cols = [cols["label"]]
+        if cases is not None:
+            name_cols.append(cols["case"])
+
+        first = True
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                break
+            if first:
+                first = False
+                if _is_units(lines[0], delim, cols["station"]):
+                    lines = lines[1:]
+            lines = [line for line in lines if line.strip()]
+            if lines:
+                values = _load(lines, delim, (cols["station"], cols["m3"]))
+                names = _load(lines, delim, name_cols, dtype=str)
+                if cases is not None:
+                    keep = np.isin(names[:, -1], cases)
+                    values, names = values[keep], names[keep, :-1]
+                frames = names[:, 0]
+                if names.shape[1] == 2:
+                    frames = np.char.add(np.char.add(frames, "-"), names[:, 1])
+                reducer.add(frames, values[:, 0], values[:, 1] * factor)
+            # Bytes ya leídos del archivo (adelanta a lo más el búfer de
+            # lectura a las líneas del bloque)
+            yield f.buffer.tell()
+
+
+def write_moments(path, ids, mn, mp):
+    """Escribe un CSV con las columnas de entrada de ``viga_batch``."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["id"] + viga_batch.MOMENT_COLS)
+        writer.writerows(
+            [i] + [f"{v:.4f}" for v in row]
+            for i, row in zip(ids, np.hstack([mn, mp]).tolist())
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py etabs",
+        description="Reduce una tabla de fuerzas de ETABS/SAP2000 a los "
+                    "momentos de diseño de cada viga.",
+    )
+    parser.add_argument("entrada", help="CSV/TSV exportado (Element Forces)")
+    parser.add_argument("salida", help="CSV de momentos para 'lote'")
+    parser.add_argument(
+        "--casos", nargs="+",
+        help="combinaciones a considerar (por defecto todas)",
+    )
+    parser.add_argument(
+        "--factor", type=float, default=1.0,
+        help="factor de conversión de los momentos (por defecto 1)",
+    )
+    parser.add_argument(
+        "--bloque", type=viga_batch.positive_int, default=CHUNK_SIZE,
+        help=f"filas por bloque (por defecto {CHUNK_SIZE})",
+    )
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        ids, mn, mp = read_envelope(args.entrada, args.casos, args.bloque,
+                                    args.factor)
+        write_moments(args.salida, ids, mn, mp)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"{len(ids)} vigas en {time.perf_counter() - t0:.2f} s",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
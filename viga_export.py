@@ -0,0 +1,291 @@
+"""Exportación masiva de figuras de diseño sin interfaz (backend Agg).
+
+Para cada viga de un proyecto se dibujan en una sola figura los diagramas
+de momentos original y corregido, la sección transversal y la distribución
+de acero requerido y diseñado (armado automático de ``viga_barras``, con
+su envolvente a lo largo del tramo de ``viga_tramo``), y se guardan en PNG
+o SVG. La figura y sus artistas se crean una sola vez por
+proceso con los mismos gráficos de ``viga_plots`` que usa la interfaz; para
+cada viga solo se cambian los datos antes de guardar.
+
+Con ``workers > 1`` las vigas se reparten por bloques en un grupo de
+procesos, cada uno con su propia figura.
+"""
+
+import argparse
+import contextlib
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import viga_barras
+import viga_batch
+import viga_core
+import viga_instr
+import viga_tramo
+
+# Figuras por segundo esperadas por proceso en PNG a 100 dpi
+THROUGHPUT_TARGET = 10.0
+
+CHUNK_SIZE = 250
+FORMATS = ("png", "svg")
+
+_exporter = None
+
+
+class _StaticBlitter:
+    """Sustituto de ``BlitManager``: al exportar se dibuja la figura completa."""
+
+    def add(self, *artists):
+        pass
+
+    def refresh(self, full=False):
+        pass
+
+
+class FigureExporter:
+    """Figura Agg reutilizable con los cuatro gráficos de una viga."""
+
+    def __init__(self, dpi=100):
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+
+        import viga_plots
+
+        self.dpi = dpi
+        self.fig = Figure(figsize=(10, 6), dpi=dpi)
+        self.canvas = viga_instr.wrap(
+            FigureCanvasAgg(self.fig), "draw", "canvas.draw")
+        grid = self.fig.add_gridspec(2, 3, width_ratios=(3, 1.6, 2.2))
+        ax_orig = self.fig.add_subplot(grid[0, 0])
+        ax_corr = self.fig.add_subplot(grid[1, 0])
+        ax_sec = self.fig.add_subplot(grid[:, 1])
+        ax_dist = self.fig.add_subplot(grid[:, 2])
+        self.fig.subplots_adjust(left=0.06, right=0.87, bottom=0.08,
+                                 top=0.92, wspace=0.6, hspace=0.3)
+
+        blit = _StaticBlitter()
+        self.plot_orig = viga_plots.MomentPlot(
+            ax_orig, blit, '-', ('Neg original', 'Pos original'))
+        self.plot_corr = viga_plots.MomentPlot(
+            ax_corr, blit, '--', ('Neg corregido', 'Pos corregido'))
+        self.section = viga_plots.SectionPlot(ax_sec, blit)
+        self.dist = viga_plots.DistributionPlot(ax_dist, blit)
+        self.title = self.fig.suptitle('')
+
+    @viga_instr.timed()
+    def render(self, path, beam_id, chunk, res, i, index=None, span=None):
+        """Actualiza la figura con la viga ``i`` de ``chunk`` y la guarda.
+
+        ``span`` es el resultado de ``viga_tramo.chunk_span`` con
+        ``curves=True``; si se da, se dibuja la envolvente de acero.
+        """
+        index = index or viga_barras.default_index()
+        ids = res["armado"][i]
+        des = np.where(ids >= 0, index.area[np.maximum(ids, 0)], 0.0)
+
+        def value(key):
+            v = np.asarray(chunk[key])
+            return v[i] if v.ndim else v
+
+        bottom, top = section_bars(ids, value("b"), value("r"), value("de"),
+                                   index)
+
+        self.plot_orig.update(chunk["mn"][i], chunk["mp"][i], refresh=False)
+        self.plot_corr.update(res["mn_corr"][i], res["mp_corr"][i],
+                              refresh=False)
+        self.section.update(value("b"), value("h"), value("r"), value("de"),
+                            value("db"), bottom, top, refresh=False)
+        envelope = None if span is None else (span["req"][i], span["prov"][i])
+        self.dist.update(res["as_n"][i], res["as_p"][i], des[:3], des[3:],
+                         res["dc"][i], envelope, refresh=False)
+        ok = "OK" if res["base_ok"][i] else "NO OK"
+        self.title.set_text(
+            f"Viga {beam_id} — b×h = {value('b'):g}×{value('h'):g} cm, "
+            f"d = {res['d'][i]:.1f} cm, base {ok}"
+        )
+        if path.endswith(".svg"):
+            self.fig.savefig(path, dpi=self.dpi)
+        else:
+            # Compresión rápida: el archivo crece poco y se guarda varias
+            # veces más rápido que con el nivel por defecto
+            self.canvas.print_png(path, pil_kwargs={"compress_level": 1})
+
+    def render_chunk(self, chunk, ids, folder, fmt="png", index=None,
+                     names=None):
+        """Diseña un bloque y guarda una figura por viga; devuelve las rutas.
+
+        Cada figura lleva el armado automático en la sección y la envolvente
+        de acero a lo largo del tramo (``viga_tramo.chunk_span``). ``names``
+        son los nombres de archivo (por defecto ``file_names(ids)``).
+        """
+        res = viga_batch.design_chunk(chunk)
+        span = viga_tramo.chunk_span(chunk, res, curves=True)
+        names = file_names(ids) if names is None else names
+        paths = []
+        for i, (beam_id, name) in enumerate(zip(ids, names)):
+            path = os.path.join(folder, f"{name}.{fmt}")
+            self.render(path, beam_id, chunk, res, i, index, span)
+            paths.append(path)
+        return paths
+
+
+def section_bars(ids, b, r, de, index=None):
+    """Barras por capa ``(k1, d1, k2, d2)`` de la cara inferior y superior.
+
+    ``ids`` son los seis índices de ``viga_barras.BarIndex`` del armado de
+    una viga. Como en la ventana de diseño, cada cara muestra su posición
+    con más acero repartida con ``viga_core.bar_layers``; ``None`` si la
+    cara no tiene armado.
+    """
+    index = index or viga_barras.default_index()
+    ok = ids >= 0
+    safe = np.where(ok, ids, 0)
+    area = np.where(ok, index.area[safe], 0.0)
+    diam = np.array([viga_core.DIAM_CM[k] for k in index.keys])
+    faces = []
+    for face in (slice(3, 6), slice(0, 3)):
+        j = face.start + int(np.argmax(area[face]))
+        if not area[j]:
+            faces.append(None)
+            continue
+        i = safe[j]
+        d1 = diam[index.c1[i]]
+        d2 = diam[index.c2[i]] if index.c2[i] >= 0 else 0.0
+        k1, k2, _ = viga_core.bar_layers(
+            index.n1[i], d1, index.n2[i], d2, b, r, de)
+        faces.append((k1, d1, k2, d2))
+    return tuple(faces)
+
+
+def file_name(beam_id):
+    """Nombre de archivo seguro a partir del identificador de la viga."""
+    return re.sub(r"[^\w.-]+", "_", str(beam_id)) or "viga"
+
+
+def file_names(ids, used=None):
+    """Nombres de archivo distintos para ``ids``, en el mismo orden.
+
+    Identificadores que quedan iguales al limpiarlos (``"V 1"`` y ``"V_1"``)
+    o que solo difieren en mayúsculas reciben un sufijo ``_2``, ``_3``...
+    ``used`` es el conjunto de nombres ya usados en la carpeta (en
+    minúsculas); se actualiza para los bloques siguientes.
+    """
+    used = set() if used is None else used
+    names = []
+    for beam_id in ids:
+        base = name = file_name(beam_id)
+        k = 1
+        while name.lower() in used:
+            k += 1
+            name = f"{base}_{k}"
+        used.add(name.lower())
+        names.append(name)
+    return names
+
+
+def _init_worker(dpi):
+    global _exporter
+    _exporter = FigureExporter(dpi)
+
+
+def render_chunk(chunk, ids, folder, fmt="png", names=None):
+    """Diseña un bloque y guarda una figura por viga; devuelve las rutas."""
+    global _exporter
+    if _exporter is None:
+        _exporter = FigureExporter()
+    return _exporter.render_chunk(chunk, ids, folder, fmt, names=names)
+
+
+def new_pool(workers, dpi=100):
+    """Grupo de procesos con una ``FigureExporter`` por proceso."""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                               initargs=(dpi,))
+
+
+def export_project(project, folder, fmt="png", workers=1, dpi=100,
+                   chunk_size=CHUNK_SIZE, pool=None, used=None):
+    """Exporta las figuras de todas las vigas de ``project`` a ``folder``.
+
+    ``project`` tiene las claves de ``viga_batch.INPUT_KEYS`` e ``id``.
+    Devuelve la lista de archivos en el orden de las vigas. Para exportar
+    varios bloques en una sola pasada, ``pool`` (de ``new_pool``) y
+    ``used`` (nombres ya usados, ver ``file_names``) se comparten entre
+    las llamadas.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+    os.makedirs(folder, exist_ok=True)
+    n = len(project["mn"])
+    ids = project.get("id") or [str(i) for i in range(n)]
+    names = file_names(ids, used)
+    bounds = range(0, n, chunk_size)
+    tasks = [
+        (viga_batch.take(project, slice(i, i + chunk_size)),
+         ids[i:i + chunk_size], names[i:i + chunk_size])
+        for i in bounds
+    ]
+
+    if workers <= 1 and pool is None:
+        if _exporter is None or _exporter.dpi != dpi:
+            _init_worker(dpi)
+        parts = [render_chunk(chunk, part_ids, folder, fmt, part_names)
+                 for chunk, part_ids, part_names in tasks]
+    else:
+        with contextlib.ExitStack() as stack:
+            if pool is None:
+                pool = stack.enter_context(new_pool(workers, dpi))
+            futures = [pool.submit(render_chunk, chunk, part_ids, folder, fmt,
+                                   part_names)
+                       for chunk, part_ids, part_names in tasks]
+            parts = [fut.result() for fut in futures]
+    return [path for part in parts for path in part]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py figuras",
+        description="Exporta sección, momentos y distribución de acero de "
+                    "cada viga de un CSV a PNG o SVG.",
+    )
+    parser.add_argument("entrada", help="CSV con el cuadro de vigas")
+    parser.add_argument("carpeta", help="carpeta de salida")
+    parser.add_argument("--formato", choices=FORMATS, default="png")
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument(
+        "--procesos", type=int, default=1,
+        help="procesos en paralelo; 0 usa todos los núcleos (por defecto 1)",
+    )
+    args = parser.parse_args(argv)
+    workers = args.procesos or os.cpu_count() or 1
+
+    t0 = time.perf_counter()
+    try:
+        paths = []
+        used = set()
+        with contextlib.ExitStack() as stack:
+            # Un solo grupo de procesos (o figura) para todos los bloques
+            pool = (stack.enter_context(new_pool(workers, args.dpi))
+                    if workers > 1 else None)
+            f = stack.enter_context(
+                open(args.entrada, newline="", encoding="utf-8"))
+            for chunk in viga_batch.iter_chunks(f):
+                paths += export_project(chunk, args.carpeta, args.formato,
+                                        workers, args.dpi, pool=pool,
+                                        used=used)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    secs = time.perf_counter() - t0
+    rate = len(paths) / secs if secs > 0 else float("inf")
+    print(f"{len(paths)} figuras en {secs:.2f} s ({rate:.1f} figuras/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
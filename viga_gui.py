@@ -0,0 +1,992 @@
+"""Interfaz gráfica PyQt5: ventana de momentos y ventana de diseño de acero.
+
+Se importa solo al abrir la interfaz; los cálculos viven en ``viga_core``.
+"""
+
+import time
+from PyQt5.QtWidgets import (
+    QApplication, QMainWindow, QWidget, QGridLayout, QLabel,
+    QLineEdit, QPushButton, QRadioButton, QButtonGroup, QMessageBox,
+    QComboBox, QFileDialog, QProgressBar
+)
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
+from PyQt5.QtGui import QGuiApplication
+from matplotlib.backends.backend_qt5agg import (
+    FigureCanvasQTAgg as FigureCanvas,
+)
+from matplotlib.figure import Figure
+import numpy as np
+
+import viga_barras
+import viga_core
+import viga_instr
+import viga_memoria
+import viga_modelo
+import viga_plots
+import viga_tramo
+import viga_workers
+from viga_core import DIAM_CM
+
+# Intervalo de refresco de la línea de tiempos en la barra de estado (ms)
+INSTR_REFRESH_MS = 500
+
+
+def add_timing_overlay(window):
+    """Muestra en la barra de estado las rutas más lentas (con VIGA_INSTR).
+
+    Sin la instrumentación activa no agrega nada.
+    """
+    if not viga_instr.ENABLED:
+        return None
+    label = QLabel(viga_instr.overlay_text())
+    label.setStyleSheet("color: gray; font-family: monospace;")
+    window.statusBar().addPermanentWidget(label)
+    timer = QTimer(window)
+    timer.timeout.connect(lambda: label.setText(viga_instr.overlay_text()))
+    timer.start(INSTR_REFRESH_MS)
+    return label
+
+
+class MomentApp(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Parte 1 – Momentos y Diagramas (NTP E.060)")
+        self.mn_corr = None
+        self.mp_corr = None
+        self._build_ui()
+        self.resize(1200, 800)
+        self.show()
+
+    def _build_ui(self):
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QGridLayout(central)
+
+        # Ajustes de márgenes y alineación a la izquierda
+        layout.setContentsMargins(10, 10, 10, 10)
+        layout.setHorizontalSpacing(10)
+        layout.setColumnStretch(6, 1)
+
+        # ── Entradas de momentos ──────────────────────────────
+        self.m_neg_edits, self.m_pos_edits = [], []
+        for row, labels in enumerate(
+            [("M1–", "M2–", "M3–"), ("M1+", "M2+", "M3+")]
+        ):
+            for i, text in enumerate(labels):
+                layout.addWidget(QLabel(text), row, 2*i)
+                ed = QLineEdit("0.0")
+                ed.setAlignment(Qt.AlignRight)
+                ed.setFixedWidth(80)
+                layout.addWidget(ed, row, 2*i+1)
+                if row == 0:
+                    self.m_neg_edits.append(ed)
+                else:
+                    self.m_pos_edits.append(ed)
+
+        # ── Selector de sistema ────────────────────────────
+        self.rb_dual1 = QRadioButton("Dual 1")
+        self.rb_dual2 = QRadioButton("Dual 2")
+        self.rb_dual2.setChecked(True)
+        bg = QButtonGroup(self)
+        bg.addButton(self.rb_dual1)
+        bg.addButton(self.rb_dual2)
+        layout.addWidget(QLabel("Sistema:"), 2, 0)
+        layout.addWidget(self.rb_dual1, 2, 1)
+        layout.addWidget(self.rb_dual2, 2, 2)
+
+        # ── Botones ────────────────────────────────────
+        btn_calc    = QPushButton("Calcular Diagramas")
+        btn_next    = QPushButton("Ir a Diseño de Acero")
+        btn_capture = QPushButton("Capturar Diagramas")
+        btn_calc.clicked.connect(self.on_calculate)
+        btn_next.clicked.connect(self.on_next)
+        btn_capture.clicked.connect(self._capture_diagram)
+        layout.addWidget(btn_calc,    2, 3)
+        layout.addWidget(btn_next,    2, 4)
+        layout.addWidget(btn_capture, 2, 5)
+
+        # ── Canvas con diagramas ─────────────────────────
+        self.fig = Figure(figsize=(6, 5), constrained_layout=True)
+        self.ax1, self.ax2 = self.fig.subplots(2, 1)
+        self.canvas = FigureCanvas(self.fig)
+        layout.addWidget(self.canvas, 3, 0, 1, 6)
+
+        # Artistas persistentes: cada cálculo solo cambia sus datos
+        self.blitter = viga_plots.BlitManager(self.canvas)
+        self.plot_orig = viga_plots.MomentPlot(
+            self.ax1, self.blitter, '-', ('Neg original', 'Pos original'),
+            hover=True,
+        )
+        self.plot_corr = viga_plots.MomentPlot(
+            self.ax2, self.blitter, '--', ('Neg corregido', 'Pos corregido'),
+            hover=True,
+        )
+        self.plot_corr.set_visible(False)
+
+        self._build_jobs_ui()
+        self.plot_original()
+
+    def _build_jobs_ui(self):
+        """Menú de proyecto y barra de avance de los trabajos en segundo plano."""
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(2)
+        self._workers = set()
+        self.imported = None
+
+        menu = self.menuBar().addMenu("Proyecto")
+        menu.addAction("Abrir cuadro de vigas…", self.on_open_project)
+        menu.addAction("Diseñar cuadro CSV…", self.on_batch)
+        menu.addAction("Importar ETABS/SAP2000…", self.on_import)
+        menu.addAction("Exportar figuras…", self.on_export)
+        if viga_instr.ENABLED:
+            menu.addAction("Guardar tiempos…", self.on_save_timings)
+        self.timing_label = add_timing_overlay(self)
+
+        self.job_progress = QProgressBar()
+        self.job_progress.setMaximumWidth(200)
+        self.btn_cancel = QPushButton("Cancelar")
+        self.btn_cancel.clicked.connect(self.cancel_jobs)
+        for w in (self.job_progress, self.btn_cancel):
+            w.hide()
+            self.statusBar().addPermanentWidget(w)
+
+    @viga_instr.timed()
+    def get_moments(self):
+        try:
+            mn = np.array([float(ed.text()) for ed in self.m_neg_edits])
+            mp = np.array([float(ed.text()) for ed in self.m_pos_edits])
+            return mn, mp
+        except ValueError:
+            QMessageBox.warning(
+                self, "Error", "Ingrese valores numéricos válidos."
+            )
+            raise
+
+    @viga_instr.timed()
+    def plot_original(self):
+        mn, mp = self.get_moments()
+        self.plot_orig.update(mn, mp)
+
+    @viga_instr.timed()
+    def plot_corrected(self, mn_corr, mp_corr):
+        self.plot_corr.update(mn_corr, mp_corr)
+
+    @viga_instr.timed()
+    def correct_moments(self, mn, mp, sys_t):
+        return viga_core.correct_moments(mn, mp, sys_t)
+
+    @viga_instr.timed()
+    def on_calculate(self):
+        try:
+            mn, mp = self.get_moments()
+        except:
+            return
+        sys_t = 'dual2' if self.rb_dual2.isChecked() else 'dual1'
+        mn_c, mp_c = self.correct_moments(mn, mp, sys_t)
+        self.plot_original()
+        self.plot_corrected(mn_c, mp_c)
+        self.mn_corr = mn_c
+        self.mp_corr = mp_c
+
+    def on_next(self):
+        if self.mn_corr is None or self.mp_corr is None:
+            QMessageBox.warning(
+                self,
+                "Advertencia",
+                "Primero calcule los momentos corregidos",
+            )
+            return
+        self.design_win = DesignWindow(self.mn_corr, self.mp_corr)
+        self.design_win.show()
+
+    def start_job(self, title, job, *args, on_result=None, **kwargs):
+        """Ejecuta ``job`` (ver ``viga_workers``) sin bloquear la ventana."""
+        worker = viga_workers.Worker(job, *args, **kwargs)
+        sig = worker.signals
+        sig.progress.connect(self._on_job_progress)
+        if on_result is not None:
+            sig.result.connect(on_result)
+        sig.finished.connect(lambda: self._on_job_done(worker, f"{title}: listo"))
+        sig.cancelled.connect(
+            lambda: self._on_job_done(worker, f"{title}: cancelado"))
+        sig.error.connect(
+            lambda msg: self._on_job_done(worker, f"{title}: error: {msg}"))
+        self._workers.add(worker)
+        self.job_progress.setValue(0)
+        self.job_progress.show()
+        self.btn_cancel.show()
+        self.statusBar().showMessage(f"{title}…")
+        self.pool.start(worker)
+        return worker
+
+    def cancel_jobs(self):
+        for worker in self._workers:
+            worker.cancel()
+
+    def _on_job_progress(self, done, total):
+        self.job_progress.setMaximum(max(total, 1))
+        self.job_progress.setValue(min(done, max(total, 1)))
+
+    def _on_job_done(self, worker, message):
+        self._workers.discard(worker)
+        if not self._workers:
+            self.job_progress.hide()
+            self.btn_cancel.hide()
+        self.statusBar().showMessage(message, 10000)
+
+    def on_open_project(self, path=None):
+        """Diseña un cuadro CSV y lo muestra en la tabla del proyecto.
+
+        Las filas aparecen en la tabla a medida que cada bloque se diseña
+        en segundo plano.
+        """
+        import viga_tabla
+
+        if not path:
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Cuadro de vigas", "", "CSV (*.csv)")
+            if not path:
+                return None
+        self.project_win = viga_tabla.ProjectWindow()
+        self.project_win.show()
+        model = self.project_win.model
+        self.start_job(
+            "Proyecto", viga_workers.batch_job, path,
+            on_result=lambda part: model.append(part["chunk"], part["res"]),
+        )
+        return self.project_win
+
+    def on_batch(self):
+        """Diseña un cuadro CSV completo en segundo plano."""
+        in_path, _ = QFileDialog.getOpenFileName(
+            self, "Cuadro de vigas", "", "CSV (*.csv)")
+        if not in_path:
+            return
+        out_path, _ = QFileDialog.getSaveFileName(
+            self, "Guardar resultados", "resultados.csv", "CSV (*.csv)")
+        if not out_path:
+            return
+        self._batch_counts = [0, 0]
+        self.start_job("Diseño por lotes", viga_workers.batch_job,
+                       in_path, out_path, on_result=self._on_batch_result)
+
+    def _on_batch_result(self, part):
+        res = part["res"]
+        no_ok = ~res["ok"].all(axis=1)
+        self._batch_counts[0] += len(part["id"])
+        self._batch_counts[1] += int(no_ok.sum())
+        n, bad = self._batch_counts
+        self.statusBar().showMessage(f"{n} vigas diseñadas, {bad} NO OK")
+
+    def on_import(self):
+        """Importa una tabla de fuerzas de ETABS/SAP2000 en segundo plano."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Tabla de fuerzas", "", "CSV/TSV (*.csv *.tsv *.txt)")
+        if path:
+            self.start_job("Importación", viga_workers.import_job, path,
+                           on_result=self._on_import_result)
+
+    def _on_import_result(self, envelope):
+        """Carga la primera viga importada en los campos de momentos."""
+        self.imported = envelope
+        ids, mn, mp = envelope
+        if not len(ids):
+            return
+        for ed, v in zip(self.m_neg_edits + self.m_pos_edits,
+                         np.concatenate([mn[0], mp[0]])):
+            ed.setText(f"{v:.2f}")
+        self.on_calculate()
+        self.statusBar().showMessage(
+            f"{len(ids)} vigas importadas; se muestra {ids[0]}", 10000)
+
+    def on_export(self):
+        """Exporta las figuras de un cuadro CSV en segundo plano."""
+        in_path, _ = QFileDialog.getOpenFileName(
+            self, "Cuadro de vigas", "", "CSV (*.csv)")
+        if not in_path:
+            return
+        folder = QFileDialog.getExistingDirectory(self, "Carpeta de figuras")
+        if folder:
+            self.start_job("Exportación de figuras", viga_workers.export_job,
+                           in_path, folder)
+
+    def on_save_timings(self):
+        """Guarda los tiempos medidos como resumen JSON o traza de Chrome."""
+        path, kind = QFileDialog.getSaveFileName(
+            self, "Guardar tiempos", "tiempos.json",
+            "Resumen JSON (*.json);;Traza de Chrome (*.json)",
+        )
+        if not path:
+            return
+        try:
+            if kind.startswith("Traza"):
+                viga_instr.dump_trace(path)
+            else:
+                viga_instr.dump_json(path)
+        except OSError as exc:
+            QMessageBox.warning(self, "Error", str(exc))
+            return
+        self.statusBar().showMessage(f"Tiempos guardados en {path}", 5000)
+
+    def closeEvent(self, event):
+        self.cancel_jobs()
+        self.pool.waitForDone()
+        super().closeEvent(event)
+
+    def _capture_diagram(self):
+        pix = self.canvas.grab()
+        QGuiApplication.clipboard().setPixmap(pix)
+        QMessageBox.information(
+            self,
+            "Captura",
+            "Diagramas copiados al portapapeles.\n"
+            "Usa Ctrl+V para pegar."
+        )
+
+
+def _select_bar(cb, key):
+    """Select the bar ``key`` in ``cb``, adding it if the combo lacks it.
+
+    Project CSVs accept any key of ``DIAM_CM``, while the combos only list
+    the usual sizes; the missing key is inserted in diameter order.
+    """
+    if cb.findText(key) < 0:
+        if key not in DIAM_CM:
+            raise ValueError(f"Diámetro no disponible: {key}")
+        pos = sum(DIAM_CM.get(cb.itemText(i), 0) < DIAM_CM[key]
+                  for i in range(cb.count()))
+        cb.insertItem(pos, key)
+    cb.setCurrentText(key)
+
+
+class DesignWindow(QMainWindow):
+    """Ventana para la etapa de diseño de acero (solo interfaz gráfica)."""
+
+    # Objetivo de latencia por interacción (ms), pensado para equipos modestos
+    LATENCY_TARGET_MS = 50.0
+
+    def __init__(self, mn_corr, mp_corr, section=None):
+        super().__init__()
+        # Sección, momentos corregidos y armado de la viga en un registro
+        # de viga_modelo; los widgets solo lo leen y lo escriben.
+        self.beam = viga_modelo.new_beams(1)[0]
+        self.beam["mn"] = mn_corr
+        self.beam["mp"] = mp_corr
+        self.setWindowTitle("Parte 2 – Diseño de Acero")
+        self._build_ui()
+        self.timing_label = add_timing_overlay(self)
+        if section:
+            self.set_section(section)
+        self.resize(900, 600)
+
+    def set_section(self, section):
+        """Fill the section inputs and select the automatic bars.
+
+        ``section`` maps the edit labels (``"b (cm)"``...) to texts, plus
+        ``"estribo"`` and ``"varilla"`` bar keys and an optional ``"luz"``
+        span in m.
+        """
+        for label, ed in self.edits.items():
+            if label in section:
+                ed.setText(section[label])
+        if "luz" in section:
+            self.ed_luz.setText(section["luz"])
+        for key, cb in (("estribo", self.cb_estribo), ("varilla", self.cb_varilla)):
+            if key in section:
+                cb.blockSignals(True)
+                _select_bar(cb, section[key])
+                cb.blockSignals(False)
+        self.draw_section()
+        self.auto_design()
+
+    @property
+    def mn_corr(self):
+        return self.beam["mn"].astype(float)
+
+    @property
+    def mp_corr(self):
+        return self.beam["mp"].astype(float)
+
+    def _calc_as_req(self, Mu, fc, b, d, fy, phi):
+        """Calculate required steel area for one or several moments."""
+        return viga_core.as_required(Mu, fc, b, d, fy, phi)
+
+    def _section_params(self):
+        """Return the parsed section inputs, or None if any is invalid.
+
+        Valid inputs are also stored in ``self.beam``.
+        """
+        try:
+            values = [float(ed.text()) for ed in self.edits.values()]
+        except ValueError:
+            return None
+        estribo = self.cb_estribo.currentText()
+        varilla = self.cb_varilla.currentText()
+        for key, value in zip(viga_modelo.SECTION_FIELDS, values):
+            self.beam[key] = value
+        self.beam["de"] = viga_modelo.BAR_CODE.get(estribo, 0)
+        self.beam["db"] = viga_modelo.BAR_CODE.get(varilla, 0)
+        return (*values, DIAM_CM.get(estribo, 0), DIAM_CM.get(varilla, 0))
+
+    @viga_instr.timed()
+    def _required_areas(self):
+        params = self._section_params()
+        if params is None:
+            return np.zeros(3), np.zeros(3)
+
+        # Las áreas requeridas solo dependen de la sección: se guardan por
+        # sus parámetros y los rótulos se reescriben solo si estos cambian.
+        cached = self._req_cache.get(params)
+        if cached is None:
+            b, h, r, fc, fy, phi, de, db = params
+            d = viga_core.effective_depth(h, r, de, db)
+            as_n, as_p, as_min, as_max = viga_core.required_areas(
+                self.mn_corr, self.mp_corr, b, d, fc, fy, phi
+            )
+            if len(self._req_cache) >= 32:
+                self._req_cache.clear()
+            cached = self._req_cache[params] = (
+                as_n, as_p, float(as_min), float(as_max)
+            )
+        as_n, as_p, self.as_min, self.as_max = cached
+        if params != self._req_key:
+            self._req_key = params
+            self.as_min_label.setText(f"{self.as_min:.2f}")
+            self.as_max_label.setText(f"{self.as_max:.2f}")
+
+        return as_n, as_p
+
+    def _calc_as_limits(self, fc, fy, b, d):
+        as_min, as_max = viga_core.as_limits(fc, fy, b, d)
+        return float(as_min), float(as_max)
+
+    def _build_ui(self):
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QGridLayout(central)
+
+        labels = [
+            ("b (cm)", "30"),
+            ("h (cm)", "50"),
+            ("r (cm)", "4"),
+            ("f'c (kg/cm²)", "210"),
+            ("fy (kg/cm²)", "4200"),
+            ("φ", "0.9"),
+        ]
+
+        self.edits = {}
+        for row, (text, val) in enumerate(labels):
+            layout.addWidget(QLabel(text), row, 0)
+            ed = QLineEdit(val)
+            ed.setAlignment(Qt.AlignRight)
+            ed.setFixedWidth(70)
+            layout.addWidget(ed, row, 1)
+            self.edits[text] = ed
+
+        # Combos para diámetro de estribo y de varilla
+        estribo_opts = ["8mm", "3/8\"", "1/2\""]
+        layout.addWidget(QLabel("ϕ estribo"), len(labels), 0)
+        self.cb_estribo = QComboBox(); self.cb_estribo.addItems(estribo_opts)
+        self.cb_estribo.setCurrentText('3/8"')
+        layout.addWidget(self.cb_estribo, len(labels), 1)
+
+        varilla_opts = ["1/2\"", "5/8\"", "3/4\"", "1\""]
+        layout.addWidget(QLabel("ϕ varilla"), len(labels)+1, 0)
+        self.cb_varilla = QComboBox(); self.cb_varilla.addItems(varilla_opts)
+        self.cb_varilla.setCurrentText('5/8"')
+        layout.addWidget(self.cb_varilla, len(labels)+1, 1)
+
+        qty_opts = [""] + [str(i) for i in range(1, 11)]
+        dia_opts = ["", "1/2\"", "5/8\"", "3/4\"", "1\""]
+
+        pos_labels = ["M1-", "M2-", "M3-", "M1+", "M2+", "M3+"]
+        self.qty1_boxes, self.dia1_boxes = [], []
+        self.qty2_boxes, self.dia2_boxes = [], []
+        self.as_total_labels = []
+
+        self.combo_grid = QGridLayout()
+
+        for i, label in enumerate(pos_labels):
+            row = 0 if i < 3 else 1
+            col = i % 3
+
+            q1 = QComboBox(); q1.addItems(qty_opts); q1.setCurrentIndex(0)
+            d1 = QComboBox(); d1.addItems(dia_opts); d1.setCurrentIndex(0)
+            q2 = QComboBox(); q2.addItems(qty_opts); q2.setCurrentIndex(0)
+            d2 = QComboBox(); d2.addItems(dia_opts); d2.setCurrentIndex(0)
+            lbl = QLabel("0.00")
+
+            cell = QGridLayout()
+            cell.addWidget(QLabel(label), 0, 0, 1, 2, alignment=Qt.AlignCenter)
+            cell.addWidget(q1, 1, 0)
+            cell.addWidget(d1, 1, 1)
+            cell.addWidget(q2, 2, 0)
+            cell.addWidget(d2, 2, 1)
+            cell.addWidget(lbl, 3, 0, 1, 2, alignment=Qt.AlignCenter)
+
+            self.combo_grid.addLayout(cell, row, col)
+
+            self.qty1_boxes.append(q1)
+            self.dia1_boxes.append(d1)
+            self.qty2_boxes.append(q2)
+            self.dia2_boxes.append(d2)
+            self.as_total_labels.append(lbl)
+
+        row_start = len(labels) + 2
+
+        layout.addWidget(QLabel("As total (cm²):"), row_start, 0)
+        self.as_total_label = QLabel("0.00")
+        layout.addWidget(self.as_total_label, row_start, 1)
+
+        layout.addWidget(QLabel("As min (cm²):"), row_start, 2)
+        self.as_min_label = QLabel("0.00")
+        layout.addWidget(self.as_min_label, row_start, 3)
+
+        layout.addWidget(QLabel("As max (cm²):"), row_start + 1, 2)
+        self.as_max_label = QLabel("0.00")
+        layout.addWidget(self.as_max_label, row_start + 1, 3)
+
+        layout.addWidget(QLabel("Base req. (cm):"), row_start, 4)
+        self.base_req_label = QLabel("-")
+        layout.addWidget(self.base_req_label, row_start, 5)
+        self.base_msg_label = QLabel("")
+        layout.addWidget(self.base_msg_label, row_start + 1, 4, 1, 2)
+
+        # Luz del tramo para los cortes de barras (viga_tramo)
+        layout.addWidget(QLabel("L (m):"), row_start, 6)
+        self.ed_luz = QLineEdit(f"{viga_tramo.DEFAULT_SPAN:g}")
+        self.ed_luz.setAlignment(Qt.AlignRight)
+        self.ed_luz.setFixedWidth(70)
+        layout.addWidget(self.ed_luz, row_start, 7)
+
+        self.fig_sec = Figure(figsize=(3, 3), constrained_layout=True)
+        self.ax_sec = self.fig_sec.subplots()
+        self.canvas_sec = FigureCanvas(self.fig_sec)
+        layout.addWidget(self.canvas_sec, 0, 2, len(labels) + 2, 4)
+        self.section_plot = viga_plots.SectionPlot(
+            self.ax_sec, viga_plots.BlitManager(self.canvas_sec)
+        )
+
+        self.fig_dist = Figure(figsize=(5, 6), constrained_layout=True)
+        self.ax_dist = self.fig_dist.subplots()
+        self.canvas_dist = FigureCanvas(self.fig_dist)
+        layout.addWidget(self.canvas_dist, row_start + 2, 0, 1, 8)
+        self.dist_plot = viga_plots.DistributionPlot(
+            self.ax_dist, viga_plots.BlitManager(self.canvas_dist)
+        )
+
+        layout.addLayout(self.combo_grid, row_start + 3, 0, 1, 8)
+
+        self.btn_capture = QPushButton("Capturar Diseño")
+        self.btn_memoria = QPushButton("Memoria de Cálculo")
+        self.btn_auto = QPushButton("Diseño Automático")
+        self.btn_optimo = QPushButton("Optimizar Sección")
+        self.btn_salir = QPushButton("Salir")
+
+        self.btn_capture.clicked.connect(self._capture_design)
+        self.btn_memoria.clicked.connect(self.show_memoria)
+        self.btn_auto.clicked.connect(self.auto_design)
+        self.btn_optimo.clicked.connect(self.optimize_section)
+        self.btn_salir.clicked.connect(QApplication.instance().quit)
+
+        layout.addWidget(self.btn_capture, row_start + 4, 0, 1, 2)
+        layout.addWidget(self.btn_memoria, row_start + 4, 2, 1, 2)
+        layout.addWidget(self.btn_auto,    row_start + 4, 4, 1, 2)
+        layout.addWidget(self.btn_salir,   row_start + 4, 6, 1, 2)
+        layout.addWidget(self.btn_optimo,  row_start + 1, 0, 1, 2)
+
+        for ed in list(self.edits.values()) + [self.ed_luz]:
+            ed.editingFinished.connect(self._redraw)
+        for cb in (self.cb_estribo, self.cb_varilla):
+            cb.currentIndexChanged.connect(self._redraw)
+
+        for pos, widgets in enumerate(zip(
+            self.qty1_boxes,
+            self.dia1_boxes,
+            self.qty2_boxes,
+            self.dia2_boxes,
+        )):
+            for w in widgets:
+                w.currentIndexChanged.connect(
+                    lambda _, pos=pos: self._mark_dirty(pos)
+                )
+
+        self.as_min = 0.0
+        self.as_max = 0.0
+        self.as_total = 0.0
+
+        # Estado incremental: áreas requeridas por sección y posiciones
+        # pendientes de recalcular; el armado vive en self.beam.
+        self._req_cache = {}
+        self._req_key = None
+        self._pos_key = None
+        self._pos = None
+        self._section_key = None
+        self.section_bars = (None, None)
+        self.span = None
+        self._dirty = set()
+        self._dirty_since = None
+        self.last_latency_ms = 0.0
+
+        self.draw_section()
+        self.update_design_as()
+
+    @viga_instr.timed()
+    def draw_section(self):
+        try:
+            b = float(self.edits["b (cm)"].text())
+            h = float(self.edits["h (cm)"].text())
+            r = float(self.edits["r (cm)"].text())
+            de = DIAM_CM.get(self.cb_estribo.currentText(), 0)
+            db = DIAM_CM.get(self.cb_varilla.currentText(), 0)
+        except ValueError:
+            return
+
+        self.section_plot.update(b, h, r, de, db, *self.section_bars)
+
+    def _redraw(self):
+        # update_design_as redibuja también la sección con sus capas
+        self.update_design_as()
+
+    @viga_instr.timed()
+    def draw_distribution(self, req_n, req_p, des_n, des_p, util=None,
+                          span=None):
+        """Show required and design As on a single graph.
+
+        ``util`` are the six demand/capacity ratios shown as utilization;
+        ``span`` is ``(req, prov)`` from ``viga_tramo.span_design``, drawn
+        as the steel envelope along the span.
+        """
+        self.dist_plot.update(req_n, req_p, des_n, des_p, util, span)
+
+    def _mark_dirty(self, pos):
+        """Queue position ``pos`` and coalesce updates into one per tick."""
+        if not self._dirty:
+            self._dirty_since = time.perf_counter()
+            QTimer.singleShot(0, self._flush_updates)
+        self._dirty.add(pos)
+
+    def _flush_updates(self):
+        if not self._dirty:
+            return
+        positions, self._dirty = sorted(self._dirty), set()
+        self.update_design_as(positions, started=self._dirty_since)
+
+    def _read_position(self, pos):
+        """Store the bars selected in the combos of ``pos`` in ``self.beam``."""
+        q1, d1 = self.qty1_boxes[pos], self.dia1_boxes[pos]
+        q2, d2 = self.qty2_boxes[pos], self.dia2_boxes[pos]
+        try:
+            n1 = int(q1.currentText()) if q1.currentText() else 0
+        except ValueError:
+            n1 = 0
+        try:
+            n2 = int(q2.currentText()) if q2.currentText() else 0
+        except ValueError:
+            n2 = 0
+        code = viga_modelo.BAR_CODE
+        self.beam["n1"][pos] = n1
+        self.beam["c1"][pos] = code.get(d1.currentText(), 0)
+        self.beam["n2"][pos] = n2
+        self.beam["c2"][pos] = code.get(d2.currentText(), 0)
+
+    def _show_layout(self):
+        """Set the bar combos from the layout stored in ``self.beam``."""
+        beam = self.beam
+        boxes = zip(
+            self.qty1_boxes, self.dia1_boxes, self.qty2_boxes, self.dia2_boxes
+        )
+        for i, (q1, d1, q2, d2) in enumerate(boxes):
+            values = (
+                str(beam["n1"][i]) if beam["n1"][i] else "",
+                viga_modelo.BAR_KEYS[beam["c1"][i]],
+                str(beam["n2"][i]) if beam["n2"][i] else "",
+                viga_modelo.BAR_KEYS[beam["c2"][i]],
+            )
+            for cb, text in zip((q1, d1, q2, d2), values):
+                cb.blockSignals(True)
+                cb.setCurrentText(text)
+                cb.blockSignals(False)
+
+    @viga_instr.timed()
+    def update_design_as(self, positions=None, started=None):
+        """Recalculate designed As for ``positions`` (all by default).
+
+        Only those positions are re-read, relabelled and rechecked: their
+        bar layers, d at the layer centroid, As req with that d, φMn and
+        D/C are recomputed and the other positions keep the values of the
+        previous call. Everything is recomputed when the section changes.
+        Totals, the base check, the span envelope and the distribution plot
+        are refreshed once per call; the section is redrawn only if the
+        bars it shows changed.
+        """
+        started = started or time.perf_counter()
+        params = self._section_params()
+        if positions is None or params is None or params != self._pos_key:
+            positions = range(viga_modelo.N_POSITIONS)
+            self._dirty.clear()
+        positions = list(positions)
+
+        as_req_n, as_req_p = self._required_areas()
+        for i in positions:
+            self._read_position(i)
+        totals = viga_modelo.layout_areas(self.beam)
+
+        beam = self.beam
+        self.span = None
+        if params is None:
+            self._pos_key = None
+            self.phi_mn = self.dc = self.layers = None
+            self.section_bars = (None, None)
+            as_reqs = np.concatenate([as_req_n, as_req_p])
+            self.base_req_label.setText("-")
+            self.base_msg_label.setText("")
+        else:
+            if params != self._pos_key:
+                self._pos_key = params
+                self._pos = self._empty_positions()
+            pos = self._pos
+            self._design_positions(
+                np.array(positions), params,
+                np.concatenate([as_req_n, as_req_p]))
+            as_reqs = pos["as_req"]
+            as_req_n, as_req_p = as_reqs[:3], as_reqs[3:]
+            self.layers, self.phi_mn, self.dc = (
+                pos["layers"], pos["phi_mn"], pos["dc"])
+
+            # Base: ancho de la capa más llena (la primera) del armado
+            self.base_req_label.setText(f"{pos['width'].max():.1f}")
+            n_layers = int(self.layers.max())
+            if n_layers > viga_core.MAX_LAYERS:
+                self.base_msg_label.setText(viga_barras.NO_FIT)
+            elif n_layers > 1:
+                self.base_msg_label.setText(f"OK en {n_layers} capas")
+            else:
+                self.base_msg_label.setText("OK")
+
+            # Sección dibujada con el armado más cargado de cada cara
+            i_n = int(np.argmax(totals[:3]))
+            i_p = 3 + int(np.argmax(totals[3:]))
+            self.section_bars = tuple(
+                (pos["k1"][i], pos["d1"][i], pos["k2"][i], pos["d2"][i])
+                if totals[i] else None
+                for i in (i_p, i_n)
+            )
+
+            # Acero requerido y colocado a lo largo del tramo, con los
+            # cortes de cada grupo de barras
+            b_val, h, r, fc, fy, phi, de, db = params
+            luz = self._span_length()
+            if luz is not None:
+                self.span = viga_tramo.span_design(
+                    self.mn_corr, self.mp_corr, b_val, h, r, fc, fy, phi, de,
+                    viga_core.effective_depth(h, r, de, db), beam["n1"],
+                    beam["c1"], beam["n2"], beam["c2"], luz, curves=True,
+                )
+
+        for i in positions:
+            status = "OK" if totals[i] >= as_reqs[i] else "NO OK"
+            self.as_total_labels[i].setText(f"{totals[i]:.2f} {status}")
+
+        self.as_total = float(totals.sum())
+        overall_ok = bool(np.all(totals >= as_reqs))
+        ov_status = "OK" if overall_ok else "NO OK"
+        self.as_total_label.setText(f"{self.as_total:.2f} {ov_status}")
+
+        section_key = (params, tuple(
+            None if bars is None else tuple(np.hstack(bars).tolist())
+            for bars in self.section_bars))
+        if section_key != self._section_key:
+            self._section_key = section_key
+            self.draw_section()
+        envelope = None
+        if self.span is not None:
+            envelope = (self.span["req"][0], self.span["prov"][0])
+        self.draw_distribution(as_req_n, as_req_p, totals[:3], totals[3:],
+                               self.dc, envelope)
+
+        self.last_latency_ms = (time.perf_counter() - started) * 1000
+        if self.last_latency_ms > self.LATENCY_TARGET_MS:
+            self.statusBar().showMessage(
+                f"Actualización lenta: {self.last_latency_ms:.0f} ms "
+                f"(objetivo {self.LATENCY_TARGET_MS:.0f} ms)", 3000
+            )
+
+    @staticmethod
+    def _empty_positions():
+        """Per-position results of ``_design_positions`` for six positions."""
+        n, m = viga_modelo.N_POSITIONS, viga_core.MAX_LAYERS
+        pos = {key: np.zeros((n, m)) for key in ("k1", "k2")}
+        for key in ("d1", "d2", "d", "as_req", "phi_mn", "dc", "width"):
+            pos[key] = np.zeros(n)
+        pos["layers"] = np.zeros(n, dtype=int)
+        return pos
+
+    def _design_positions(self, idx, params, as_base):
+        """Recheck positions ``idx`` with d at the centroid of their layers.
+
+        ``as_base`` is the As req of the six positions with the design d;
+        it is kept where the bars do not fit. Results are stored in
+        ``self._pos``.
+        """
+        b_val, h, r, fc, fy, phi, de, db = params
+        beam, pos = self.beam, self._pos
+        n1, c1 = beam["n1"][idx], beam["c1"][idx]
+        n2, c2 = beam["n2"][idx], beam["c2"][idx]
+        d1, d2 = viga_modelo.BAR_DIAM[c1], viga_modelo.BAR_DIAM[c2]
+        a1, a2 = viga_modelo.BAR_AREA[c1], viga_modelo.BAR_AREA[c2]
+
+        # Barras repartidas en capas y d al centroide de las capas; el
+        # As requerido se vuelve a calcular con ese d
+        k1, k2, layers = viga_core.bar_layers(n1, d1, n2, d2, b_val, r, de)
+        d = viga_core.layers_depth(h, r, de, k1, d1, a1, k2, d2, a2)
+        d[layers > viga_core.MAX_LAYERS] = np.nan
+        mu = np.concatenate([self.mn_corr, self.mp_corr])[idx]
+        as_min, as_max = viga_core.as_limits(fc, fy, b_val, d)
+        as_d = np.clip(viga_core.as_required(mu, fc, b_val, d, fy, phi),
+                       as_min, as_max)
+
+        # φMn y D/C con el d de las capas
+        _, phi_mn, dc = viga_core.capacity_ratios(
+            mu, n1 * a1, d1, n2 * a2, d2, b_val, h, r, fc, fy, phi, de, d=d)
+
+        pos["k1"][idx], pos["k2"][idx] = k1, k2
+        pos["d1"][idx], pos["d2"][idx] = d1, d2
+        pos["layers"][idx], pos["d"][idx] = layers, d
+        pos["as_req"][idx] = np.where(np.isnan(d), as_base[idx], as_d)
+        pos["phi_mn"][idx], pos["dc"][idx] = phi_mn, dc
+        pos["width"][idx] = viga_core.base_required(
+            k1[:, 0], d1, k2[:, 0], d2, r, de)
+
+    def _span_length(self):
+        """Span length in m from the L input, or None if it is not valid."""
+        try:
+            luz = float(self.ed_luz.text())
+        except ValueError:
+            return None
+        return luz if luz > 0 else None
+
+    @viga_instr.timed()
+    def auto_design(self):
+        """Select the cheapest bars that cover As req and fit the section.
+
+        Positions that do not fit in one layer get bars of a single
+        diameter packed in several layers, checked with the layered d.
+        """
+        params = self._section_params()
+        if params is None:
+            QMessageBox.warning(self, "Error", "Datos num\u00e9ricos inv\u00e1lidos")
+            return
+        b, h, r, fc, fy, phi, de, _ = params
+        as_req_n, as_req_p = self._required_areas()
+        as_req = np.concatenate([as_req_n, as_req_p])
+        index = viga_barras.default_index()
+        ids = viga_barras.layered_lookup(
+            as_req, np.concatenate([self.mn_corr, self.mp_corr]),
+            b, h, r, fc, fy, phi, de, index,
+        )
+        viga_modelo.set_layout_from_index(self.beam, ids, index)
+        self._show_layout()
+        self.update_design_as()
+
+        pos_labels = ["M1-", "M2-", "M3-", "M1+", "M2+", "M3+"]
+        missing = [lbl for lbl, i in zip(pos_labels, ids) if i < 0]
+        if missing:
+            QMessageBox.warning(
+                self,
+                "Diseño automático",
+                f"Sin armado para {', '.join(missing)} ni en "
+                f"{viga_core.MAX_LAYERS} capas.\n{viga_barras.NO_FIT}.",
+            )
+
+    def optimize_section(self):
+        """Search the cheapest feasible b, h, f'c and bar and offer to apply it."""
+        import viga_optimo
+
+        params = self._section_params()
+        if params is None:
+            QMessageBox.warning(self, "Error", "Datos num\u00e9ricos inv\u00e1lidos")
+            return
+        _, _, r, _, fy, phi, de, _ = params
+        res = viga_optimo.optimize(
+            self.mn_corr, self.mp_corr, r=r, fy=fy, phi=phi, de=de
+        )
+        best = res["best"]
+        if best is None:
+            QMessageBox.warning(
+                self, "Optimizar sección",
+                f"Ninguna de las {res['candidates']} secciones de la malla "
+                "es factible."
+            )
+            return
+
+        def describe(c):
+            return (f"{c['b']:g}×{c['h']:g} cm, f'c = {c['fc']:g}, "
+                    f"Ø{c['bar']}: {c['concrete']:.3f} m³/m, "
+                    f"{c['steel']:.2f} kg/m")
+
+        lines = [
+            f"{res['feasible']} de {res['candidates']} secciones factibles",
+            f"Menor costo: {describe(best)}",
+            f"d = {best['d']:.2f} cm, costo = S/ {best['cost']:.2f} por m",
+            "",
+            "Frente de Pareto (concreto – acero):",
+        ] + [f"  {describe(c)}" for c in res["pareto"]]
+        reply = QMessageBox.question(
+            self, "Optimizar sección",
+            "\n".join(lines) + "\n\n¿Aplicar la sección de menor costo?",
+        )
+        if reply == QMessageBox.Yes:
+            self.set_section({
+                "b (cm)": f"{best['b']:g}",
+                "h (cm)": f"{best['h']:g}",
+                "f'c (kg/cm²)": f"{best['fc']:g}",
+                "varilla": best["bar"],
+            })
+
+    # The old draw_design_distribution method has been replaced by draw_distribution
+
+    def _capture_design(self):
+        pix = self.centralWidget().grab()
+        QGuiApplication.clipboard().setPixmap(pix)
+        QMessageBox.information(
+            self,
+            "Captura",
+            "Dise\u00f1o copiado al portapapeles.\nUsa Ctrl+V para pegar.",
+        )
+
+    def show_memoria(self):
+        try:
+            b = float(self.edits["b (cm)"].text())
+            h = float(self.edits["h (cm)"].text())
+            r = float(self.edits["r (cm)"].text())
+            fc = float(self.edits["f'c (kg/cm²)"].text())
+            fy = float(self.edits["fy (kg/cm²)"].text())
+            phi = float(self.edits["φ"].text())
+            de = DIAM_CM.get(self.cb_estribo.currentText(), 0)
+            db = DIAM_CM.get(self.cb_varilla.currentText(), 0)
+        except ValueError:
+            QMessageBox.warning(self, "Error", "Datos num\u00e9ricos inv\u00e1lidos")
+            return
+
+        d = h - r - de - 0.5 * db
+        as_req_n, as_req_p = self._required_areas()
+
+        lines = viga_memoria.memoria_lines(
+            b, h, r, d, self.as_min, self.as_max, self.mn_corr, self.mp_corr,
+            as_req_n, as_req_p,
+        )
+        if self.span is not None:
+            lines += viga_tramo.cut_lines(self.span, self.beam, 0)
+
+        text = "\n".join(lines)
+        QGuiApplication.clipboard().setText(text)
+        title = f"VIGA {int(b)}X{int(h)}"
+        QMessageBox.information(self, title, text + "\n\n(Copiado al portapapeles)")
+
+
+def run(argv):
+    """Abre la ventana de momentos y ejecuta el ciclo de eventos de Qt."""
+    app = QApplication(argv)
+    win = MomentApp()  # noqa: F841
+    return app.exec_()
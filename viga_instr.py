@@ -0,0 +1,270 @@
+"""Instrumentación opcional de las rutas críticas: contadores e histogramas.
+
+Se activa con la variable de entorno ``VIGA_INSTR`` (cualquier valor
+distinto de vacío o ``0``) y se decide una sola vez, al importar el módulo::
+
+    VIGA_INSTR=1 python viga2.0.py
+
+Desactivada, ``timed`` devuelve la misma función sin envolver, ``span`` un
+contexto vacío compartido y ``wrap`` no toca el objeto, de modo que las
+funciones decoradas cuestan exactamente lo mismo que sin instrumentar.
+
+Activada, cada llamada suma a su contador, a su tiempo total y a un
+histograma de tiempos en potencias de 2 (µs), y guarda un evento con su
+inicio y duración para el archivo de traza de Chrome (``chrome://tracing``
+o https://ui.perfetto.dev). Los eventos se limitan a ``MAX_EVENTS``; los
+contadores e histogramas no tienen límite.
+"""
+
+import collections
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+
+ENABLED = os.environ.get("VIGA_INSTR", "").strip() not in ("", "0")
+
+# Cubeta k: duraciones en [2**(k-1), 2**k) µs; la última acumula el resto
+N_BUCKETS = 28
+MAX_EVENTS = 200000
+
+_NULL = contextlib.nullcontext()
+# PID guardado (os.getpid es una llamada al sistema); se renueva tras fork
+_PID = [os.getpid()]
+
+
+def _after_fork():
+    _PID[0] = os.getpid()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork)
+
+
+class Recorder:
+    """Contadores, histogramas y eventos de tiempo de un proceso."""
+
+    def __init__(self, max_events=MAX_EVENTS):
+        self._lock = threading.Lock()
+        self.max_events = max_events
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # nombre -> [llamadas, total, mínimo, máximo, última] en ns
+            self.stats = {}
+            self.hist = {}
+            self.events = collections.deque(maxlen=self.max_events)
+            self.dropped = 0
+
+    def record(self, name, start_ns, dur_ns, tid=None):
+        """Registra una llamada de ``dur_ns`` ns iniciada en ``start_ns``."""
+        bucket = (dur_ns // 1000).bit_length()
+        if bucket >= N_BUCKETS:
+            bucket = N_BUCKETS - 1
+        tid = threading.get_ident() if tid is None else tid
+        with self._lock:
+            st = self.stats.get(name)
+            if st is None:
+                st = self.stats[name] = [0, 0, dur_ns, dur_ns, 0]
+                self.hist[name] = [0] * N_BUCKETS
+            st[0] += 1
+            st[1] += dur_ns
+            if dur_ns < st[2]:
+                st[2] = dur_ns
+            if dur_ns > st[3]:
+                st[3] = dur_ns
+            st[4] = dur_ns
+            self.hist[name][bucket] += 1
+            if len(self.events) == self.max_events:
+                self.dropped += 1
+            self.events.append((name, start_ns, dur_ns, _PID[0], tid))
+
+    def drain(self):
+        """Devuelve el estado acumulado y lo reinicia (para otros procesos)."""
+        with self._lock:
+            state = {
+                "stats": self.stats,
+                "hist": self.hist,
+                "events": list(self.events),
+                "dropped": self.dropped,
+            }
+        self.reset()
+        return state
+
+    def merge(self, state):
+        """Suma el estado de ``drain`` de otro proceso."""
+        with self._lock:
+            for name, (n, total, lo, hi, last) in state["stats"].items():
+                st = self.stats.get(name)
+                if st is None:
+                    self.stats[name] = [n, total, lo, hi, last]
+                    self.hist[name] = list(state["hist"][name])
+                    continue
+                st[0] += n
+                st[1] += total
+                st[2] = min(st[2], lo)
+                st[3] = max(st[3], hi)
+                st[4] = last
+                self.hist[name] = [
+                    a + b for a, b in zip(self.hist[name], state["hist"][name])
+                ]
+            free = self.max_events - len(self.events)
+            overflow = max(len(state["events"]) - free, 0)
+            self.dropped += state["dropped"] + overflow
+            self.events.extend(state["events"])
+
+    def snapshot(self):
+        """Resumen por nombre, ordenado por tiempo total (ms)."""
+        with self._lock:
+            items = [(name, list(st), list(self.hist[name]))
+                     for name, st in self.stats.items()]
+        out = {}
+        for name, (n, total, lo, hi, last), hist in sorted(
+                items, key=lambda item: -item[1][1]):
+            out[name] = {
+                "llamadas": n,
+                "total_ms": total / 1e6,
+                "media_ms": total / n / 1e6,
+                "min_ms": lo / 1e6,
+                "max_ms": hi / 1e6,
+                "ultima_ms": last / 1e6,
+                "p50_ms": _percentile(hist, n, 0.50),
+                "p99_ms": _percentile(hist, n, 0.99),
+                # Límite superior de cada cubeta en µs -> llamadas
+                "histograma_us": {
+                    str(1 << k): c for k, c in enumerate(hist) if c
+                },
+            }
+        return out
+
+    def trace_events(self):
+        """Eventos en el formato ``traceEvents`` de Chrome (µs)."""
+        with self._lock:
+            events = list(self.events)
+        return [
+            {"name": name, "cat": name.partition(".")[0], "ph": "X",
+             "ts": start / 1000, "dur": dur / 1000, "pid": pid, "tid": tid}
+            for name, start, dur, pid, tid in events
+        ]
+
+
+def _percentile(hist, n, q):
+    """Límite superior (ms) de la cubeta que contiene el cuantil ``q``."""
+    target = q * n
+    seen = 0
+    for k, count in enumerate(hist):
+        seen += count
+        if seen >= target:
+            return (1 << k) / 1000
+    return (1 << (len(hist) - 1)) / 1000
+
+
+RECORDER = Recorder()
+
+
+def _wrap(func, name):
+    record = RECORDER.record
+    clock = time.perf_counter_ns
+
+    @functools.wraps(func)
+    def timed_call(*args, **kwargs):
+        t0 = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(name, t0, clock() - t0)
+
+    return timed_call
+
+
+def timed(name=None):
+    """Decorador que mide cada llamada con el nombre ``name``.
+
+    Por defecto el nombre es ``módulo.función`` (o ``módulo.Clase.método``).
+    Desactivado devuelve la función original.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        return _wrap(func, name or f"{func.__module__}.{func.__qualname__}")
+    return decorate
+
+
+def span(name):
+    """Contexto que mide un bloque; desactivado es un contexto vacío."""
+    if not ENABLED:
+        return _NULL
+    return _span(name)
+
+
+@contextlib.contextmanager
+def _span(name):
+    t0 = time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        RECORDER.record(name, t0, time.perf_counter_ns() - t0)
+
+
+def wrap(obj, attr, name):
+    """Mide el método ``attr`` de la instancia ``obj`` (``canvas.draw``...).
+
+    El método envuelto se guarda como atributo de la instancia, por lo que
+    también cuenta las llamadas internas (``draw_idle``, ``paintEvent``).
+    """
+    if ENABLED:
+        setattr(obj, attr, _wrap(getattr(obj, attr), name))
+    return obj
+
+
+def collect(func, *args):
+    """Ejecuta ``func`` en otro proceso y devuelve ``(resultado, estado)``.
+
+    ``estado`` son los tiempos del proceso (ver ``Recorder.drain``), que el
+    proceso principal suma con ``merge``.
+    """
+    result = func(*args)
+    return result, RECORDER.drain()
+
+
+def merge(state):
+    RECORDER.merge(state)
+
+
+def reset():
+    RECORDER.reset()
+
+
+def snapshot():
+    return RECORDER.snapshot()
+
+
+def overlay_text(limit=3):
+    """Línea corta con las ``limit`` rutas de mayor tiempo total."""
+    parts = []
+    for name, st in list(snapshot().items())[:limit]:
+        short = name.split(".", 1)[1] if name.startswith("viga_") else name
+        parts.append(
+            f"{short} {st['llamadas']}× {st['ultima_ms']:.1f} ms "
+            f"(p99 {st['p99_ms']:.1f})"
+        )
+    return " · ".join(parts) or "sin mediciones"
+
+
+def dump_json(path):
+    """Guarda el resumen de ``snapshot`` como JSON."""
+    data = {"pid": os.getpid(), "eventos_descartados": RECORDER.dropped,
+            "rutas": snapshot()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, ensure_ascii=False)
+
+
+def dump_trace(path):
+    """Guarda los eventos como traza de Chrome (``chrome://tracing``)."""
+    data = {"traceEvents": RECORDER.trace_events(), "displayTimeUnit": "ms"}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
@@ -0,0 +1,277 @@
+"""Memoria de cálculo de proyectos completos en Markdown, HTML o DOCX.
+
+Cada viga tiene el mismo contenido que el botón *Memoria de Cálculo* de la
+ventana de diseño (``d``, ``As_min``, ``As_max`` y cada momento con su
+``As`` requerido), más el armado elegido por ``viga_barras`` con su φMn,
+su relación demanda/capacidad, su estado OK/NO OK y la verificación de
+base (con el número de capas cuando no cabe en una). El informe se genera
+viga por viga con generadores y se escribe a medida que avanza, por lo que
+la memoria no depende del tamaño del proyecto. No usa Qt ni matplotlib.
+
+El DOCX se arma con ``zipfile`` (WordprocessingML mínimo), sin dependencias
+externas.
+"""
+
+import argparse
+import html
+import os
+import sys
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+import viga_barras
+import viga_batch
+
+FORMATS = ("md", "html", "docx")
+
+TITLE = "Memoria de cálculo"
+POSITIONS = ("1-", "2-", "3-", "1+", "2+", "3+")
+TABLE_HEADER = ("Posición", "Mu (TN·m)", "As req (cm²)", "Armado",
+                "As (cm²)", "φMn (TN·m)", "D/C", "Estado")
+
+
+def memoria_lines(b, h, r, d, as_min, as_max, mn, mp, as_n, as_p):
+    """Líneas de texto de la memoria de una viga, como en la interfaz."""
+    lines = [
+        "Memoria de cálculo detallada",
+        f"b = {b:.2f} cm, h = {h:.2f} cm, r = {r:.2f} cm",
+        f"d = h - r - φ_estribo - 0.5 φ_barra = {d:.2f} cm",
+        "As = Mu / (φ fy d (1-0.59β_1))",
+        f"As_min = {as_min:.2f} cm²",
+        f"As_max = {as_max:.2f} cm²",
+        "Momentos y áreas requeridas:",
+    ]
+    for i, (mneg, mpos, asn, asp) in enumerate(zip(mn, mp, as_n, as_p), 1):
+        lines.append(f"M{i}- = {mneg:.2f} TN·m → As-req = {asn:.2f} cm²")
+        lines.append(f"M{i}+ = {mpos:.2f} TN·m → As+req = {asp:.2f} cm²")
+    return lines
+
+
+def iter_beams(chunks, index=None):
+    """Genera un diccionario por viga con el contenido de su memoria.
+
+    ``chunks`` son bloques como los de ``viga_batch.iter_chunks``; cada
+    bloque se diseña con ``viga_batch.design_chunk`` y se descarta antes de
+    leer el siguiente.
+    """
+    index = index or viga_barras.default_index()
+    for chunk in chunks:
+        res = viga_batch.design_chunk(chunk)
+        n = len(chunk["id"])
+        sec = {k: np.broadcast_to(chunk[k], (n,)) for k in ("b", "h", "r")}
+        ids = res["armado"]
+        ok_ids = np.maximum(ids, 0)
+        area = np.where(ids >= 0, index.area[ok_ids], 0.0)
+        labels = index.label_of(ids, res["capas"])
+        moments = np.hstack([res["mn_corr"], res["mp_corr"]])
+        as_req = np.hstack([res["as_n"], res["as_p"]])
+        status = np.where(res["ok"], "OK", "NO OK")
+        dc = np.where(np.isfinite(res["dc"]),
+                      np.char.mod("%.2f", res["dc"]), "—")
+        for i, beam_id in enumerate(chunk["id"]):
+            yield {
+                "id": beam_id,
+                "lines": memoria_lines(
+                    sec["b"][i], sec["h"][i], sec["r"][i], res["d"][i],
+                    res["as_min"][i], res["as_max"][i], res["mn_corr"][i],
+                    res["mp_corr"][i], res["as_n"][i], res["as_p"][i],
+                ),
+                "rows": [
+                    (f"M{p}", f"{m:.2f}", f"{a:.2f}", lab, f"{s:.2f}",
+                     f"{cap:.2f}", ratio, st)
+                    for p, m, a, lab, s, cap, ratio, st in zip(
+                        POSITIONS, moments[i], as_req[i], labels[i],
+                        area[i], res["phi_mn"][i], dc[i], status[i])
+                ],
+                "base": _base_text(ids[i], res["capas"][i],
+                                   res["base_req"][i]),
+                "ok": bool(np.all(status[i] == "OK")),
+            }
+
+
+def _base_text(ids, layers, width):
+    """Verificación de base del armado elegido, con sus capas si hay más de una.
+
+    ``width`` es el ancho (cm) de la capa más llena del armado.
+    """
+    if (ids < 0).any():
+        return f"Base: {viga_barras.NO_FIT}"
+    text = f"Base requerida = {width:.1f} cm → OK"
+    if layers.max() > 1:
+        text += f" en {layers.max()} capas"
+    return text
+
+
+def _beam_title(beam):
+    return f"Viga {beam['id']} — {'OK' if beam['ok'] else 'NO OK'}"
+
+
+def _md_cell(text):
+    """Texto de una celda de tabla Markdown: ``|`` y saltos de línea escapados."""
+    return " ".join(str(text).split("\n")).replace("|", "\\|")
+
+
+def _md_row(cells):
+    return "| " + " | ".join(_md_cell(c) for c in cells) + " |\n"
+
+
+def render_markdown(beams):
+    """Genera el informe en Markdown, una viga por vez."""
+    yield f"# {TITLE}\n"
+    for beam in beams:
+        yield f"\n## {_md_cell(_beam_title(beam))}\n\n"
+        yield "".join(f"{line}  \n" for line in beam["lines"])
+        yield "\n" + _md_row(TABLE_HEADER)
+        yield "|" + "---|" * len(TABLE_HEADER) + "\n"
+        yield "".join(_md_row(row) for row in beam["rows"])
+        yield f"\n{beam['base']}\n"
+
+
+def render_html(beams):
+    """Genera el informe en HTML, una viga por vez."""
+    yield (
+        "<!DOCTYPE html>\n<html lang=\"es\">\n<head><meta charset=\"utf-8\">"
+        f"<title>{TITLE}</title>\n<style>table{{border-collapse:collapse}}"
+        "td,th{border:1px solid #999;padding:2px 6px}"
+        ".nook{color:#b00}</style></head>\n<body>\n"
+        f"<h1>{TITLE}</h1>\n"
+    )
+    for beam in beams:
+        cls = "" if beam["ok"] else " class=\"nook\""
+        parts = [f"<h2{cls}>{html.escape(_beam_title(beam))}</h2>\n<p>"]
+        parts.append("<br>\n".join(html.escape(line) for line in beam["lines"]))
+        parts.append("</p>\n<table>\n<tr>")
+        parts += [f"<th>{html.escape(c)}</th>" for c in TABLE_HEADER]
+        parts.append("</tr>\n")
+        for row in beam["rows"]:
+            parts.append("<tr>" + "".join(
+                f"<td>{html.escape(c)}</td>" for c in row) + "</tr>\n")
+        parts.append(f"</table>\n<p>{html.escape(beam['base'])}</p>\n")
+        yield "".join(parts)
+    yield "</body>\n</html>\n"
+
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+_DOCX_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/'
+        'content-types"><Default Extension="rels" ContentType="application/'
+        'vnd.openxmlformats-package.relationships+xml"/><Default Extension='
+        '"xml" ContentType="application/xml"/><Override PartName="/word/'
+        'document.xml" ContentType="application/vnd.openxmlformats-'
+        'officedocument.wordprocessingml.document.main+xml"/></Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/'
+        '2006/relationships"><Relationship Id="rId1" Type="http://schemas.'
+        'openxmlformats.org/officeDocument/2006/relationships/officeDocument"'
+        ' Target="word/document.xml"/></Relationships>'
+    ),
+}
+
+
+def _w_par(text, bold=False, size=None):
+    props = ("<w:b/>" if bold else "") + (f'<w:sz w:val="{size}"/>' if size else "")
+    rpr = f"<w:rPr>{props}</w:rPr>" if props else ""
+    return (f'<w:p><w:r>{rpr}<w:t xml:space="preserve">{escape(text)}'
+            "</w:t></w:r></w:p>")
+
+
+def _w_row(cells, bold=False):
+    return "<w:tr>" + "".join(
+        f"<w:tc>{_w_par(c, bold)}</w:tc>" for c in cells) + "</w:tr>"
+
+
+def render_docx_xml(beams):
+    """Genera ``word/document.xml`` del informe DOCX, una viga por vez."""
+    yield (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        f'<w:document xmlns:w="{_W_NS}"><w:body>'
+        + _w_par(TITLE, bold=True, size=36)
+    )
+    borders = "".join(
+        f'<w:{side} w:val="single" w:sz="4" w:color="999999"/>'
+        for side in ("top", "left", "bottom", "right", "insideH", "insideV")
+    )
+    table_props = f"<w:tblPr><w:tblBorders>{borders}</w:tblBorders></w:tblPr>"
+    for beam in beams:
+        parts = [_w_par(_beam_title(beam), bold=True, size=28)]
+        parts += [_w_par(line) for line in beam["lines"]]
+        parts.append("<w:tbl>" + table_props + _w_row(TABLE_HEADER, bold=True))
+        parts += [_w_row(row) for row in beam["rows"]]
+        parts.append("</w:tbl>")
+        parts.append(_w_par(beam["base"]))
+        yield "".join(parts)
+    yield "<w:sectPr/></w:body></w:document>"
+
+
+def write_report(path, chunks, fmt=None):
+    """Escribe la memoria de todas las vigas de ``chunks`` en ``path``.
+
+    El formato se deduce de la extensión si no se indica. Devuelve el
+    número de vigas escritas.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato no soportado: {fmt}")
+
+    count = 0
+
+    def counted(beams):
+        nonlocal count
+        for beam in beams:
+            count += 1
+            yield beam
+
+    beams = counted(iter_beams(chunks))
+    if fmt == "docx":
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, content in _DOCX_PARTS.items():
+                zf.writestr(name, content)
+            with zf.open("word/document.xml", "w", force_zip64=True) as f:
+                for piece in render_docx_xml(beams):
+                    f.write(piece.encode("utf-8"))
+    else:
+        render = render_markdown if fmt == "md" else render_html
+        with open(path, "w", encoding="utf-8") as f:
+            for piece in render(beams):
+                f.write(piece)
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py memoria",
+        description="Memoria de cálculo de todas las vigas de un CSV.",
+    )
+    parser.add_argument("entrada", help="CSV con el cuadro de vigas")
+    parser.add_argument("salida", help="archivo .md, .html o .docx")
+    parser.add_argument("--formato", choices=FORMATS,
+                        help="formato de salida (por defecto según extensión)")
+    parser.add_argument(
+        "--bloque", type=viga_batch.positive_int, default=viga_batch.CHUNK_SIZE,
+        help=f"vigas por bloque (por defecto {viga_batch.CHUNK_SIZE})",
+    )
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    try:
+        with open(args.entrada, newline="", encoding="utf-8") as f:
+            n = write_report(args.salida,
+                             viga_batch.iter_chunks(f, args.bloque),
+                             args.formato)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"{n} vigas en {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Modelo compacto de vigas: un arreglo estructurado de NumPy por proyecto.
+
+Cada viga ocupa un registro de ``BEAM_DTYPE`` con sus momentos, su sección
+y el armado de las seis posiciones (M1-, M2-, M3-, M1+, M2+, M3+). Los
+diámetros no se guardan como texto sino como códigos ``uint8`` que indexan
+``BAR_KEYS`` (el orden de ``BAR_DATA``/``DIAM_CM``); el código 0 es "sin
+barra", de modo que ``BAR_AREA[código]`` y ``BAR_DIAM[código]`` valen 0
+donde no hay barras. Momentos y sección se guardan en ``float64``, de
+modo que el diseño desde el modelo da los mismos resultados que desde las
+columnas leídas del CSV; la memoria se ahorra en los códigos y el armado.
+
+Bytes por viga (``BEAM_DTYPE.itemsize``)::
+
+    mn, mp           6 × float64   48
+    sistema          uint8          1
+    b, h, r, fc,
+    fy, phi          6 × float64   48
+    de, db           2 × uint8      2
+    n1, c1, n2, c2   4 × 6 × uint8 24
+                                  ---
+                                  123
+
+Los identificadores de las vigas se guardan aparte (lista de textos).
+La ventana de diseño y ``viga_batch`` leen y escriben este modelo.
+"""
+
+import numpy as np
+
+from viga_core import BAR_DATA, DIAM_CM
+
+# Código 0: sin barra; los demás siguen el orden de BAR_DATA
+BAR_KEYS = ("",) + tuple(BAR_DATA)
+BAR_CODE = {key: code for code, key in enumerate(BAR_KEYS)}
+BAR_AREA = np.array([0.0] + [BAR_DATA[k] for k in BAR_KEYS[1:]])
+BAR_DIAM = np.array([0.0] + [DIAM_CM[k] for k in BAR_KEYS[1:]])
+
+SYSTEMS = ("dual1", "dual2")
+SECTION_FIELDS = ("b", "h", "r", "fc", "fy", "phi")
+LAYOUT_FIELDS = ("n1", "c1", "n2", "c2")
+N_POSITIONS = 6
+
+BEAM_DTYPE = np.dtype([
+    ("mn", "f8", 3),
+    ("mp", "f8", 3),
+    ("sys", "u1"),
+    ("b", "f8"),
+    ("h", "f8"),
+    ("r", "f8"),
+    ("fc", "f8"),
+    ("fy", "f8"),
+    ("phi", "f8"),
+    ("de", "u1"),
+    ("db", "u1"),
+    ("n1", "u1", N_POSITIONS),
+    ("c1", "u1", N_POSITIONS),
+    ("n2", "u1", N_POSITIONS),
+    ("c2", "u1", N_POSITIONS),
+])
+
+# Valores por defecto de la ventana de diseño
+DEFAULTS = {
+    "sys": SYSTEMS.index("dual2"),
+    "b": 30.0,
+    "h": 50.0,
+    "r": 4.0,
+    "fc": 210.0,
+    "fy": 4200.0,
+    "phi": 0.9,
+    "de": BAR_CODE['3/8"'],
+    "db": BAR_CODE['5/8"'],
+}
+
+# Tolerancia (cm) para reconocer un diámetro numérico de la tabla
+_DIAM_TOL = 0.005
+
+
+def new_beams(n):
+    """Arreglo de ``n`` vigas sin momentos ni armado, con la sección por defecto."""
+    beams = np.zeros(n, dtype=BEAM_DTYPE)
+    for key, value in DEFAULTS.items():
+        beams[key] = value
+    return beams
+
+
+def bar_code(value):
+    """Código de una clave de ``BAR_DATA`` (``''`` es 0) o de un diámetro en cm."""
+    code = BAR_CODE.get(value)
+    if code is not None:
+        return code
+    try:
+        cm = float(value)
+    except ValueError:
+        cm = np.nan
+    j = int(np.argmin(np.abs(BAR_DIAM[1:] - cm))) + 1
+    if not abs(BAR_DIAM[j] - cm) <= _DIAM_TOL:
+        raise ValueError(
+            f"Diámetro no disponible: {value} (use {', '.join(BAR_KEYS[1:])} "
+            f"o el diámetro en cm)")
+    return j
+
+
+def bar_codes(values):
+    """Códigos ``uint8`` de una secuencia de claves o diámetros."""
+    memo = {}
+    return np.array(
+        [memo[v] if v in memo else memo.setdefault(v, bar_code(v))
+         for v in values],
+        dtype=np.uint8,
+    )
+
+
+def system_codes(values):
+    """Códigos de sistema (0 ``dual1``, 1 ``dual2``) de una secuencia de textos.
+
+    Un texto que no esté en ``SYSTEMS`` es un ``ValueError``: tomarlo como
+    ``dual1`` daría un momento corregido menor que el de ``dual2``.
+    """
+    values = np.asarray(values, dtype=str)
+    bad = ~np.isin(values, SYSTEMS)
+    if bad.any():
+        raise ValueError(
+            f"Sistema desconocido: '{values[bad][0]}' "
+            f"(use {' o '.join(SYSTEMS)})")
+    return (values == "dual2").astype(np.uint8)
+
+
+def inputs(beams):
+    """Datos de entrada de ``viga_core.design_beams`` en ``float64``.
+
+    Devuelve un diccionario con las claves de ``viga_batch.INPUT_KEYS``;
+    ``de`` y ``db`` son diámetros en cm.
+    """
+    out = {
+        "mn": beams["mn"].astype(float),
+        "mp": beams["mp"].astype(float),
+        "sys_t": np.array(SYSTEMS)[beams["sys"]],
+    }
+    for key in SECTION_FIELDS:
+        out[key] = beams[key].astype(float)
+    out["de"] = BAR_DIAM[beams["de"]]
+    out["db"] = BAR_DIAM[beams["db"]]
+    return out
+
+
+def set_layout(beams, n1, c1, n2, c2):
+    """Escribe el armado ``(N, 6)`` (cantidades y códigos) en ``beams``."""
+    beams["n1"] = n1
+    beams["c1"] = c1
+    beams["n2"] = n2
+    beams["c2"] = c2
+
+
+def set_layout_from_index(beams, ids, index):
+    """Escribe en ``beams`` el armado de los índices ``ids`` de un ``BarIndex``.
+
+    ``ids`` es ``(N, 6)``; donde vale -1 (no cabe) la posición queda sin
+    barras.
+    """
+    ok = ids >= 0
+    safe = np.where(ok, ids, 0)
+    to_code = np.array([BAR_CODE[k] for k in index.keys] + [0], dtype=np.uint8)
+    set_layout(
+        beams,
+        np.where(ok, index.n1[safe], 0),
+        to_code[np.where(ok, index.c1[safe], -1)],
+        np.where(ok, index.n2[safe], 0),
+        to_code[np.where(ok, index.c2[safe], -1)],
+    )
+
+
+def layout_areas(beams):
+    """Área de acero diseñada (cm²) de cada posición, ``(..., 6)``."""
+    return (beams["n1"] * BAR_AREA[beams["c1"]]
+            + beams["n2"] * BAR_AREA[beams["c2"]])
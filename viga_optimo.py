@@ -0,0 +1,271 @@
+"""Dimensionamiento óptimo de la sección sobre una malla de candidatos.
+
+Para una viga con sus momentos corregidos se evalúan a la vez todas las
+secciones de una malla ``b × h × f'c × varilla`` con las mismas fórmulas de
+``viga_core`` que usa la ventana de diseño: peralte efectivo, ``As_min``,
+``As_max``, ``As`` requerido de las seis posiciones y verificación de base
+con las barras necesarias en una capa. Una sección es factible si en todas
+las posiciones el acero requerido existe y no supera ``As_max`` y si las
+barras caben en la base.
+
+El costo por metro lineal es concreto (``b·h`` por el precio del m³ según
+``f'c``) más acero (área colocada en las seis posiciones, promediada entre
+los tres puntos de control, por la densidad y el precio por kg). Además del
+mínimo se devuelve el frente de Pareto entre volumen de concreto y peso de
+acero, que no depende de los precios.
+
+La malla se recorre por bloques de ``BLOCK_SIZE`` candidatos, de modo que
+un millón de secciones se evalúa en una fracción de segundo con memoria
+acotada.
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+import viga_barras
+import viga_batch
+import viga_core
+from viga_core import BAR_DATA, DIAM_CM
+
+# Malla por defecto (cm, kg/cm² y claves de BAR_DATA)
+DEFAULT_GRID = {
+    "b": np.arange(20.0, 61.0, 5.0),
+    "h": np.arange(30.0, 91.0, 5.0),
+    "fc": np.array([210.0, 280.0, 350.0]),
+    "bar": viga_barras.BAR_KEYS,
+}
+
+# Precios de referencia: concreto por m³ según f'c y acero por kg (S/)
+CONCRETE_PRICE = {210.0: 380.0, 280.0: 420.0, 350.0: 470.0}
+STEEL_PRICE = 4.5
+STEEL_DENSITY = 7850.0  # kg/m³
+
+BLOCK_SIZE = 1 << 14
+
+
+def _concrete_prices(fc, prices):
+    """Precio por m³ de cada ``f'c`` de la malla."""
+    missing = [v for v in fc if float(v) not in prices]
+    if missing:
+        raise ValueError(
+            "Sin precio de concreto para f'c = "
+            + ", ".join(f"{v:g}" for v in missing))
+    return np.array([prices[float(v)] for v in fc])
+
+
+def evaluate(mn, mp, b, h, fc, bar_area, bar_diam, r=4.0, fy=4200.0,
+             phi=0.9, de=DIAM_CM['3/8"']):
+    """Evalúa secciones candidatas para los momentos ``mn``/``mp`` ``(3,)``.
+
+    ``b``, ``h``, ``fc``, ``bar_area`` y ``bar_diam`` son arreglos ``(C,)``
+    de los candidatos. Devuelve ``(d, as_prov, feasible)``: peralte
+    efectivo ``(C,)``, acero colocado por posición ``(C, 6)`` y
+    factibilidad ``(C,)``.
+    """
+    mu = np.abs(np.concatenate([mn, mp])) * 100000  # TN·m a kg·cm
+    d = viga_core.effective_depth(h, r, de, bar_diam)
+    as_min, as_max = viga_core.as_limits(fc, fy, b, d)
+
+    # Mismos términos que viga_core.as_required, calculados una vez por
+    # candidato y difundidos sobre las seis posiciones
+    fcbd = fc * b * d
+    term = 1.7 * fcbd / (2 * fy)
+    a = 2.89 * fcbd ** 2 / fy ** 2
+    k = 6.8 * fc * b / (phi * fy ** 2)
+    as_req = term[:, None] - 0.5 * np.sqrt(
+        np.maximum(a[:, None] - k[:, None] * mu, 0))
+
+    n_bars = np.ceil(np.maximum(as_req, as_min[:, None]) / bar_area[:, None])
+    as_prov = n_bars * bar_area[:, None]
+
+    # As requerido crece con el momento: la posición más cargada decide
+    # si la sección alcanza y cuántas barras deben caber en la base
+    root_max = a - k * mu.max()
+    as_gov = term - 0.5 * np.sqrt(np.maximum(root_max, 0))
+    n_gov = np.ceil(np.maximum(as_gov, as_min) / bar_area)
+    base = viga_core.base_required(n_gov, bar_diam, 0, 0, r, de)
+    feasible = (root_max >= 0) & (as_gov <= as_max) & (base <= b) & (d > 0)
+    return d, as_prov, feasible
+
+
+def pareto_front(x, y):
+    """Índices de los puntos no dominados al minimizar ``x`` e ``y``.
+
+    Ordenados por ``x`` creciente (e ``y`` decreciente).
+    """
+    order = np.lexsort((y, x))
+    ys = y[order]
+    best = np.minimum.accumulate(ys)
+    keep = np.ones(len(ys), dtype=bool)
+    keep[1:] = ys[1:] < best[:-1]
+    return order[keep]
+
+
+def optimize(mn, mp, grid=None, r=4.0, fy=4200.0, phi=0.9,
+             de=DIAM_CM['3/8"'], concrete_price=None,
+             steel_price=STEEL_PRICE, block=BLOCK_SIZE):
+    """Sección factible de menor costo y frente de Pareto de una viga.
+
+    ``mn``/``mp`` son los momentos corregidos ``(3,)`` en TN·m y ``grid``
+    un diccionario con ``b``, ``h``, ``fc`` y ``bar`` (ver
+    ``DEFAULT_GRID``). Devuelve un diccionario con ``best`` (``None`` si
+    ninguna sección es factible), ``pareto`` (lista de candidatos ordenada
+    por volumen de concreto), ``candidates`` y ``feasible``. Cada candidato
+    es un diccionario con ``b``, ``h``, ``fc``, ``bar``, ``d``,
+    ``concrete`` (m³/m), ``steel`` (kg/m) y ``cost`` (S/ por m).
+    """
+    grid = {**DEFAULT_GRID, **(grid or {})}
+    bs = np.asarray(grid["b"], dtype=float)
+    hs = np.asarray(grid["h"], dtype=float)
+    fcs = np.asarray(grid["fc"], dtype=float)
+    bars = tuple(grid["bar"])
+    c_price = _concrete_prices(fcs, concrete_price or CONCRETE_PRICE)
+    b_area = np.array([BAR_DATA[k] for k in bars])
+    b_diam = np.array([DIAM_CM[k] for k in bars])
+    mn = np.asarray(mn, dtype=float)
+    mp = np.asarray(mp, dtype=float)
+
+    shape = (len(bs), len(hs), len(fcs), len(bars))
+    total = int(np.prod(shape))
+    result = {"best": None, "pareto": [], "candidates": total, "feasible": 0}
+    # Por bloque se guardan solo su frente de Pareto (un punto dominado en
+    # su bloque también lo está en la malla completa) y su mínimo costo
+    kept = []
+    for start in range(0, total, block):
+        flat = np.arange(start, min(start + block, total))
+        ib, ih, ifc, ibar = np.unravel_index(flat, shape)
+        b, h = bs[ib], hs[ih]
+        d, as_prov, feasible = evaluate(
+            mn, mp, b, h, fcs[ifc], b_area[ibar], b_diam[ibar], r, fy, phi,
+            de)
+        if not feasible.any():
+            continue
+        concrete = (b * h * 1e-4)[feasible]
+        steel = (as_prov.sum(axis=1) / 3 * 1e-4 * STEEL_DENSITY)[feasible]
+        cost = concrete * c_price[ifc[feasible]] + steel * steel_price
+        result["feasible"] += len(cost)
+        rows = np.union1d(pareto_front(concrete, steel), [np.argmin(cost)])
+        kept.append(np.column_stack([
+            flat[feasible][rows], d[feasible][rows], concrete[rows],
+            steel[rows], cost[rows],
+        ]))
+    if not kept:
+        return result
+
+    flat, d, concrete, steel, cost = np.concatenate(kept).T
+    ib, ih, ifc, ibar = np.unravel_index(flat.astype(np.int64), shape)
+
+    def candidate(i):
+        return {
+            "b": float(bs[ib[i]]), "h": float(hs[ih[i]]),
+            "fc": float(fcs[ifc[i]]), "bar": bars[ibar[i]],
+            "d": float(d[i]), "concrete": float(concrete[i]),
+            "steel": float(steel[i]), "cost": float(cost[i]),
+        }
+
+    result["best"] = candidate(int(np.argmin(cost)))
+    result["pareto"] = [candidate(i) for i in pareto_front(concrete, steel)]
+    return result
+
+
+def _price(text):
+    """``FC=PRECIO`` de ``--precio-concreto`` como par ``(f'c, S/ por m³)``."""
+    fc, sep, price = text.partition("=")
+    try:
+        if not sep:
+            raise ValueError
+        pair = float(fc), float(price)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"se esperaba FC=PRECIO, por ejemplo 245=400: {text!r}") from None
+    if not (pair[0] > 0 and pair[1] >= 0):
+        raise argparse.ArgumentTypeError(f"valores inválidos: {text!r}")
+    return pair
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py optimo",
+        description="Sección de menor costo (concreto + acero) de cada viga "
+                    "de un CSV sobre una malla b × h × f'c × varilla.",
+    )
+    parser.add_argument("entrada", help="CSV con el cuadro de vigas")
+    parser.add_argument("salida", help="CSV con la sección óptima de cada viga")
+    parser.add_argument("--b", type=viga_batch.positive_float, nargs=3,
+                        metavar=("MIN", "MAX", "PASO"),
+                        help="rango de anchos en cm (por defecto 20 60 5)")
+    parser.add_argument("--h", type=viga_batch.positive_float, nargs=3,
+                        metavar=("MIN", "MAX", "PASO"),
+                        help="rango de peraltes en cm (por defecto 30 90 5)")
+    parser.add_argument("--fc", type=viga_batch.positive_float, nargs="+",
+                        help="resistencias f'c en kg/cm² (por defecto 210 280 350)")
+    parser.add_argument(
+        "--precio-concreto", type=_price, nargs="+", default=[],
+        metavar="FC=PRECIO",
+        help="S/ por m³ de otras resistencias, por ejemplo 245=400 (por "
+             "defecto " + ", ".join(f"{fc:g}={p:g}"
+                                    for fc, p in CONCRETE_PRICE.items()) + ")",
+    )
+    parser.add_argument("--precio-acero", type=float, default=STEEL_PRICE,
+                        help=f"S/ por kg (por defecto {STEEL_PRICE:g})")
+    args = parser.parse_args(argv)
+
+    grid = {}
+    for key in ("b", "h"):
+        rng = getattr(args, key)
+        if rng:
+            if rng[1] < rng[0]:
+                parser.error(f"--{key}: MAX debe ser mayor o igual que MIN")
+            grid[key] = np.arange(rng[0], rng[1] + rng[2] / 2, rng[2])
+    prices = {**CONCRETE_PRICE, **dict(args.precio_concreto)}
+    if args.fc:
+        missing = [fc for fc in args.fc if fc not in prices]
+        if missing:
+            parser.error(
+                "sin precio de concreto para f'c = "
+                + ", ".join(f"{fc:g}" for fc in missing)
+                + "; agréguelo con --precio-concreto FC=PRECIO")
+        grid["fc"] = args.fc
+
+    header = ["id", "b", "h", "fc", "varilla", "d", "concreto_m3_m",
+              "acero_kg_m", "costo_m", "factibles", "pareto"]
+    t0 = time.perf_counter()
+    n = 0
+    try:
+        with open(args.entrada, newline="", encoding="utf-8") as fin, \
+                open(args.salida, "w", newline="", encoding="utf-8") as fout:
+            writer = csv.writer(fout)
+            writer.writerow(header)
+            for chunk in viga_batch.iter_chunks(fin):
+                mn_c, mp_c = viga_core.correct_moments(
+                    chunk["mn"], chunk["mp"], chunk["sys_t"])
+                for i, beam_id in enumerate(chunk["id"]):
+                    res = optimize(
+                        mn_c[i], mp_c[i], grid, chunk["r"][i], chunk["fy"][i],
+                        chunk["phi"][i], chunk["de"][i], prices,
+                        args.precio_acero)
+                    best = res["best"]
+                    if best is None:
+                        writer.writerow([beam_id] + [""] * 8 + [0, 0])
+                    else:
+                        writer.writerow([
+                            beam_id, f"{best['b']:g}", f"{best['h']:g}",
+                            f"{best['fc']:g}", best["bar"], f"{best['d']:.2f}",
+                            f"{best['concrete']:.4f}", f"{best['steel']:.2f}",
+                            f"{best['cost']:.2f}", res["feasible"],
+                            len(res["pareto"]),
+                        ])
+                    n += 1
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"{n} vigas en {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
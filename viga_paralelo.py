@@ -0,0 +1,123 @@
+"""Diseño paralelo de proyectos grandes con un grupo de procesos.
+
+Reparte las vigas por piso o por bloques de tamaño fijo entre varios
+procesos. Cada proceso ejecuta el flujo completo de ``viga_core.design_beams``:
+corrección de momentos, acero requerido, límites y verificación de base.
+Los resultados se devuelven en el orden original de las vigas; las capas y
+la capacidad del armado (``viga_batch.finish_chunk``) se calculan una sola
+vez, en el proceso principal.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import viga_batch
+import viga_instr
+
+CHUNK_SIZE = 20000
+
+
+def partition(n, chunk_size=CHUNK_SIZE, story=None):
+    """Lista de arreglos de índices: uno por piso o por bloque de vigas."""
+    if story is None:
+        return [np.arange(i, min(i + chunk_size, n))
+                for i in range(0, n, chunk_size)]
+    _, inverse = np.unique(np.asarray(story), return_inverse=True)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.flatnonzero(np.diff(inverse[order])) + 1
+    return np.split(order, bounds)
+
+
+def new_pool(workers):
+    """Grupo de ``workers`` procesos para ``design_project`` e ``iter_designed``.
+
+    Con fork, cada proceso empieza sin los tiempos ya medidos aquí.
+    """
+    return ProcessPoolExecutor(max_workers=workers,
+                               initializer=viga_instr.reset)
+
+
+def design_project(project, workers=None, chunk_size=CHUNK_SIZE, story=None,
+                   pool=None, finish=True):
+    """Diseña todas las vigas de ``project`` repartidas en ``workers`` procesos.
+
+    ``project`` es un diccionario con las claves de ``viga_batch.INPUT_KEYS``
+    (como el que genera ``viga_batch.parse_chunk``); ``story`` opcional
+    agrupa el trabajo por piso. Con ``workers=1`` todo se calcula en el
+    proceso actual. ``pool`` (de ``new_pool``) reutiliza un grupo ya creado
+    en lugar de crear uno para esta llamada; con ``finish=False`` el
+    resultado queda sin ``viga_batch.finish_chunk``.
+    Devuelve el mismo diccionario que ``viga_core.design_beams`` para todas
+    las vigas en su orden original.
+    """
+    n = len(project["mn"])
+    if n == 0:
+        return viga_batch.design_chunk(project, finish)
+    workers = workers or os.cpu_count() or 1
+    parts = partition(n, chunk_size, story)
+    tasks = [viga_batch.take(project, idx) for idx in parts]
+
+    if pool is not None:
+        results = [_result(out) for out in pool.map(_design, tasks)]
+    elif workers == 1:
+        results = [viga_batch.design_chunk(task, finish=False)
+                   for task in tasks]
+    else:
+        with new_pool(workers) as pool:
+            results = [_result(out) for out in pool.map(_design, tasks)]
+    res = _merge(n, parts, results)
+    return viga_batch.finish_chunk(project, res) if finish else res
+
+
+def _design(task):
+    """``design_chunk`` sin ``finish_chunk`` en un proceso del grupo.
+
+    Devuelve también los tiempos del proceso si se miden.
+    """
+    if viga_instr.ENABLED:
+        return viga_instr.collect(viga_batch.design_chunk, task, False)
+    return viga_batch.design_chunk(task, finish=False), None
+
+
+def _result(out):
+    """Resultado de ``_design``; suma los tiempos del proceso al principal."""
+    res, state = out
+    if state is not None:
+        viga_instr.merge(state)
+    return res
+
+
+def _merge(n, parts, results):
+    """Reúne los resultados por partes en arreglos en el orden original."""
+    merged = {}
+    for key, value in results[0].items():
+        merged[key] = np.empty((n,) + np.shape(value)[1:], dtype=value.dtype)
+    for idx, res in zip(parts, results):
+        for key, value in res.items():
+            merged[key][idx] = value
+    return merged
+
+
+def iter_designed(chunks, workers=None, max_pending=None):
+    """Diseña en paralelo los bloques de ``chunks`` y los entrega en orden.
+
+    Mantiene a lo más ``max_pending`` bloques en vuelo (por defecto dos por
+    proceso) para que la memoria siga acotada al leer archivos enormes.
+    Genera pares ``(bloque, resultado)``; el armado se guarda en el
+    ``beams`` del bloque como en ``viga_batch.design_chunk``.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or 2 * workers
+    with new_pool(workers) as pool:
+        pending = []
+        for chunk in chunks:
+            task = {key: chunk[key] for key in viga_batch.INPUT_KEYS}
+            pending.append((chunk, pool.submit(_design, task)))
+            if len(pending) >= max_pending:
+                done, fut = pending.pop(0)
+                res = _result(fut.result())
+                yield done, viga_batch.finish_chunk(done, res)
+        for done, fut in pending:
+            yield done, viga_batch.finish_chunk(done, _result(fut.result()))
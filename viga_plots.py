@@ -0,0 +1,376 @@
+"""Gráficos reutilizables de momentos, sección y distribución de acero.
+
+Cada gráfico crea sus líneas y textos una sola vez y en cada ``update``
+solo cambia sus datos. Mientras los límites de los ejes no cambian, el
+lienzo se repinta con *blitting*: se restaura el fondo guardado y se
+dibujan únicamente los artistas animados. Solo depende de matplotlib, por
+lo que sirve igual para la interfaz Qt que para exportar con Agg.
+"""
+
+import numpy as np
+
+import viga_core
+import viga_instr
+from viga_core import STATIONS, X_CTRL
+
+
+class BlitManager:
+    """Repinta solo los artistas animados sobre un fondo guardado."""
+
+    def __init__(self, canvas):
+        # Con VIGA_INSTR se miden todos los dibujos completos y blits
+        viga_instr.wrap(canvas, 'draw', 'canvas.draw')
+        viga_instr.wrap(canvas, 'blit', 'canvas.blit')
+        self.canvas = canvas
+        self._background = None
+        self._artists = []
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def add(self, *artists):
+        for art in artists:
+            art.set_animated(True)
+            self._artists.append(art)
+
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        fig = self.canvas.figure
+        for art in self._artists:
+            fig.draw_artist(art)
+
+    @viga_instr.timed()
+    def refresh(self, full=False):
+        """Repinta el lienzo; ``full`` fuerza un dibujo completo."""
+        if full or self._background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self._background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+def _sticky_limits(current, lo, hi):
+    """Límites que solo cambian si los datos salen o quedan muy holgados.
+
+    Evita redibujar ejes y fondo en cada actualización: se conservan los
+    límites ``current`` mientras contengan a ``[lo, hi]`` y los datos usen
+    al menos el 60 % del rango.
+    """
+    span = hi - lo
+    if span <= 0:
+        return (lo - 1, hi + 1)
+    if current is not None:
+        c_lo, c_hi = current
+        if c_lo <= lo and hi <= c_hi and span >= 0.6 * (c_hi - c_lo):
+            return current
+    pad = 0.05 * span
+    return (lo - pad, hi + pad)
+
+
+class MomentPlot:
+    """Diagrama de momentos negativos y positivos de una viga.
+
+    Con ``hover=True`` registra una sola vez un manejador de movimiento del
+    ratón que muestra el momento de la estación más cercana en una única
+    anotación reutilizable.
+    """
+
+    def __init__(self, ax, blitter, style='-', labels=('Neg', 'Pos'),
+                 hover=False):
+        self.ax = ax
+        self.blitter = blitter
+        self._ylim = None
+        self.yn = self.yp = None
+        self._hover_key = None
+        ax.plot([0, 1.0], [0, 0], 'k-', lw=6)
+        (self.line_n,) = ax.plot([], [], 'b' + style, label=labels[0])
+        (self.line_p,) = ax.plot([], [], 'r' + style, label=labels[1])
+        # Líneas verticales en los extremos: azules (negativos) y rojas
+        # (positivos)
+        self.verticals = [
+            ax.plot([], [], c + style, lw=2)[0]
+            for c in ('b', 'b', 'r', 'r')
+        ]
+        self.texts_n = [ax.text(x, 0, '', ha='center', fontsize=8) for x in X_CTRL]
+        self.texts_p = [ax.text(x, 0, '', ha='center', fontsize=8) for x in X_CTRL]
+        self._format()
+        blitter.add(self.line_n, self.line_p, *self.verticals,
+                    *self.texts_n, *self.texts_p)
+
+        if hover:
+            self.readout = ax.annotate(
+                '', xy=(0, 0), xytext=(10, 10), textcoords='offset points',
+                fontsize=8, bbox=dict(boxstyle='round', fc='w', alpha=0.9),
+                arrowprops=dict(arrowstyle='->'), visible=False,
+            )
+            blitter.add(self.readout)
+            blitter.canvas.mpl_connect('motion_notify_event', self._on_move)
+
+    def _on_move(self, event):
+        if event.inaxes is not self.ax or self.yn is None \
+                or not self.line_n.get_visible():
+            if self.readout.get_visible():
+                self.readout.set_visible(False)
+                self._hover_key = None
+                self.blitter.refresh()
+            return
+
+        # Estación más cercana por búsqueda binaria y curva más próxima
+        i = int(np.searchsorted(STATIONS, event.xdata))
+        i = min(max(i, 1), len(STATIONS) - 1)
+        if event.xdata - STATIONS[i - 1] < STATIONS[i] - event.xdata:
+            i -= 1
+        curve = self.yn if abs(self.yn[i] - event.ydata) <= \
+            abs(self.yp[i] - event.ydata) else self.yp
+        if self._hover_key == (i, curve is self.yn):
+            return
+        self._hover_key = (i, curve is self.yn)
+
+        x, y = STATIONS[i], curve[i]
+        self.readout.xy = (x, y)
+        self.readout.set_text(f"x={x:.2f}, M={y:.2f} TN·m")
+        self.readout.set_visible(True)
+        self.blitter.refresh()
+
+    def _format(self):
+        ax = self.ax
+        ax.set_xlim(-0.02, 1.02)
+        ax.set_xticks([0, 0.5, 1.0])
+        ax.set_xticklabels(['Extremo I', 'Centro', 'Extremo II'], fontsize=9)
+        ax.set_ylabel('TN·m', fontsize=9)
+        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1), fontsize=8)
+
+    def set_visible(self, visible):
+        for art in (self.line_n, self.line_p, *self.verticals,
+                    *self.texts_n, *self.texts_p):
+            art.set_visible(visible)
+
+    @viga_instr.timed()
+    def update(self, mn, mp, refresh=True):
+        """Actualiza las curvas con los momentos ``mn`` y ``mp`` (3 valores)."""
+        y_n = np.asarray(mn, dtype=float)
+        y_p = -np.asarray(mp, dtype=float)
+        yn, yp = self.yn, self.yp = viga_core.moment_curves([y_n, y_p])
+        self._hover_key = None
+        self.line_n.set_data(STATIONS, yn)
+        self.line_p.set_data(STATIONS, yp)
+
+        for line, x, y in zip(self.verticals, (0.0, 1.0, 0.0, 1.0),
+                              (y_n[0], y_n[2], y_p[0], y_p[2])):
+            line.set_data([x, x], [0, y])
+        for txt, x, y in zip(self.texts_n, X_CTRL, y_n):
+            txt.set_position((x, y + np.sign(y) * 0.05))
+            txt.set_text(f"{y:.2f}")
+            txt.set_va('bottom' if y >= 0 else 'top')
+        for txt, x, y in zip(self.texts_p, X_CTRL, y_p):
+            txt.set_position((x, y - np.sign(y) * 0.05))
+            txt.set_text(f"{y:.2f}")
+            txt.set_va('top' if y <= 0 else 'bottom')
+        self.set_visible(True)
+
+        ylim = _sticky_limits(
+            self._ylim, min(yn.min(), yp.min(), 0), max(yn.max(), yp.max(), 0)
+        )
+        full = ylim != self._ylim
+        self._ylim = ylim
+        self.ax.set_ylim(*ylim)
+        if refresh:
+            self.blitter.refresh(full)
+        return full
+
+
+def layer_points(k1, d1, k2, d2, b, r, de):
+    """Centros de barras repartidas en capas (ver ``viga_core.bar_layers``).
+
+    ``k1``/``k2`` son las barras de cada grupo por capa para una posición.
+    Devuelve ``(x, y, diámetro)`` con ``y`` medido desde la cara
+    traccionada; en cada capa las barras mayores van en las esquinas.
+    """
+    d1 = d1 if np.sum(k1) else 0.0
+    d2 = d2 if np.sum(k2) else 0.0
+    pitch = max(d1, d2) + viga_core.LAYER_SPACING_CM
+    xs, ys, ds = [], [], []
+    for j, (n1, n2) in enumerate(zip(np.asarray(k1, int), np.asarray(k2, int))):
+        diam = np.array([d1] * n1 + [d2] * n2)
+        if not len(diam):
+            continue
+        if d2 > d1:
+            diam = diam[::-1]
+        # Barras mayores en los extremos y las demás al centro
+        diam = np.concatenate([diam[::2], diam[1::2][::-1]])
+        edge = r + de + max(d1, d2) / 2
+        x = np.linspace(edge, b - edge, len(diam)) if len(diam) > 1 else [b / 2]
+        xs.extend(x)
+        ys.extend(r + de + j * pitch + diam / 2)
+        ds.extend(diam)
+    return np.array(xs), np.array(ys), np.array(ds)
+
+
+class SectionPlot:
+    """Sección transversal con cotas de ``b``, ``h`` y ``d`` y sus barras."""
+
+    # Tamaño del marcador de barra (puntos por cm de diámetro)
+    BAR_SCALE = 3.0
+
+    def __init__(self, ax, blitter):
+        self.ax = ax
+        self.blitter = blitter
+        self._lims = None
+        ax.set_aspect('equal')
+        ax.axis('off')
+        (self.outline,) = ax.plot([], [], 'k-')
+        (self.cover,) = ax.plot([], [], 'r--')
+        arrow = dict(arrowstyle='<->')
+        self.dim_b = ax.annotate('', xy=(0, 0), xytext=(0, 0), arrowprops=arrow)
+        self.dim_h = ax.annotate('', xy=(0, 0), xytext=(0, 0), arrowprops=arrow)
+        self.dim_d = ax.annotate('', xy=(0, 0), xytext=(0, 0), arrowprops=arrow)
+        self.txt_b = ax.text(0, 0, 'b', ha='center', va='top')
+        self.txt_h = ax.text(0, 0, 'h', ha='right', va='center', rotation=90)
+        self.txt_d = ax.text(0, 0, 'd', ha='right', va='center', rotation=90)
+        self.bars = ax.scatter([], [], s=[], c='k')
+        blitter.add(self.outline, self.cover, self.dim_b, self.dim_h,
+                    self.dim_d, self.txt_b, self.txt_h, self.txt_d, self.bars)
+
+    @viga_instr.timed()
+    def update(self, b, h, r, de, db, bottom=None, top=None, refresh=True):
+        """Redibuja la sección.
+
+        ``bottom`` y ``top`` son opcionalmente las barras ``(k1, d1, k2,
+        d2)`` por capa de la cara inferior y superior (ver
+        ``layer_points``); con ``bottom`` la cota ``d`` llega al centroide
+        de sus capas.
+        """
+        y_d = r + de + 0.5 * db
+        xs, ys, ds = [], [], []
+        for bars, flip in ((bottom, False), (top, True)):
+            if bars is None:
+                continue
+            x, y, diam = layer_points(*bars, b, r, de)
+            if not flip and len(y):
+                y_d = float(np.average(y, weights=diam ** 2))
+            xs.append(x)
+            ys.append(h - y if flip else y)
+            ds.append(diam)
+        if xs:
+            self.bars.set_offsets(np.column_stack(
+                [np.concatenate(xs), np.concatenate(ys)]))
+            self.bars.set_sizes((np.concatenate(ds) * self.BAR_SCALE) ** 2)
+        else:
+            self.bars.set_offsets(np.empty((0, 2)))
+
+        self.outline.set_data([0, b, b, 0, 0], [0, 0, h, h, 0])
+        self.cover.set_data([r, b - r, b - r, r, r], [r, r, h - r, h - r, r])
+        for ann, xy, xytext in (
+            (self.dim_b, (0, -5), (b, -5)),
+            (self.dim_h, (-5, 0), (-5, h)),
+            (self.dim_d, (-2, h), (-2, y_d)),
+        ):
+            ann.xy = xy
+            ann.set_position(xytext)
+        self.txt_b.set_position((b / 2, -6))
+        self.txt_h.set_position((-6, h / 2))
+        self.txt_d.set_position((-3, (h + y_d) / 2))
+
+        lims = (b, h)
+        full = lims != self._lims
+        self._lims = lims
+        self.ax.set_xlim(-10, b + 10)
+        self.ax.set_ylim(-10, h + 10)
+        if refresh:
+            self.blitter.refresh(full)
+        return full
+
+
+class DistributionPlot:
+    """Áreas de acero requeridas y diseñadas en un solo gráfico.
+
+    Opcionalmente rotula cada posición con su utilización (relación
+    demanda/capacidad ``Mu / φMn`` del armado colocado) y dibuja la
+    envolvente de acero a lo largo del tramo: el ``As`` requerido y el
+    colocado en cada estación (ver ``viga_tramo.span_design``).
+    """
+
+    def __init__(self, ax, blitter):
+        self.ax = ax
+        self.blitter = blitter
+        self._ylim = None
+        ax.plot([0, 1], [0, 0], 'k-', lw=6)
+        (self.req_n,) = ax.plot(X_CTRL, [0] * 3, 'b-o', label='As req -')
+        (self.req_p,) = ax.plot(X_CTRL, [0] * 3, 'r-o', label='As req +')
+        (self.des_n,) = ax.plot(X_CTRL, [0] * 3, 'g--o', label='As dis -')
+        (self.des_p,) = ax.plot(X_CTRL, [0] * 3, 'm--o', label='As dis +')
+        zeros = np.zeros_like(STATIONS)
+        self.env_req = [
+            ax.plot(STATIONS, zeros, style, lw=1, label=label)[0]
+            for style, label in (('b:', 'As req (x)'),
+                                 ('r:', '_nolegend_'))
+        ]
+        self.env_prov = [
+            ax.plot(STATIONS, zeros, style, lw=1.5, alpha=0.6,
+                    drawstyle='steps-mid', label=label)[0]
+            for style, label in (('g-', 'As colocado (x)'),
+                                 ('m-', '_nolegend_'))
+        ]
+        ax.set_xlim(-0.05, 1.05)
+        ax.axis('off')
+        ax.legend(loc='upper left', bbox_to_anchor=(1.02, 1), fontsize=8)
+        # La envolvente se oculta después de la leyenda, que copia la
+        # visibilidad de cada línea
+        for line in self.env_req + self.env_prov:
+            line.set_visible(False)
+        self.util = [
+            ax.text(x, 0, '', ha='center', va=va, fontsize=8, visible=False)
+            for va in ('bottom', 'top') for x in X_CTRL
+        ]
+        blitter.add(self.req_n, self.req_p, self.des_n, self.des_p,
+                    *self.env_req, *self.env_prov, *self.util)
+
+    @viga_instr.timed()
+    def update(self, req_n, req_p, des_n, des_p, util=None, span=None,
+               refresh=True):
+        """``span`` es ``(req, prov)``, cada uno ``(2, estaciones)`` con la
+        cara negativa y la positiva, o None para ocultar la envolvente."""
+        req_n, req_p, des_n, des_p = (
+            np.asarray(v, dtype=float) for v in (req_n, req_p, des_n, des_p)
+        )
+        self.req_n.set_ydata(req_n)
+        self.req_p.set_ydata(-req_p)
+        self.des_n.set_ydata(des_n)
+        self.des_p.set_ydata(-des_p)
+        self._update_util(np.concatenate([des_n, -des_p]), util)
+
+        values = [req_n, req_p, des_n, des_p]
+        for lines, curves in zip((self.env_req, self.env_prov),
+                                 span if span is not None else (None, None)):
+            for line, sign, k in zip(lines, (1, -1), (0, 1)):
+                line.set_visible(curves is not None)
+                if curves is not None:
+                    line.set_ydata(sign * curves[k])
+                    values.append(curves[k])
+        max_val = max(np.abs(np.concatenate(values)).max(), 1)
+        # Se mantiene la escala mientras los datos quepan y ocupen al
+        # menos el 60 % de ella, para no repintar el fondo en cada cambio.
+        ylim = self._ylim
+        if ylim is None or not (0.6 * ylim[1] <= 1.2 * max_val <= ylim[1]):
+            ylim = (-1.2 * max_val, 1.2 * max_val)
+        full = ylim != self._ylim
+        self._ylim = ylim
+        self.ax.set_ylim(*ylim)
+        if refresh:
+            self.blitter.refresh(full)
+        return full
+
+    def _update_util(self, ys, util):
+        """Rótulos ``D/C`` junto al acero diseñado de las seis posiciones."""
+        if util is None:
+            for txt in self.util:
+                txt.set_visible(False)
+            return
+        for txt, x, y, u in zip(self.util, np.tile(X_CTRL, 2), ys, util):
+            txt.set_position((x, y))
+            # Redondeo hacia arriba: 100 % nunca oculta un D/C mayor que 1
+            txt.set_text(f"{np.ceil(u * 100):.0f}%" if np.isfinite(u) else "—")
+            txt.set_color('tab:green' if u <= 1 else 'tab:red')
+            txt.set_visible(True)
@@ -0,0 +1,148 @@
+"""Almacenamiento columnar de un proyecto de vigas ya diseñado.
+
+Guarda en arreglos de NumPy, una columna por dato, los momentos
+corregidos, las áreas requeridas y diseñadas, la base requerida, la mayor
+relación demanda/capacidad y el estado de cada viga, junto con los datos
+de entrada necesarios para reabrir una viga en la ventana de diseño. Los
+bloques se agregan a medida que llegan (por ejemplo desde
+``viga_workers.batch_job``) con capacidad que crece al doble, y ordenar o
+filtrar son operaciones sobre los arreglos que devuelven índices de filas.
+"""
+
+import numpy as np
+
+import viga_barras
+import viga_batch
+
+# Columnas numéricas de la tabla: (título, clave de resultado, columna)
+NUMERIC_COLUMNS = (
+    [(f"M{i}-", "mn_corr", i - 1) for i in (1, 2, 3)]
+    + [(f"M{i}+", "mp_corr", i - 1) for i in (1, 2, 3)]
+    + [(f"As{i}- req", "as_n", i - 1) for i in (1, 2, 3)]
+    + [(f"As{i}+ req", "as_p", i - 1) for i in (1, 2, 3)]
+    + [(f"As{i}- dis", "as_dis", i - 1) for i in (1, 2, 3)]
+    + [(f"As{i}+ dis", "as_dis", i + 2) for i in (1, 2, 3)]
+    + [("Base req", "base_req", None)]
+    + [("D/C máx", "dc_max", None)]
+)
+HEADERS = ["ID"] + [title for title, _, _ in NUMERIC_COLUMNS] + ["Estado"]
+
+# Datos de entrada por viga que se conservan para la ventana de diseño
+SECTION_KEYS = ("b", "h", "r", "fc", "fy", "phi", "de", "db")
+
+
+class ProjectData:
+    """Columnas de un proyecto: ``ids``, ``values`` ``(N, columnas)`` y ``ok``.
+
+    ``values`` está en orden de columnas (Fortran), de modo que cada
+    columna es contigua para ordenar y filtrar.
+    """
+
+    def __init__(self, capacity=1024):
+        self.n = 0
+        n_cols = len(NUMERIC_COLUMNS)
+        self._ids = np.empty(capacity, dtype=object)
+        self._values = np.empty((capacity, n_cols), order="F")
+        self._ok = np.empty(capacity, dtype=bool)
+        self._section = np.empty((capacity, len(SECTION_KEYS)))
+
+    def __len__(self):
+        return self.n
+
+    @property
+    def ids(self):
+        return self._ids[:self.n]
+
+    @property
+    def values(self):
+        return self._values[:self.n]
+
+    @property
+    def ok(self):
+        return self._ok[:self.n]
+
+    def _grow(self, needed):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("_ids", "_values", "_ok", "_section"):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype,
+                           order="F" if name == "_values" else "C")
+            new[:self.n] = old[:self.n]
+            setattr(self, name, new)
+
+    def append(self, chunk, res, index=None):
+        """Agrega un bloque de ``viga_batch`` y su resultado de ``design_chunk``."""
+        index = index or viga_barras.default_index()
+        m = len(chunk["id"])
+        self._grow(self.n + m)
+        rows = slice(self.n, self.n + m)
+
+        ids = res["armado"]
+        fits = ids >= 0
+        as_dis = np.where(fits, index.area[np.maximum(ids, 0)], 0.0)
+        data = dict(res, as_dis=as_dis, dc_max=res["dc"].max(axis=1))
+        for j, (_, key, col) in enumerate(NUMERIC_COLUMNS):
+            value = np.asarray(data[key])
+            self._values[rows, j] = value if col is None else value[:, col]
+
+        self._ids[rows] = chunk["id"]
+        self._ok[rows] = res["ok"].all(axis=1)
+        for j, key in enumerate(SECTION_KEYS):
+            self._section[rows, j] = np.broadcast_to(chunk[key], (m,))
+        self.n += m
+        return rows
+
+    def column(self, j):
+        """Columna ``j`` de la tabla (``HEADERS``) como arreglo."""
+        if j == 0:
+            return self.ids
+        if j == len(HEADERS) - 1:
+            return self.ok
+        return self.values[:, j - 1]
+
+    def order(self, rows, j, descending=False):
+        """``rows`` reordenadas por la columna ``j`` (orden estable)."""
+        key = self.column(j)[rows]
+        if key.dtype == object:
+            key = key.astype(str)
+        perm = np.argsort(key, kind="stable")
+        if descending:
+            perm = perm[::-1]
+        return rows[perm]
+
+    def select(self, only_no_ok=False, text=""):
+        """Índices de las vigas que pasan el filtro, en su orden original."""
+        mask = np.ones(self.n, dtype=bool)
+        if only_no_ok:
+            mask &= ~self.ok
+        if text:
+            mask &= np.char.find(self.ids.astype(str), text) >= 0
+        return np.flatnonzero(mask)
+
+    def beam(self, i):
+        """Datos de la viga ``i`` para la ventana de diseño.
+
+        Devuelve ``(mn_corr, mp_corr, section)`` con ``section`` un
+        diccionario con ``b``, ``h``, ``r``, ``fc``, ``fy``, ``phi``,
+        ``de`` y ``db``.
+        """
+        cols = {}
+        for j, (_, key, _) in enumerate(NUMERIC_COLUMNS):
+            cols.setdefault(key, j)
+        mn = self.values[i, cols["mn_corr"]:cols["mn_corr"] + 3]
+        mp = self.values[i, cols["mp_corr"]:cols["mp_corr"] + 3]
+        section = dict(zip(SECTION_KEYS, self._section[i].tolist()))
+        return mn.copy(), mp.copy(), section
+
+
+def load_csv(path, chunk_size=viga_batch.CHUNK_SIZE):
+    """Diseña todas las vigas de un CSV de ``lote`` en un ``ProjectData``."""
+    data = ProjectData()
+    with open(path, newline="", encoding="utf-8") as f:
+        for chunk in viga_batch.iter_chunks(f, chunk_size):
+            data.append(chunk, viga_batch.design_chunk(chunk))
+    return data
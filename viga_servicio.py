@@ -0,0 +1,498 @@
+"""Servicio HTTP local con las operaciones de diseño en JSON.
+
+Expone para otras herramientas (metrados, generadores de planos) la
+corrección de momentos E.060, el acero requerido, los límites y la
+selección de barras de ``viga_core``/``viga_barras`` sin abrir la
+interfaz. Usa solo la biblioteca estándar: un servidor ``asyncio`` con
+HTTP/1.1 mínimo y conexiones persistentes.
+
+Rutas (``POST`` con un objeto JSON; ``GET /salud`` para verificar)::
+
+    /corregir  {"mn": [3], "mp": [3], "sistema": "dual2"}
+    /areas     {"mn", "mp", "sistema", "b", "h", "r", "fc", "fy", "phi",
+                "estribo", "varilla", "corregido": false}
+    /limites   {"b", "h", "r", "fc", "fy", "estribo", "varilla"}
+    /barras    {"as_req": [...], "mu": [...] (opcional), "b", "h", "r",
+                "fc", "fy", "phi", "estribo"}
+
+Los datos de sección que falten toman los valores por defecto de
+``viga_batch.DEFAULTS``; ``estribo`` y ``varilla`` aceptan una clave como
+``3/8"`` o el diámetro en cm. Un ``id`` en la petición se devuelve en la
+respuesta.
+
+``/lote/<operación>`` aplica la operación a muchas vigas de forma
+vectorizada: con un arreglo JSON devuelve un arreglo, y con
+``Content-Type: application/x-ndjson`` (un objeto por línea) lee el cuerpo
+por partes y responde también NDJSON a medida que termina cada bloque, en
+el mismo orden. Los bloques se calculan en un grupo de procesos para que el
+bucle de eventos siga atendiendo las peticiones individuales. Una viga con
+datos inválidos devuelve ``{"error": ...}`` en su lugar sin afectar al
+resto.
+
+Uso::
+
+    python viga2.0.py servicio --puerto 8060 --procesos 2
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import viga_barras
+import viga_batch
+import viga_core
+import viga_modelo
+
+DEFAULT_PORT = 8060
+
+# Bytes de NDJSON por bloque enviado a un proceso (unas 2000 vigas)
+BLOCK_BYTES = 1 << 18
+# Tamaño máximo de un cuerpo que se lee completo (peticiones que no son NDJSON)
+MAX_BODY = 64 << 20
+
+NDJSON = "application/x-ndjson"
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found",
+            405: "Method Not Allowed", 413: "Payload Too Large"}
+
+
+def _column(items, key):
+    default = viga_batch.DEFAULTS.get(key)
+    values = []
+    for item in items:
+        value = item.get(key, default)
+        if value is None:
+            raise ValueError(f"Falta el campo '{key}'")
+        values.append(value)
+    return values
+
+
+def _floats(items, key, width=None):
+    """Campo ``key`` de todas las vigas como arreglo ``(N,)`` o ``(N, width)``."""
+    try:
+        values = np.array(_column(items, key), dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' debe ser numérico") from None
+    expected = (len(items),) if width is None else (len(items), width)
+    if values.shape != expected:
+        if width is None:
+            raise ValueError(f"'{key}' debe ser un número")
+        raise ValueError(f"'{key}' debe tener {width} valores")
+    return values
+
+
+def _section(items, keys=viga_modelo.SECTION_FIELDS):
+    sec = {key: _floats(items, key) for key in keys}
+    for key, name in (("de", "estribo"), ("db", "varilla")):
+        codes = viga_modelo.bar_codes([str(v) for v in _column(items, name)])
+        sec[key] = viga_modelo.BAR_DIAM[codes]
+    return sec
+
+
+def _systems(items):
+    """Sistemas en minúsculas; ``ValueError`` si alguno no es de ``SYSTEMS``."""
+    sys_t = np.array([str(s).strip().lower() for s in _column(items, "sistema")])
+    viga_modelo.system_codes(sys_t)
+    return sys_t
+
+
+def _rows(items, **cols):
+    """Un diccionario por viga con las columnas ``cols`` (e ``id`` si vino)."""
+    names = list(cols)
+    values = [np.asarray(v).tolist() for v in cols.values()]
+    rows = [dict(zip(names, row)) for row in zip(*values)]
+    for item, row in zip(items, rows):
+        if "id" in item:
+            row["id"] = item["id"]
+    return rows
+
+
+def op_correct(items):
+    """Momentos corregidos según E.060."""
+    mn_c, mp_c = viga_core.correct_moments(
+        _floats(items, "mn", 3), _floats(items, "mp", 3), _systems(items))
+    return _rows(items, mn=mn_c, mp=mp_c)
+
+
+def op_areas(items):
+    """Peralte, límites y ``As`` requerido de los momentos (corregidos o no)."""
+    mn, mp = _floats(items, "mn", 3), _floats(items, "mp", 3)
+    corrected = np.array([bool(item.get("corregido", False)) for item in items])
+    if not corrected.all():
+        mn_c, mp_c = viga_core.correct_moments(mn, mp, _systems(items))
+        mn = np.where(corrected[:, None], mn, mn_c)
+        mp = np.where(corrected[:, None], mp, mp_c)
+    s = _section(items)
+    d = viga_core.effective_depth(s["h"], s["r"], s["de"], s["db"])
+    as_n, as_p, as_min, as_max = viga_core.required_areas(
+        mn, mp, s["b"], d, s["fc"], s["fy"], s["phi"])
+    return _rows(items, mn=mn, mp=mp, d=d, as_min=as_min, as_max=as_max,
+                 as_n=as_n, as_p=as_p)
+
+
+def op_limits(items):
+    """Peralte efectivo, ``As_min`` y ``As_max`` de la sección."""
+    s = _section(items)
+    d = viga_core.effective_depth(s["h"], s["r"], s["de"], s["db"])
+    as_min, as_max = viga_core.as_limits(s["fc"], s["fy"], s["b"], d)
+    return _rows(items, d=d, as_min=as_min, as_max=as_max)
+
+
+def op_bars(items):
+    """Armado más económico de cada ``As`` requerido.
+
+    Con ``mu`` (TN·m, uno por área) se verifica con el peralte de las barras
+    y se reparte en varias capas si no cabe en una, como en el diseño por
+    lotes; sin ``mu``, solo en una capa. En un lote todas las vigas deben
+    traer ``mu`` o ninguna.
+    """
+    with_mu = ["mu" in item for item in items]
+    if any(with_mu) and not all(with_mu):
+        raise ValueError("'mu' debe venir en todas las vigas del lote o en ninguna")
+    n_req = len(items[0].get("as_req") or ())
+    if not n_req:
+        raise ValueError("'as_req' debe ser una lista de áreas")
+    as_req = _floats(items, "as_req", n_req)
+    s = _section(items)
+    index = viga_barras.default_index()
+    if not all(with_mu):
+        bars = viga_barras.select_bars(
+            as_req, s["b"][:, None], s["r"][:, None], s["de"][:, None], index)
+        return _rows(items, armado=bars["label"], area=bars["area"],
+                     capas=(bars["n1"] > 0).astype(int))
+    mu = _floats(items, "mu", n_req)
+    col = {k: v[:, None] for k, v in s.items()}
+    ids = viga_barras.layered_lookup(
+        as_req, mu, col["b"], col["h"], col["r"], col["fc"], col["fy"],
+        col["phi"], col["de"], index)
+    layers, _ = index.depth(ids, col["b"], col["h"], col["r"], col["de"])
+    area = np.where(ids >= 0, index.area[np.maximum(ids, 0)], 0.0)
+    return _rows(items, armado=index.label_of(ids, layers), area=area,
+                 capas=layers)
+
+
+OPERATIONS = {
+    "corregir": op_correct,
+    "areas": op_areas,
+    "limites": op_limits,
+    "barras": op_bars,
+}
+
+
+def run_items(op, items):
+    """Aplica la operación ``op`` a una lista de objetos JSON.
+
+    Si el lote tiene datos inválidos se procesa viga por viga, de modo que
+    solo las inválidas devuelven ``{"error": ...}``.
+    """
+    if not items:
+        return []
+    try:
+        return OPERATIONS[op](items)
+    except (ValueError, TypeError, KeyError, IndexError) as exc:
+        if len(items) == 1:
+            row = {"error": str(exc)}
+            if "id" in items[0]:
+                row["id"] = items[0]["id"]
+            return [row]
+    return [row for item in items for row in run_items(op, [item])]
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+def _parse_lines(data):
+    """Objetos de un bloque NDJSON; las líneas inválidas quedan como error."""
+    items = []
+    for line in data.splitlines():
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            items.append("JSON inválido")
+            continue
+        if not isinstance(item, dict):
+            item = "Se esperaba un objeto JSON"
+        items.append(item)
+    return items
+
+
+def _run_parsed(op, items):
+    good = iter(run_items(op, [it for it in items if isinstance(it, dict)]))
+    return [next(good) if isinstance(it, dict) else {"error": it}
+            for it in items]
+
+
+def run_ndjson(op, data):
+    """Procesa un bloque NDJSON y devuelve las respuestas NDJSON (bytes).
+
+    Se ejecuta en los procesos del grupo: también el análisis y la
+    codificación JSON quedan fuera del bucle de eventos.
+    """
+    rows = _run_parsed(op, _parse_lines(data))
+    return "".join(_dumps(row) + "\n" for row in rows).encode("utf-8")
+
+
+def run_json(op, body):
+    """Procesa un arreglo JSON de vigas y devuelve el arreglo de respuestas."""
+    items = json.loads(body)
+    if not isinstance(items, list):
+        raise ValueError("Se esperaba un arreglo JSON")
+    items = [it if isinstance(it, dict) else "Se esperaba un objeto JSON"
+             for it in items]
+    return _dumps(_run_parsed(op, items)).encode("utf-8")
+
+
+def _warm():
+    viga_barras.default_index()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class DesignServer:
+    """Servidor HTTP con un grupo de ``workers`` procesos para los lotes."""
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Abre el socket y precarga los procesos; devuelve el ``asyncio.Server``."""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self.pool, _warm)
+                               for _ in range(self.workers)))
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.pool.shutdown(cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        """Atiende las peticiones de una conexión mientras siga abierta."""
+        try:
+            while True:
+                request = await _read_head(reader)
+                if request is None:
+                    break
+                method, path, version, headers = request
+                keep = (headers.get("connection", "").lower() != "close"
+                        and version == "HTTP/1.1")
+                body = _iter_body(reader, headers)
+                try:
+                    await self._dispatch(method, path, headers, body, writer)
+                except HTTPError as exc:
+                    _respond(writer, exc.status, {"error": str(exc)})
+                # Lo que quede del cuerpo se descarta antes de la siguiente
+                async for _ in body:
+                    pass
+                await writer.drain()
+                if not keep:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, headers, body, writer):
+        path = path.split("?", 1)[0].rstrip("/")
+        if path == "/salud":
+            _respond(writer, 200, {"estado": "ok", "procesos": self.workers})
+            return
+        batch = path.startswith("/lote/")
+        op = path[len("/lote/"):] if batch else path.lstrip("/")
+        if op not in OPERATIONS:
+            raise HTTPError(404, f"Ruta desconocida: {path}")
+        if method != "POST":
+            raise HTTPError(405, "Use POST")
+
+        ctype = headers.get("content-type", "").split(";")[0].strip().lower()
+        if batch and ctype == NDJSON:
+            await self._stream(op, body, writer)
+            return
+        body = await _read_body(body)
+        if batch:
+            loop = asyncio.get_running_loop()
+            try:
+                data = await loop.run_in_executor(self.pool, run_json, op, body)
+            except ValueError as exc:
+                raise HTTPError(400, str(exc)) from None
+            _respond_raw(writer, 200, data, "application/json")
+            return
+        try:
+            item = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "JSON inválido") from None
+        if not isinstance(item, dict):
+            raise HTTPError(400, "Se esperaba un objeto JSON")
+        row = run_items(op, [item])[0]
+        _respond(writer, 400 if "error" in row else 200, row)
+
+    async def _stream(self, op, chunks, writer):
+        """Lote NDJSON: bloques en los procesos y respuesta por partes.
+
+        Cada bloque se escribe en cuanto termina, en el orden de llegada.
+        Mientras se lee la petición no se espera a que el cliente consuma
+        la respuesta (clientes que primero envían todo y luego leen no se
+        bloquean); la cantidad de bloques en curso sí se limita.
+        """
+        loop = asyncio.get_running_loop()
+        pending = collections.deque()
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {NDJSON}\r\n"
+            "Transfer-Encoding: chunked\r\n\r\n".encode("latin-1"))
+
+        def submit(data):
+            pending.append(loop.run_in_executor(self.pool, run_ndjson, op, data))
+
+        async def write_next():
+            _write_chunk(writer, await pending.popleft())
+
+        buf = b""
+        async for data in chunks:
+            buf += data
+            if len(buf) >= BLOCK_BYTES:
+                cut = buf.rfind(b"\n") + 1
+                if cut:
+                    submit(buf[:cut])
+                    buf = buf[cut:]
+            while pending and (pending[0].done()
+                               or len(pending) >= 2 * self.workers):
+                await write_next()
+        if buf.strip():
+            submit(buf)
+        while pending:
+            await write_next()
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+
+
+async def _read_head(reader):
+    """Línea de petición y encabezados, o None si la conexión se cerró."""
+    line = await reader.readline()
+    if not line.strip():
+        return None
+    parts = line.decode("latin-1").split()
+    if len(parts) != 3:
+        raise ValueError("Petición HTTP inválida")
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return parts[0].upper(), parts[1], parts[2].upper(), headers
+
+
+async def _iter_body(reader, headers):
+    """Genera el cuerpo por partes (``Content-Length`` o ``chunked``)."""
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            data = await reader.readexactly(size)
+            await reader.readexactly(2)
+            yield data
+    else:
+        remaining = int(headers.get("content-length", 0))
+        while remaining > 0:
+            data = await reader.read(min(remaining, 1 << 16))
+            if not data:
+                raise asyncio.IncompleteReadError(b"", remaining)
+            remaining -= len(data)
+            yield data
+
+
+async def _read_body(chunks):
+    parts, size = [], 0
+    async for data in chunks:
+        size += len(data)
+        if size > MAX_BODY:
+            raise HTTPError(413, "Cuerpo demasiado grande; use NDJSON en /lote")
+        parts.append(data)
+    return b"".join(parts)
+
+
+def _respond(writer, status, obj):
+    _respond_raw(writer, status, _dumps(obj).encode("utf-8"), "application/json")
+
+
+def _respond_raw(writer, status, body, ctype):
+    writer.write(
+        f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: {ctype}; "
+        f"charset=utf-8\r\nContent-Length: {len(body)}\r\n\r\n"
+        .encode("latin-1") + body)
+
+
+def _write_chunk(writer, data):
+    if data:
+        writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+
+async def serve(host="127.0.0.1", port=DEFAULT_PORT, workers=None):
+    """Atiende peticiones hasta que se interrumpa el proceso.
+
+    ``SIGTERM`` cierra el servidor y el grupo de procesos ordenadamente.
+    """
+    server = DesignServer(workers)
+    try:
+        srv = await server.start(host, port)
+        try:
+            asyncio.get_running_loop().add_signal_handler(
+                signal.SIGTERM, srv.close)
+        except (NotImplementedError, AttributeError):
+            pass  # Windows
+        port = srv.sockets[0].getsockname()[1]
+        print(f"Servicio en http://{host}:{port} ({server.workers} procesos)",
+              file=sys.stderr, flush=True)
+        async with srv:
+            await srv.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py servicio",
+        description="Servicio HTTP local con las operaciones de diseño en JSON.",
+    )
+    parser.add_argument("--host", default="127.0.0.1",
+                        help="dirección de escucha (por defecto 127.0.0.1)")
+    parser.add_argument(
+        "--puerto", type=int, default=DEFAULT_PORT,
+        help=f"puerto; 0 elige uno libre (por defecto {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--procesos", type=int, default=0,
+        help="procesos para los lotes; 0 usa todos los núcleos (por defecto 0)",
+    )
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.puerto, args.procesos or None))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Vista de proyecto: tabla virtual de todas las vigas sobre ``ProjectData``.
+
+``ProjectModel`` es un ``QAbstractTableModel`` que no crea un elemento por
+celda: la vista solo pide el texto de las celdas visibles y el modelo lo
+formatea desde los arreglos de ``viga_proyecto.ProjectData``. Ordenar y
+filtrar cambian solo el arreglo de índices de filas visibles. Doble clic en
+una fila abre la ventana de diseño de esa viga.
+"""
+
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import (
+    QCheckBox, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QMainWindow,
+    QTableView, QVBoxLayout, QWidget,
+)
+
+import viga_proyecto
+from viga_core import DIAM_CM
+from viga_proyecto import HEADERS
+
+NO_OK_BRUSH = QBrush(QColor(255, 220, 220))
+ROW_HEIGHT = 22
+
+_ROLES = frozenset((Qt.DisplayRole, Qt.TextAlignmentRole, Qt.BackgroundRole))
+_ALIGN_RIGHT = int(Qt.AlignRight | Qt.AlignVCenter)
+_LAST_COL = len(HEADERS) - 1
+
+
+class ProjectModel(QAbstractTableModel):
+    """Modelo de tabla de solo lectura sobre un ``ProjectData``."""
+
+    def __init__(self, data=None, parent=None):
+        super().__init__(parent)
+        self.project = data if data is not None else viga_proyecto.ProjectData()
+        self.rows = np.arange(len(self.project))
+        self._sort = None
+        self._filter = (False, "")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        # La vista pide muchos roles por celda; los que no se usan salen
+        # antes de tocar los arreglos
+        if role not in _ROLES or not index.isValid():
+            return None
+        col = index.column()
+        if role == Qt.TextAlignmentRole:
+            return _ALIGN_RIGHT if 0 < col < _LAST_COL else None
+        i = self.rows[index.row()]
+        if role == Qt.BackgroundRole:
+            return None if self.project.ok[i] else NO_OK_BRUSH
+        if col == 0:
+            return str(self.project.ids[i])
+        if col == _LAST_COL:
+            return "OK" if self.project.ok[i] else "NO OK"
+        return f"{self.project.values[i, col - 1]:.2f}"
+
+    def beam_index(self, row):
+        """Índice en ``ProjectData`` de la fila visible ``row``."""
+        return int(self.rows[row])
+
+    def _view_rows(self):
+        rows = self.project.select(*self._filter)
+        if self._sort is not None:
+            rows = self.project.order(rows, *self._sort)
+        return rows
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self._sort = (column, order == Qt.DescendingOrder)
+        self.rows = self._view_rows()
+        self.layoutChanged.emit()
+
+    def set_filter(self, only_no_ok=False, text=""):
+        self.beginResetModel()
+        self._filter = (only_no_ok, text)
+        self.rows = self._view_rows()
+        self.endResetModel()
+
+    def append(self, chunk, res):
+        """Agrega un bloque diseñado; sin orden ni filtro solo inserta filas."""
+        if self._sort is None and self._filter == (False, ""):
+            first = len(self.project)
+            self.beginInsertRows(QModelIndex(), first, first + len(chunk["id"]) - 1)
+            self.project.append(chunk, res)
+            self.rows = np.arange(len(self.project))
+            self.endInsertRows()
+        else:
+            self.project.append(chunk, res)
+            self.layoutAboutToBeChanged.emit()
+            self.rows = self._view_rows()
+            self.layoutChanged.emit()
+
+
+class ProjectWindow(QMainWindow):
+    """Ventana con la tabla del proyecto, filtro NO OK y búsqueda por ID."""
+
+    def __init__(self, data=None):
+        super().__init__()
+        self.setWindowTitle("Proyecto – Cuadro de vigas")
+        self.model = ProjectModel(data, self)
+        self.design_windows = []
+
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QVBoxLayout(central)
+        bar = QHBoxLayout()
+        self.cb_no_ok = QCheckBox("Solo NO OK")
+        self.search = QLineEdit()
+        self.search.setPlaceholderText("Buscar ID…")
+        self.count_label = QLabel()
+        bar.addWidget(self.cb_no_ok)
+        bar.addWidget(self.search)
+        bar.addStretch(1)
+        bar.addWidget(self.count_label)
+        layout.addLayout(bar)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSortingEnabled(True)
+        self.view.setSelectionBehavior(QTableView.SelectRows)
+        self.view.setWordWrap(False)
+        # Alto de fila fijo: la vista no mide el contenido de cada fila
+        vh = self.view.verticalHeader()
+        vh.setSectionResizeMode(QHeaderView.Fixed)
+        vh.setDefaultSectionSize(ROW_HEIGHT)
+        self.view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.view.horizontalHeader().setDefaultSectionSize(72)
+        self.view.doubleClicked.connect(self.open_design)
+        layout.addWidget(self.view)
+
+        self.cb_no_ok.toggled.connect(self._apply_filter)
+        self.search.textChanged.connect(self._apply_filter)
+        self.model.rowsInserted.connect(self._update_count)
+        self.model.modelReset.connect(self._update_count)
+        self.model.layoutChanged.connect(self._update_count)
+        self._update_count()
+        self.resize(1200, 700)
+
+    def _apply_filter(self):
+        self.model.set_filter(self.cb_no_ok.isChecked(), self.search.text())
+
+    def _update_count(self):
+        total = len(self.model.project)
+        bad = int((~self.model.project.ok).sum())
+        self.count_label.setText(
+            f"{self.model.rowCount()} de {total} vigas, {bad} NO OK")
+
+    def open_design(self, index):
+        """Abre la ventana de diseño de la viga de la fila ``index``."""
+        from viga_gui import DesignWindow
+
+        i = self.model.beam_index(index.row())
+        mn, mp, section = self.model.project.beam(i)
+        win = DesignWindow(mn, mp, section=_section_texts(section))
+        win.setWindowTitle(
+            f"Parte 2 – Diseño de Acero – {self.model.project.ids[i]}")
+        win.show()
+        self.design_windows.append(win)
+        return win
+
+
+def _section_texts(section):
+    """Datos de sección como los textos de los campos de ``DesignWindow``."""
+    def key_of(cm):
+        return min(DIAM_CM, key=lambda k: abs(DIAM_CM[k] - cm))
+
+    return {
+        "b (cm)": f"{section['b']:g}",
+        "h (cm)": f"{section['h']:g}",
+        "r (cm)": f"{section['r']:g}",
+        "f'c (kg/cm²)": f"{section['fc']:g}",
+        "fy (kg/cm²)": f"{section['fy']:g}",
+        "φ": f"{section['phi']:g}",
+        "estribo": key_of(section["de"]),
+        "varilla": key_of(section["db"]),
+    }
@@ -0,0 +1,325 @@
+"""Diseño a lo largo del tramo: acero por estación y cortes de barras.
+
+La ventana de diseño y el modo por lotes calculan el acero solo en los tres
+puntos de control (``X_CTRL``). Aquí se calcula el ``As`` requerido en las
+``STATIONS`` de ``viga_core`` a partir de las curvas de momento corregidas,
+con el mismo peralte y los mismos límites ``As_min``/``As_max``, como un
+arreglo ``estaciones × vigas`` por cara (negativa y positiva).
+
+Con el armado de cada posición (grupo 1: ``n1`` barras ``c1``; grupo 2:
+``n2`` barras ``c2``) se obtienen, según NTP E.060:
+
+* el punto de corte teórico de cada grupo, donde el acero que queda basta
+  para la demanda (primero se corta el grupo 2, quedando el grupo 1;
+  luego el grupo 1, sin acero restante);
+* el punto de corte práctico: el teórico prolongado ``d`` o ``12 db``, el
+  mayor (12.10.3), y no menos que ``ld`` desde el punto de control
+  (12.10.2);
+* la longitud de desarrollo ``ld`` de barras en tracción (12.2.2), con
+  ``ψt = 1.3`` en barras superiores con más de 30 cm de concreto debajo.
+
+Como las curvas corregidas no se anulan en el tramo, el grupo 1 resulta
+corrido y el grupo 2 hace de bastón. Las vigas se procesan por bloques de
+``BLOCK_SIZE`` para acotar la memoria en proyectos completos.
+
+Uso por lotes::
+
+    python viga2.0.py tramo vigas.csv cortes.csv --luz 6
+
+La columna opcional ``luz`` (m) del CSV tiene prioridad sobre ``--luz``.
+"""
+
+import argparse
+import csv
+import sys
+import time
+
+import numpy as np
+
+import viga_barras
+import viga_batch
+import viga_core
+import viga_instr
+import viga_modelo
+
+DEFAULT_SPAN = 6.0  # m
+BLOCK_SIZE = 2048
+
+LD_MIN_CM = 30.0
+TOP_BAR_CM = 30.0  # concreto debajo de barras superiores para ψt = 1.3
+_LD_SMALL_DB = viga_core.DIAM_CM['3/4"']
+
+# Punto de control y cara (0 negativa, 1 positiva) de M1-, M2-, M3-, M1+, M2+, M3+
+_POS_X = np.tile(viga_core.X_CTRL, 2)
+_POS_FACE = np.repeat([0, 1], 3)
+
+# Columnas de salida por posición y grupo
+_FIELDS = ("ini", "fin", "teo_ini", "teo_fin", "ld")
+OUT_COLS = ["id", "luz"] + [
+    f"{pos}_g{g}_{field}"
+    for pos in viga_batch.MOMENT_COLS for g in (1, 2) for field in _FIELDS
+]
+
+
+def development_length(db, fc, fy, top=False):
+    """Longitud de desarrollo en tracción ``ld`` (cm) según E.060 12.2.2.
+
+    Expresión simplificada en kg/cm² con ``ψe = λ = 1``:
+    ``fy ψt db / (6.6 √f'c)`` hasta Ø3/4" y ``fy ψt db / (5.3 √f'c)`` para
+    diámetros mayores, con un mínimo de 30 cm.
+    """
+    db = np.asarray(db, dtype=float)
+    psi_t = np.where(top, 1.3, 1.0)
+    k = np.where(db <= _LD_SMALL_DB + 1e-9, 6.6, 5.3)
+    ld = fy * psi_t * db / (k * np.sqrt(fc))
+    return np.maximum(ld, LD_MIN_CM)
+
+
+def station_areas(mn, mp, b, d, fc, fy, phi, basis=viga_core.BASIS):
+    """``As`` requerido (cm²) en cada estación, ``(..., 2, estaciones)``.
+
+    ``mn`` y ``mp`` son los momentos corregidos ``(3,)`` o ``(N, 3)``; el eje
+    2 separa la cara negativa (0) de la positiva (1). Igual que en los
+    puntos de control, el área queda entre ``As_min`` y ``As_max``.
+    """
+    def col(x):
+        return np.asarray(x, dtype=float)[..., None, None]
+
+    b, d, fc, fy, phi = (col(x) for x in (b, d, fc, fy, phi))
+    as_min, as_max = viga_core.as_limits(fc, fy, b, d)
+    curves = viga_core.moment_curves(np.stack([mn, mp], axis=-2), basis)
+    req = viga_core.as_required(curves, fc, b, d, fy, phi)
+    return np.minimum(np.maximum(req, as_min), as_max)
+
+
+def layout_groups(n1, c1, n2, c2):
+    """Áreas (cm²) y diámetros (cm) por grupo, ``(..., 6, 2)``.
+
+    ``c1`` y ``c2`` son códigos de ``viga_modelo.BAR_KEYS``.
+    """
+    area = np.stack([n1 * viga_modelo.BAR_AREA[c1],
+                     n2 * viga_modelo.BAR_AREA[c2]], axis=-1)
+    diam = np.stack([viga_modelo.BAR_DIAM[c1],
+                     viga_modelo.BAR_DIAM[c2]], axis=-1)
+    return area, diam
+
+
+@viga_instr.timed()
+def span_design(mn, mp, b, h, r, fc, fy, phi, de, d, n1, c1, n2, c2,
+                span=DEFAULT_SPAN, curves=False, stations=viga_core.STATIONS):
+    """Cortes de barras de ``N`` vigas a lo largo del tramo.
+
+    ``mn`` y ``mp`` son ``(N, 3)``; los datos de sección, ``d`` (peralte de
+    diseño, cm) y ``span`` (luz, m) son escalares o ``(N,)``; el armado
+    ``n1, c1, n2, c2`` es ``(N, 6)`` en códigos de ``viga_modelo``.
+    Devuelve un diccionario con:
+
+    * ``teo``: ``(N, 6, 2, 2)`` inicio y fin teóricos (m) de cada grupo;
+    * ``corte``: ``(N, 6, 2, 2)`` inicio y fin prácticos (m);
+    * ``ld``: ``(N, 6, 2)`` longitud de desarrollo (cm);
+
+    con NaN donde el grupo no tiene barras. Con ``curves`` agrega ``req`` y
+    ``prov``, ``(N, 2, estaciones)``: el ``As`` requerido y el colocado
+    (el mayor entre las posiciones de cada cara) en cada estación.
+    """
+    mn = np.atleast_2d(np.asarray(mn, dtype=float))
+    mp = np.atleast_2d(np.asarray(mp, dtype=float))
+    n = len(mn)
+    sec = [np.broadcast_to(np.asarray(x, dtype=float), (n,))
+           for x in (b, h, r, fc, fy, phi, de, d, span)]
+    layout = [np.broadcast_to(np.asarray(x), (n, 6)) for x in (n1, c1, n2, c2)]
+    n_st = len(stations)
+    basis = viga_core.moment_basis(stations)
+    out = {
+        "teo": np.full((n, 6, 2, 2), np.nan),
+        "corte": np.full((n, 6, 2, 2), np.nan),
+        "ld": np.full((n, 6, 2), np.nan),
+    }
+    if curves:
+        out["req"] = np.empty((n, 2, n_st))
+        out["prov"] = np.empty((n, 2, n_st))
+    for start in range(0, n, BLOCK_SIZE):
+        rows = slice(start, start + BLOCK_SIZE)
+        block = _span_block(mn[rows], mp[rows], [x[rows] for x in sec],
+                            [x[rows] for x in layout], stations, basis, curves)
+        for key, value in block.items():
+            out[key][rows] = value
+    return out
+
+
+def _span_block(mn, mp, sec, layout, stations, basis, curves):
+    b, h, r, fc, fy, phi, de, d, span = sec
+    n_st = len(stations)
+    area, diam = layout_groups(*layout)
+    present = area > 0
+
+    # Acero que queda al cortar cada grupo: el grupo 2 deja el grupo 1.
+    # El grupo hace falta donde el As requerido (entre As_min y As_max)
+    # supera ese resto, es decir, donde |Mu| supera el φMn del resto; así
+    # se compara con las curvas de momento sin evaluar As en cada estación.
+    rest = np.stack([np.zeros_like(area[..., 0]), area[..., 0]], axis=-1)
+    col = (slice(None), None, None)
+    as_min, as_max = viga_core.as_limits(fc, fy, b, d)
+    a = rest * fy[col] / (0.85 * fc[col] * b[col])
+    m_rest = phi[col] * rest * fy[col] * (d[col] - a / 2) / 100000
+    limit = np.where(rest < as_min[col], -1.0,
+                     np.where(rest < as_max[col], m_rest, np.inf))
+    mu = np.abs(viga_core.moment_curves(np.stack([mn, mp], axis=-2), basis))
+    need = mu[:, _POS_FACE, None, :] > limit[..., None]
+
+    # Desde el punto de control hacia cada lado hasta la primera estación
+    # en que el grupo ya no hace falta
+    ctrl = np.abs(stations[:, None] - viga_core.X_CTRL).argmin(axis=0)
+    first = np.empty(area.shape, dtype=np.intp)
+    last = np.empty(area.shape, dtype=np.intp)
+    for j, c in enumerate(ctrl):
+        pos = [j, j + 3]
+        free = ~need[:, pos, :, c:]
+        last[:, pos] = np.where(free.any(-1), c + free.argmax(-1), n_st - 1)
+        free = ~need[:, pos, :, c::-1]
+        first[:, pos] = np.where(free.any(-1), c - free.argmax(-1), 0)
+    x0, x1 = stations[first], stations[last]
+
+    top = ((_POS_FACE == 0)[:, None]
+           & ((h - r - de)[:, None, None] - diam > TOP_BAR_CM))
+    ld = development_length(diam, fc[:, None, None], fy[:, None, None], top)
+    span_cm = 100 * span[:, None, None]
+    ext = np.maximum(d[:, None, None], 12 * diam) / span_cm
+    x_c = _POS_X[:, None]
+    p0 = np.clip(np.minimum(x0 - ext, x_c - ld / span_cm), 0, 1)
+    p1 = np.clip(np.maximum(x1 + ext, x_c + ld / span_cm), 0, 1)
+
+    L = span[:, None, None, None]
+    nan = np.where(present, 1.0, np.nan)
+    block = {
+        "teo": np.stack([x0, x1], axis=-1) * L * nan[..., None],
+        "corte": np.stack([p0, p1], axis=-1) * L * nan[..., None],
+        "ld": ld * nan,
+    }
+    if curves:
+        on = ((stations >= p0[..., None]) & (stations <= p1[..., None])
+              & present[..., None])
+        steel = (on[:, :, 0] * area[:, :, 0, None]
+                 + on[:, :, 1] * area[:, :, 1, None])
+        block["req"] = station_areas(mn, mp, b, d, fc, fy, phi, basis)
+        block["prov"] = np.stack([steel[:, :3].max(axis=1),
+                                  steel[:, 3:].max(axis=1)], axis=1)
+    return block
+
+
+def cut_lines(out, beam, i=0):
+    """Líneas de la memoria con los cortes de la viga ``i`` de ``out``.
+
+    ``beam`` es el registro ``viga_modelo.BEAM_DTYPE`` con su armado.
+    """
+    lines = ["Cortes de barras (desde el apoyo izquierdo):"]
+    groups = (("n1", "c1"), ("n2", "c2"))
+    for p, pos in enumerate(viga_batch.MOMENT_COLS):
+        for g, (qty, code) in enumerate(groups):
+            n = int(beam[qty][p])
+            if not n or not beam[code][p]:
+                continue
+            (t0, t1), (x0, x1) = out["teo"][i, p, g], out["corte"][i, p, g]
+            bars = f"{n}Ø{viga_modelo.BAR_KEYS[beam[code][p]]}"
+            lines.append(
+                f"{pos} grupo {g + 1} ({bars}): teórico {t0:.2f}–{t1:.2f} m, "
+                f"corte {x0:.2f}–{x1:.2f} m, ld = {out['ld'][i, p, g]:.0f} cm"
+            )
+    return lines
+
+
+def chunk_span(chunk, res, span=None, curves=False):
+    """``span_design`` de un bloque ya diseñado con ``viga_batch.design_chunk``.
+
+    La luz es la columna ``luz`` del bloque y, donde falta, ``span`` (por
+    defecto ``DEFAULT_SPAN``); se devuelve también en ``luz``. Una luz nula o
+    negativa es un ``ValueError`` con la línea del CSV. El armado se toma de
+    ``chunk["beams"]`` o, si el bloque no lo trae, de ``res["armado"]``.
+    """
+    n = len(res["d"])
+    luz = np.broadcast_to(np.asarray(chunk.get("luz", np.nan), dtype=float), (n,))
+    luz = np.where(np.isnan(luz), DEFAULT_SPAN if span is None else span, luz)
+    bad = np.flatnonzero(~(luz > 0))
+    if len(bad):
+        k = bad[0]
+        where = f"Línea {chunk['linea'][k]}, viga" if "linea" in chunk else "Viga"
+        name = chunk["id"][k] if "id" in chunk else k
+        raise ValueError(
+            f"{where} {name!r}: la luz debe ser mayor que cero ({luz[k]:g} m)")
+    beams = chunk.get("beams")
+    if beams is None:
+        beams = viga_modelo.new_beams(n)
+        viga_modelo.set_layout_from_index(beams, res["armado"],
+                                          viga_barras.default_index())
+    out = span_design(
+        res["mn_corr"], res["mp_corr"], chunk["b"], chunk["h"], chunk["r"],
+        chunk["fc"], chunk["fy"], chunk["phi"], chunk["de"], res["d"],
+        beams["n1"], beams["c1"], beams["n2"], beams["c2"], luz, curves,
+    )
+    out["luz"] = luz
+    return out
+
+
+def write_chunk(writer, ids, span, out):
+    """Escribe los cortes de un bloque en el ``csv.writer`` de salida.
+
+    Las posiciones o grupos sin barras quedan vacíos.
+    """
+    values = np.concatenate([
+        out["corte"], out["teo"], out["ld"][..., None],
+    ], axis=-1).reshape(len(ids), -1)
+    rows = (
+        [i, f"{L:.2f}"] + ["" if v != v else f"{v:.3f}" for v in row]
+        for i, L, row in zip(ids, span.tolist(), values.tolist())
+    )
+    writer.writerows(rows)
+
+
+def run(in_path, out_path, span=None, chunk_size=viga_batch.CHUNK_SIZE):
+    """Diseña ``in_path`` con ``viga_batch`` y escribe los cortes en ``out_path``.
+
+    ``span`` (m) reemplaza la luz por defecto de las filas sin columna
+    ``luz``. Devuelve ``(filas, segundos)``.
+    """
+    t0 = time.perf_counter()
+    n_rows = 0
+    with open(in_path, newline="", encoding="utf-8") as fin, \
+            open(out_path, "w", newline="", encoding="utf-8") as fout:
+        writer = csv.writer(fout)
+        writer.writerow(OUT_COLS)
+        for chunk in viga_batch.iter_chunks(fin, chunk_size):
+            out = chunk_span(chunk, viga_batch.design_chunk(chunk), span)
+            write_chunk(writer, chunk["id"], out["luz"], out)
+            n_rows += len(chunk["id"])
+    return n_rows, time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="viga2.0.py tramo",
+        description="Cortes de barras y longitudes de desarrollo a lo largo "
+                    "del tramo de todas las vigas de un CSV.",
+    )
+    parser.add_argument("entrada", help="CSV con el cuadro de vigas")
+    parser.add_argument("salida", help="CSV con los cortes por posición y grupo")
+    parser.add_argument(
+        "--luz", type=viga_batch.positive_float,
+        help=f"luz en m de las vigas sin columna luz (por defecto {DEFAULT_SPAN:g})",
+    )
+    parser.add_argument(
+        "--bloque", type=viga_batch.positive_int, default=viga_batch.CHUNK_SIZE,
+        help=f"vigas por bloque (por defecto {viga_batch.CHUNK_SIZE})",
+    )
+    args = parser.parse_args(argv)
+
+    try:
+        n_rows, secs = run(args.entrada, args.salida, args.luz, args.bloque)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"{n_rows} vigas en {secs:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Trabajos en segundo plano para la interfaz con ``QThreadPool``.
+
+Cada trabajo es un generador sin Qt que procesa un bloque pequeño por
+paso y genera ``(hechos, total, parcial)``. ``Worker`` lo ejecuta en un
+hilo del grupo y reenvía cada paso a la ventana mediante señales: avance,
+resultados parciales, fin, error o cancelación. Como las señales cruzan de
+hilo, Qt las entrega en el ciclo de eventos de la ventana, que nunca queda
+bloqueado por el cálculo.
+
+Los bloques son pequeños a propósito: las funciones de NumPy y de lectura
+de texto retienen el GIL mientras trabajan, y un bloque corto garantiza
+que el hilo principal lo recupere varias veces por cuadro (16 ms).
+"""
+
+import contextlib
+import csv
+import os
+import threading
+
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+import viga_batch
+
+# Vigas por paso en los trabajos de la interfaz
+GUI_CHUNK_SIZE = 2000
+
+# Filas de la tabla de fuerzas por paso al importar de ETABS/SAP2000
+IMPORT_CHUNK_SIZE = 20000
+
+# Vigas por paso al exportar figuras (cada una tarda ~0.1 s)
+EXPORT_CHUNK_SIZE = 20
+
+
+class WorkerSignals(QObject):
+    """Señales de un ``Worker``; se emiten desde el hilo del trabajo."""
+
+    progress = pyqtSignal(int, int)
+    result = pyqtSignal(object)
+    finished = pyqtSignal()
+    error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Worker(QRunnable):
+    """Ejecuta un trabajo generador en un hilo de ``QThreadPool``.
+
+    ``cancel()`` se puede llamar desde cualquier hilo; el trabajo se detiene
+    al terminar el paso en curso y se emite ``cancelled``.
+    """
+
+    def __init__(self, job, *args, **kwargs):
+        super().__init__()
+        self.job = job
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    @property
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        steps = self.job(*self.args, **self.kwargs)
+        try:
+            for done, total, partial in steps:
+                if self._cancel.is_set():
+                    steps.close()
+                    self.signals.cancelled.emit()
+                    return
+                self.signals.progress.emit(done, total)
+                if partial is not None:
+                    self.signals.result.emit(partial)
+        except Exception as exc:  # noqa: BLE001  (se informa en la ventana)
+            self.signals.error.emit(str(exc))
+            return
+        self.signals.finished.emit()
+
+
+def count_rows(path):
+    """Filas de datos de un CSV (sin encabezado), contando saltos de línea.
+
+    Es una estimación para el avance: la última línea cuenta aunque no
+    termine en salto de línea, pero los saltos dentro de campos entre
+    comillas y las filas en blanco también cuentan. Los trabajos limitan
+    el avance para que ``hechos`` no supere ``total``.
+    """
+    n = 0
+    last = b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            n += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        n += 1
+    return max(n - 1, 0)
+
+
+def batch_job(in_path, out_path=None, chunk_size=GUI_CHUNK_SIZE):
+    """Diseño por lotes de un CSV; entrega cada bloque diseñado.
+
+    Cada parcial es un diccionario con ``id``, los datos del bloque
+    (``chunk``) y el resultado de ``viga_batch.design_chunk`` (``res``).
+    Sin ``out_path`` los resultados solo se entregan a la ventana.
+    """
+    total = count_rows(in_path)
+    done = 0
+    with contextlib.ExitStack() as stack:
+        fin = stack.enter_context(open(in_path, newline="", encoding="utf-8"))
+        writer = None
+        if out_path:
+            fout = stack.enter_context(
+                open(out_path, "w", newline="", encoding="utf-8"))
+            writer = csv.writer(fout)
+            writer.writerow(viga_batch.OUT_COLS)
+        for chunk in viga_batch.iter_chunks(fin, chunk_size):
+            res = viga_batch.design_chunk(chunk)
+            if writer is not None:
+                viga_batch.write_chunk(writer, chunk["id"], res)
+            done += len(chunk["id"])
+            total = max(total, done)
+            yield done, total, {"id": chunk["id"], "chunk": chunk, "res": res}
+
+
+def import_job(path, cases=None, factor=1.0, chunk_size=IMPORT_CHUNK_SIZE):
+    """Importa una tabla de ETABS/SAP2000; el avance se mide en bytes.
+
+    El único parcial, al final, es ``(ids, mn, mp)`` de ``read_envelope``.
+    """
+    import viga_etabs
+
+    total = os.path.getsize(path)
+    reducer = viga_etabs.EnvelopeReducer()
+    for done in viga_etabs.iter_envelope(path, reducer, cases, chunk_size,
+                                         factor):
+        yield min(done, total), total, None
+    yield total, total, reducer.result()
+
+
+def export_job(in_path, folder, fmt="png", dpi=100,
+               chunk_size=EXPORT_CHUNK_SIZE):
+    """Exporta las figuras de todas las vigas de un CSV con una figura propia.
+
+    Cada parcial es la lista de archivos escritos en el paso.
+    """
+    import viga_export
+
+    os.makedirs(folder, exist_ok=True)
+    exporter = viga_export.FigureExporter(dpi)
+    total = count_rows(in_path)
+    done = 0
+    used = set()
+    with open(in_path, newline="", encoding="utf-8") as f:
+        for chunk in viga_batch.iter_chunks(f, chunk_size):
+            names = viga_export.file_names(chunk["id"], used)
+            paths = exporter.render_chunk(chunk, chunk["id"], folder, fmt,
+                                          names=names)
+            done += len(paths)
+            total = max(total, done)
+            yield done, total, paths